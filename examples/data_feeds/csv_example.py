@@ -1,8 +1,20 @@
 """Example: Parse CSV tick data with custom schema."""
 
-from src.market_data.csv_feed import CSVFeed, CSVFeedConfig
+import argparse
+import os
+import tempfile
+
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path', nargs='?', default='path/to/tick_data.csv', help='CSV tick file')
+    parser.add_argument('--output', default=os.path.join(tempfile.gettempdir(), 'tick_data.jsonl'),
+                        help='JSON lines export (default: in the temp directory)')
+    args = parser.parse_args()
+    
+    # Deferred so --help does not pay for pandas/pyarrow imports
+    from src.market_data.csv_feed import CSVFeed, CSVFeedConfig
+    
     # Create configuration for your CSV format
     config = CSVFeedConfig(
         timestamp_col='time',
@@ -17,13 +29,19 @@ def main():
     )
     
     # Parse CSV file
-    feed = CSVFeed('path/to/tick_data.csv', config)
+    feed = CSVFeed(args.path, config)
     
     # Process events
     for i, tick_event in enumerate(feed.parse(chunk_size=5000)):
         if i >= 10:
             break
         print(f"Tick {i}: {tick_event.to_dict()}")
+    
+    # Export to JSON one columnar batch at a time, without per-tick dicts
+    with open(args.output, 'wb') as f:
+        for batch in feed.parse_batched(chunk_size=5000):
+            f.write(batch.to_json_bytes() + b'\n')
+    print(f"Exported batches to {args.output}")
 
 if __name__ == '__main__':
     main()
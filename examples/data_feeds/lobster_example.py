@@ -1,17 +1,33 @@
 """Example: Parse LOBSTER data format."""
 
-from src.market_data.lobster_parser import LobsterMessageParser
+import argparse
+import importlib.util
+import sys
+
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('message_file', nargs='?',
+                        default='path/to/AAPL_2023-01-01_message.csv',
+                        help='LOBSTER message file')
+    parser.add_argument('--symbol', default='AAPL', help='Instrument symbol')
+    parser.add_argument('--date', default='2023-01-01', help='Trading date (YYYY-MM-DD)')
+    args = parser.parse_args()
+    
+    # Import pyarrow-backed modules only once there is work to do
+    if importlib.util.find_spec('pyarrow') is None:
+        sys.exit("pyarrow is required for LOBSTER parsing. Install with: pip install pyarrow")
+    from src.market_data.lobster_parser import LobsterMessageParser
+    
     # Example LOBSTER message file parsing
-    parser = LobsterMessageParser(
-        message_file='path/to/AAPL_2023-01-01_message.csv',
-        symbol='AAPL',
-        date_str='2023-01-01'
+    lobster = LobsterMessageParser(
+        message_file=args.message_file,
+        symbol=args.symbol,
+        date_str=args.date
     )
     
     # Parse and print first 10 tick events
-    for i, tick_event in enumerate(parser.parse(chunk_size=1000)):
+    for i, tick_event in enumerate(lobster.parse(chunk_size=1000)):
         if i >= 10:
             break
         print(f"Tick {i}: {tick_event.to_dict()}")
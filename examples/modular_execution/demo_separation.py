@@ -5,12 +5,50 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.interfaces.strategy_interface import IStrategy, Signal, SignalType
+from src.interfaces.strategy_interface import IStrategy, Signal, SignalBatch, SignalType
+from src.interfaces.market_data_interface import MarketDataBatch
 from src.interfaces.risk_interface import IRiskManager, RiskStatus
 from src.interfaces.execution_interface import IExecutionSimulator, LatencyModel
 from src.risk.position_risk_manager import PositionRiskManager
 from src.execution_sim.realistic_execution_simulator import RealisticExecutionSimulator
+from src.utils.jit import njit
+from src.utils.trace import TraceBuffer
 from typing import Dict, Any, Optional
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@njit(cache=True)
+def _update_moving_averages(buf, idx, n, fast_sum, slow_sum, new_price,
+                            fast_period, slow_period):
+    """Push a price into the ring buffer and update both running sums in O(1)."""
+    size = buf.shape[0]
+    # Evict the prices leaving each window before the slot is overwritten
+    if n >= fast_period:
+        fast_sum -= buf[(idx - fast_period) % size]
+    if n >= slow_period:
+        slow_sum -= buf[(idx - slow_period) % size]
+    buf[idx] = new_price
+    fast_sum += new_price
+    slow_sum += new_price
+    idx = (idx + 1) % size
+    if n < size:
+        n += 1
+    ready = n >= slow_period
+    return idx, n, fast_sum, slow_sum, fast_sum / fast_period, slow_sum / slow_period, ready
+
+
+@njit(cache=True)
+def _crossover_mask(buf, idx, n, fast_sum, slow_sum, prices, fast_period, slow_period):
+    """Run the ring buffer over a price series, flagging ticks where fast MA > slow MA."""
+    mask = np.zeros(prices.shape[0], dtype=np.bool_)
+    for i in range(prices.shape[0]):
+        idx, n, fast_sum, slow_sum, fast_ma, slow_ma, ready = _update_moving_averages(
+            buf, idx, n, fast_sum, slow_sum, prices[i], fast_period, slow_period)
+        mask[i] = ready and fast_ma > slow_ma
+    return mask, idx, n, fast_sum, slow_sum
 
 
 # Example Strategy Implementation
@@ -20,19 +58,17 @@ class SimpleMovingAverageStrategy(IStrategy):
     def __init__(self, fast_period: int = 10, slow_period: int = 20):
         self.fast_period = fast_period
         self.slow_period = slow_period
-        self.price_history = []
+        self.buf = np.empty(max(fast_period, slow_period), dtype=np.float64)
+        self.reset()
     
     def on_market_data(self, market_data: Dict[str, Any]) -> Optional[Signal]:
         price = market_data.get('price', 0.0)
-        self.price_history.append(price)
-        
-        if len(self.price_history) < self.slow_period:
-            return None
+        (self.idx, self.n, self.fast_sum, self.slow_sum,
+         fast_ma, slow_ma, ready) = _update_moving_averages(
+            self.buf, self.idx, self.n, self.fast_sum, self.slow_sum,
+            float(price), self.fast_period, self.slow_period)
         
-        fast_ma = sum(self.price_history[-self.fast_period:]) / self.fast_period
-        slow_ma = sum(self.price_history[-self.slow_period:]) / self.slow_period
-        
-        if fast_ma > slow_ma:
+        if ready and fast_ma > slow_ma:
             return Signal(
                 symbol=market_data['symbol'],
                 signal_type=SignalType.BUY,
@@ -43,11 +79,24 @@ class SimpleMovingAverageStrategy(IStrategy):
             )
         return None
     
+    def on_market_data_batch(self, market_data: MarketDataBatch) -> SignalBatch:
+        mask, self.idx, self.n, self.fast_sum, self.slow_sum = _crossover_mask(
+            self.buf, self.idx, self.n, self.fast_sum, self.slow_sum,
+            market_data.prices, self.fast_period, self.slow_period)
+        return SignalBatch(
+            sides=mask.astype(np.int8),
+            quantities=np.where(mask, 100.0, 0.0),
+            confidence=np.where(mask, 0.7, 0.0)
+        )
+    
     def on_fill(self, fill_event: Dict[str, Any]) -> None:
-        print(f"  [{self.name}] Fill received: {fill_event}")
+        logger.debug("  [%s] Fill received: %s", self.name, fill_event)
     
     def reset(self) -> None:
-        self.price_history = []
+        self.idx = 0
+        self.n = 0
+        self.fast_sum = 0.0
+        self.slow_sum = 0.0
     
     @property
     def name(self) -> str:
@@ -65,6 +114,12 @@ class TradingEngine:
         self.risk_manager = risk_manager
         self.execution_simulator = execution_simulator
         self.positions = {}
+        self.trace: Optional[TraceBuffer] = None
+    
+    def enable_trace(self, capacity: int = 1_000_000) -> TraceBuffer:
+        """Record signals, rejections and fills into an in-memory ring buffer."""
+        self.trace = TraceBuffer(capacity)
+        return self.trace
     
     def process_market_data(self, market_data: Dict[str, Any]):
         # 1. Strategy generates signal
@@ -72,13 +127,19 @@ class TradingEngine:
         if not signal:
             return
         
-        print(f"\nSignal generated: {signal.signal_type.value} {signal.quantity} @ {signal.price}")
+        logger.debug("\nSignal generated: %s %s @ %s",
+                     signal.signal_type.value, signal.quantity, signal.price)
+        if self.trace is not None:
+            self.trace.record(TraceBuffer.SIGNAL, signal.timestamp, signal.quantity, signal.price)
         
         # 2. Risk manager checks order
         risk_result = self.risk_manager.check_order(signal, self.positions)
-        print(f"Risk check: {risk_result.status.value} - {risk_result.reason}")
+        logger.debug("Risk check: %s - %s", risk_result.status.value, risk_result.reason)
         
         if risk_result.status == RiskStatus.REJECTED:
+            if self.trace is not None:
+                self.trace.record(TraceBuffer.REJECTED, signal.timestamp,
+                                  signal.quantity, signal.price)
             return
         
         # 3. Execution simulator executes order
@@ -87,17 +148,73 @@ class TradingEngine:
             market_data['price'],
             market_data['timestamp']
         )
-        print(f"Execution: Filled {exec_result.filled_quantity} @ {exec_result.filled_price:.2f}")
-        print(f"           Latency: {exec_result.latency_ms:.2f}ms, Slippage: ${exec_result.slippage:.4f}")
+        logger.debug("Execution: Filled %s @ %.2f", exec_result.filled_quantity, exec_result.filled_price)
+        logger.debug("           Latency: %.2fms, Slippage: $%.4f",
+                     exec_result.latency_ms, exec_result.slippage)
+        if self.trace is not None:
+            self.trace.record(TraceBuffer.FILL, exec_result.execution_time,
+                              exec_result.filled_quantity, exec_result.filled_price)
         
         # Update positions
-        self.positions[signal.symbol] = self.positions.get(signal.symbol, 0) + signal.quantity
+        signed_quantity = signal.quantity if signal.signal_type == SignalType.BUY else -signal.quantity
+        self.positions[signal.symbol] = self.positions.get(signal.symbol, 0) + signed_quantity
         
         # Notify strategy of fill
         self.strategy.on_fill({'order_id': exec_result.order_id, 'filled_quantity': exec_result.filled_quantity})
+    
+    def process_batch(self, market_data: MarketDataBatch):
+        """Run a columnar batch through strategy, risk and execution in one pass each."""
+        # 1. Strategy generates a signal per tick
+        signals = self.strategy.on_market_data_batch(market_data)
+        
+        # 2. Risk manager accepts or rejects every signal
+        accepted = np.flatnonzero(
+            self.risk_manager.check_batch(signals, market_data, self.positions))
+        
+        # 3. Execution simulator fills all accepted orders
+        fills = self.execution_simulator.execute_batch(
+            signals.quantities[accepted],
+            market_data.prices[accepted],
+            market_data.timestamps[accepted],
+            signals.sides[accepted]
+        )
+        
+        if self.trace is not None:
+            self._trace_batch(signals, market_data, accepted, fills)
+        
+        # Update positions
+        position_changes = np.zeros(len(market_data.symbol_table))
+        np.add.at(position_changes, market_data.symbols[accepted],
+                  signals.sides[accepted] * fills.filled_quantities)
+        for code, change in enumerate(position_changes.tolist()):
+            if change:
+                symbol = market_data.symbol_table[code]
+                self.positions[symbol] = self.positions.get(symbol, 0) + change
+        
+        # Notify strategy of fills
+        for order_id, filled_quantity in zip(fills.order_ids, fills.filled_quantities.tolist()):
+            self.strategy.on_fill({'order_id': order_id, 'filled_quantity': filled_quantity})
+        return fills
+    
+    def _trace_batch(self, signals, market_data, accepted, fills):
+        """Record a processed batch's signals, rejections and fills."""
+        signalled = np.flatnonzero(signals.mask)
+        rejected = np.setdiff1d(signalled, accepted)
+        for code, rows in ((TraceBuffer.SIGNAL, signalled), (TraceBuffer.REJECTED, rejected)):
+            for i in rows.tolist():
+                self.trace.record(code, market_data.timestamps[i],
+                                  signals.quantities[i], market_data.prices[i])
+        for ts, quantity, price in zip(fills.execution_times.tolist(),
+                                       fills.filled_quantities.tolist(),
+                                       fills.filled_prices.tolist()):
+            self.trace.record(TraceBuffer.FILL, ts, quantity, price)
 
 
 def main():
+    # Per-order detail is logged at DEBUG; raise the level to silence it
+    logging.basicConfig(format='%(message)s')
+    logger.setLevel(logging.DEBUG)
+    
     print("=" * 80)
     print("Modular Architecture Demonstration")
     print("=" * 80)
@@ -122,14 +239,15 @@ def main():
     
     # 3. Simulate market data
     import time
-    prices = [100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111]
+    prices = np.linspace(100.0, 111.0, 12)
+    start_time = time.time()
     
     print("\nProcessing market data...")
-    for i, price in enumerate(prices):
+    for i, price in enumerate(prices.tolist()):
         market_data = {
             'symbol': 'AAPL',
             'price': price,
-            'timestamp': time.time() + i,
+            'timestamp': start_time + i,
             'volume': 1000
         }
         engine.process_market_data(market_data)
@@ -137,6 +255,23 @@ def main():
     print("\n" + "=" * 80)
     print(f"Final Positions: {engine.positions}")
     print("=" * 80)
+    
+    # 4. Same pipeline over a columnar batch
+    print("\nProcessing the same market data as one batch...")
+    strategy.reset()
+    batch_engine = TradingEngine(strategy, risk_manager, execution_sim)
+    trace = batch_engine.enable_trace()
+    batch = MarketDataBatch(
+        symbols=np.zeros(len(prices), dtype=np.int32),
+        prices=prices,
+        timestamps=start_time + np.arange(len(prices), dtype=np.float64),
+        volumes=np.full(len(prices), 1000.0),
+        symbol_table=['AAPL']
+    )
+    fills = batch_engine.process_batch(batch)
+    print(f"Filled {len(fills)} orders, mean latency {fills.latency_ms.mean():.2f}ms")
+    print(f"Final Positions: {batch_engine.positions}")
+    print(f"Trace: {trace.to_dict()['event']}")
 
 if __name__ == '__main__':
     main()
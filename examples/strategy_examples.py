@@ -4,17 +4,19 @@ Strategy Library Usage Examples
 Demonstrates how to use the real-world strategy templates.
 """
 
-from datetime import datetime
-from src.strategies import (
-    VWAPStrategy,
-    TWAPStrategy,
-    MeanReversionStrategy,
-    StatisticalArbitrageStrategy
-)
+import numpy as np
+
+# Each demo imports only the strategy it runs
+
+# Timestamps are int64 nanoseconds since the epoch
+SESSION_START_NS = int(np.datetime64('2024-01-15T10:00:00', 'ns').astype(np.int64))
+NS_PER_MINUTE = 60_000_000_000
 
 
 def demo_vwap_strategy():
     """Demonstrate VWAP execution strategy."""
+    from src.strategies import VWAPStrategy
+    
     print("\n" + "="*60)
     print("VWAP Strategy Example")
     print("="*60)
@@ -31,7 +33,7 @@ def demo_vwap_strategy():
         'bid': 175.20,
         'ask': 175.25,
         'volume': 5000,
-        'timestamp': datetime(2024, 1, 15, 10, 0, 0)
+        'timestamp': SESSION_START_NS
     }
     
     order = strategy.on_market_data(market_data)
@@ -52,6 +54,8 @@ def demo_vwap_strategy():
 
 def demo_twap_strategy():
     """Demonstrate TWAP execution strategy."""
+    from src.strategies import TWAPStrategy
+    
     print("\n" + "="*60)
     print("TWAP Strategy Example")
     print("="*60)
@@ -67,7 +71,7 @@ def demo_twap_strategy():
         'symbol': 'MSFT',
         'bid': 380.15,
         'ask': 380.20,
-        'timestamp': datetime(2024, 1, 15, 10, 0, 0)
+        'timestamp': SESSION_START_NS
     }
     
     order = strategy.on_market_data(market_data)
@@ -88,6 +92,8 @@ def demo_twap_strategy():
 
 def demo_mean_reversion():
     """Demonstrate Mean Reversion strategy."""
+    from src.strategies import MeanReversionStrategy
+    
     print("\n" + "="*60)
     print("Mean Reversion Strategy Example")
     print("="*60)
@@ -103,16 +109,13 @@ def demo_mean_reversion():
     prices = [150.0 + i * 0.5 for i in range(15)]  # Trending up
     prices.extend([155.0 - i * 0.3 for i in range(10)])  # Drop below mean
     
+    timestamps = SESSION_START_NS + np.arange(len(prices), dtype=np.int64) * NS_PER_MINUTE
+    
+    # Evaluate the whole series at once instead of tick by tick
+    orders = strategy.on_batch(np.array(prices), timestamps, symbol='GOOGL')
+    
     order = None
-    for i, price in enumerate(prices):
-        market_data = {
-            'symbol': 'GOOGL',
-            'bid': price - 0.05,
-            'ask': price + 0.05,
-            'timestamp': datetime(2024, 1, 15, 10, i, 0)
-        }
-        
-        new_order = strategy.on_market_data(market_data)
+    for i, new_order in enumerate(orders):
         if new_order:
             order = new_order
             print(f"\n[Bar {i}] Signal Generated!")
@@ -136,6 +139,8 @@ def demo_mean_reversion():
 
 def demo_statistical_arbitrage():
     """Demonstrate Statistical Arbitrage (Pairs Trading) strategy."""
+    from src.strategies import StatisticalArbitrageStrategy
+    
     print("\n" + "="*60)
     print("Statistical Arbitrage Strategy Example")
     print("="*60)
@@ -151,35 +156,19 @@ def demo_statistical_arbitrage():
     print("\nMonitoring MSFT-GOOGL spread...")
     
     # Simulate correlated price movements
-    for i in range(35):
-        # MSFT price
-        msft_price = 380.0 + i * 0.2
-        market_data_a = {
-            'symbol': 'MSFT',
-            'bid': msft_price - 0.05,
-            'ask': msft_price + 0.05,
-            'timestamp': datetime(2024, 1, 15, 10, i, 0)
-        }
-        
-        order_a = strategy.on_market_data(market_data_a)
-        
-        # GOOGL price (diverging)
-        googl_price = 150.0 + i * 0.05  # Moving slower
-        market_data_b = {
-            'symbol': 'GOOGL',
-            'bid': googl_price - 0.05,
-            'ask': googl_price + 0.05,
-            'timestamp': datetime(2024, 1, 15, 10, i, 0)
-        }
-        
-        order_b = strategy.on_market_data(market_data_b)
-        
-        if order_a or order_b:
+    bars = np.arange(35)
+    msft_prices = 380.0 + bars * 0.2
+    googl_prices = 150.0 + bars * 0.05  # Moving slower (diverging)
+    timestamps = SESSION_START_NS + bars.astype(np.int64) * NS_PER_MINUTE
+    
+    # Evaluate all bars of both legs at once
+    orders = strategy.on_batch(msft_prices, googl_prices, timestamps)
+    
+    for i, legs in enumerate(orders):
+        if legs:
             print(f"\n[Bar {i}] Trade Signal!")
-            if order_a:
-                print(f"  {order_a['symbol']}: {order_a['side']} {order_a['quantity']} @ ${order_a['price']:.2f}")
-            if order_b:
-                print(f"  {order_b['symbol']}: {order_b['side']} {order_b['quantity']} @ ${order_b['price']:.2f}")
+            for leg in legs:
+                print(f"  {leg['symbol']}: {leg['side']} {leg['quantity']} @ ${leg['price']:.2f}")
     
     state = strategy.get_state()
     if state['z_score'] is not None:
@@ -0,0 +1,51 @@
+"""Compiled statistics kernels for the profilers.
+
+Kernels are compiled eagerly for fixed signatures and cached on disk, so
+only the first import after install pays for compilation. The profilers
+import this module on first use rather than at import time.
+"""
+
+import numpy as np
+
+from src.utils.jit import njit
+
+
+@njit('UniTuple(float64, 4)(int64[:])', cache=True, fastmath=True)
+def tick_moments(durations_ns):
+    """Return (mean, min, max, sample stddev) of durations in one pass."""
+    mean = 0.0
+    m2 = 0.0
+    lo = durations_ns[0]
+    hi = durations_ns[0]
+    for i in range(len(durations_ns)):
+        x = durations_ns[i]
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+        lo = min(lo, x)
+        hi = max(hi, x)
+    std = np.sqrt(m2 / (len(durations_ns) - 1)) if len(durations_ns) > 1 else 0.0
+    return mean, float(lo), float(hi), std
+
+
+@njit('float64[:](int64[:], int64[:])', cache=True)
+def tick_percentiles(durations_ns, ranks):
+    """Return the values at the given sorted ranks using one partial sort."""
+    ordered = np.partition(durations_ns, ranks)
+    out = np.empty(len(ranks), dtype=np.float64)
+    for i in range(len(ranks)):
+        out[i] = ordered[ranks[i]]
+    return out
+
+
+@njit('UniTuple(float64, 3)(float64[:])', cache=True)
+def min_max_mean(values):
+    """Return (min, max, mean) of a non-empty array in one pass."""
+    lo = values[0]
+    hi = values[0]
+    total = 0.0
+    for x in values:
+        total += x
+        lo = min(lo, x)
+        hi = max(hi, x)
+    return lo, hi, total / len(values)
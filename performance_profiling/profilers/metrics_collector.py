@@ -3,9 +3,18 @@
 import json
 import time
 from typing import Dict, Any
+
+import numpy as np
+
 from .resource_profiler import ResourceProfiler
 from .tick_profiler import TickProfiler
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class MetricsCollector:
     """Centralized collector for all performance metrics."""
@@ -44,8 +53,14 @@ class MetricsCollector:
     def save_metrics(self, output_file: str):
         """Save metrics to JSON file."""
         metrics = self.get_all_metrics()
-        with open(output_file, 'w') as f:
-            json.dump(metrics, f, indent=2)
+        if ORJSON_AVAILABLE:
+            # Serializes numpy arrays/scalars natively and writes bytes directly
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(
+                    metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(metrics, f, indent=2, default=_numpy_default)
     
     def print_summary(self):
         """Print summary of metrics."""
@@ -67,6 +82,9 @@ class MetricsCollector:
             print(f"  Mean Time: {tick_stats['mean_us']:.2f} µs")
             print(f"  Median Time: {tick_stats['median_us']:.2f} µs")
             print(f"  Min/Max: {tick_stats['min_us']:.2f} / {tick_stats['max_us']:.2f} µs")
+            if tick_stats['timing'] != 'per_tick':
+                print(f"  Note: {tick_stats['batched_ticks']:,} ticks timed in blocks; "
+                      f"their durations (and percentiles) are block means, not per-tick latency")
         
         # Percentiles
         if metrics['tick_percentiles']:
@@ -90,3 +108,10 @@ class MetricsCollector:
         self.tick_profiler.reset()
         self.start_time = 0
         self.end_time = 0
+
+
+def _numpy_default(obj: Any) -> Any:
+    """Convert numpy values for the stdlib json fallback."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
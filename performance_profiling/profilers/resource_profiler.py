@@ -1,11 +1,14 @@
 """Resource profiling for CPU and memory usage."""
 
+import os
 import psutil
 import time
 import threading
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
 
 @dataclass
 class ResourceSnapshot:
@@ -16,19 +19,77 @@ class ResourceSnapshot:
     memory_percent: float
 
 
+class _ProcStatSampler:
+    """Read this process's CPU time and resident memory straight from /proc.
+    
+    Keeps /proc/self/stat and /proc/self/statm open and re-reads them with
+    pread, avoiding psutil's per-call open/parse/close. Linux only; the
+    constructor raises OSError elsewhere.
+    """
+    
+    def __init__(self):
+        self._stat_fd = os.open('/proc/self/stat', os.O_RDONLY)
+        try:
+            self._statm_fd = os.open('/proc/self/statm', os.O_RDONLY)
+        except OSError:
+            os.close(self._stat_fd)
+            raise
+        self._ticks_per_second = os.sysconf('SC_CLK_TCK')
+        self._page_mb = os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+        self._total_mb = psutil.virtual_memory().total / (1024 * 1024)
+        self._last_cpu = self._cpu_seconds()
+        self._last_wall = time.perf_counter()
+    
+    def _cpu_seconds(self) -> float:
+        """User plus system CPU time of the process in seconds."""
+        stat = os.pread(self._stat_fd, 1024, 0)
+        # Fields after the parenthesised command name start at field 3 (state)
+        fields = stat[stat.rindex(b')') + 2:].split()
+        return (int(fields[11]) + int(fields[12])) / self._ticks_per_second
+    
+    def sample(self) -> Tuple[float, float, float]:
+        """Return (cpu_percent, memory_mb, memory_percent) since the last sample."""
+        cpu = self._cpu_seconds()
+        wall = time.perf_counter()
+        elapsed = wall - self._last_wall
+        cpu_percent = 100.0 * (cpu - self._last_cpu) / elapsed if elapsed > 0 else 0.0
+        self._last_cpu, self._last_wall = cpu, wall
+        
+        memory_mb = int(os.pread(self._statm_fd, 256, 0).split()[1]) * self._page_mb
+        return cpu_percent, memory_mb, 100.0 * memory_mb / self._total_mb
+    
+    def close(self):
+        os.close(self._stat_fd)
+        os.close(self._statm_fd)
+
+
 class ResourceProfiler:
-    """Profile CPU and memory usage during backtest execution."""
+    """Profile CPU and memory usage during backtest execution.
+    
+    Samples are stored column-wise in pre-allocated float64 arrays that
+    double in size when full; indexing the profiler returns a
+    ResourceSnapshot for one sample. A lock guards the columns, since the
+    monitor thread appends (and may reallocate) while callers read.
+    """
     
-    def __init__(self, sample_interval: float = 0.1):
+    def __init__(self, sample_interval: float = 0.1, capacity: int = 4096):
         """Initialize resource profiler.
         
         Args:
             sample_interval: Time between samples in seconds
+            capacity: Initial number of samples stored (grows automatically)
         """
         self.sample_interval = sample_interval
-        self.snapshots: List[ResourceSnapshot] = []
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._cpu_percent = np.empty(capacity, dtype=np.float64)
+        self._memory_mb = np.empty(capacity, dtype=np.float64)
+        self._memory_percent = np.empty(capacity, dtype=np.float64)
+        self._n = 0
+        self._lock = threading.Lock()
         self._monitoring = False
+        self._stop_event = threading.Event()
         self._monitor_thread: Optional[threading.Thread] = None
+        self._sampler: Optional[_ProcStatSampler] = None
         self.process = psutil.Process()
         
     def start(self):
@@ -36,51 +97,132 @@ class ResourceProfiler:
         if self._monitoring:
             return
         
+        try:
+            self._sampler = _ProcStatSampler()
+        except (OSError, ValueError, AttributeError):
+            self._sampler = None  # No /proc (or no os.pread); sample through psutil
+        
         self._monitoring = True
+        self._stop_event.clear()
         self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self._monitor_thread.start()
         
     def stop(self):
-        """Stop monitoring resources."""
+        """Stop monitoring resources.
+        
+        Wakes the monitor thread and waits for it; the thread closes the
+        /proc sampler itself on the way out.
+        """
         self._monitoring = False
+        self._stop_event.set()
         if self._monitor_thread:
-            self._monitor_thread.join(timeout=1.0)
+            self._monitor_thread.join()
+            self._monitor_thread = None
+    
+    def _sample(self) -> Tuple[float, float, float]:
+        """Return (cpu_percent, memory_mb, memory_percent) for this process."""
+        if self._sampler is not None:
+            return self._sampler.sample()
+        return (self.process.cpu_percent(interval=None),
+                self.process.memory_info().rss / (1024 * 1024),
+                self.process.memory_percent())
     
     def _monitor_loop(self):
-        """Background monitoring loop."""
-        while self._monitoring:
-            snapshot = ResourceSnapshot(
-                timestamp=time.time(),
-                cpu_percent=self.process.cpu_percent(interval=None),
-                memory_mb=self.process.memory_info().rss / (1024 * 1024),
-                memory_percent=self.process.memory_percent()
+        """Background monitoring loop.
+        
+        Sleeps until absolute deadlines spaced ``sample_interval`` apart, so
+        time spent sampling does not push later samples back.
+        """
+        deadline = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                cpu_percent, memory_mb, memory_percent = self._sample()
+                self.record(
+                    timestamp=time.time(),
+                    cpu_percent=cpu_percent,
+                    memory_mb=memory_mb,
+                    memory_percent=memory_percent
+                )
+                deadline += self.sample_interval
+                sleep_for = deadline - time.perf_counter()
+                if sleep_for > 0:
+                    self._stop_event.wait(sleep_for)
+                else:
+                    deadline = time.perf_counter()  # Fell behind; don't burst to catch up
+        finally:
+            if self._sampler is not None:
+                self._sampler.close()
+                self._sampler = None
+    
+    def record(self, timestamp: float, cpu_percent: float, memory_mb: float,
+               memory_percent: float):
+        """Append one sample."""
+        with self._lock:
+            i = self._n
+            if i == len(self._timestamps):
+                size = 2 * len(self._timestamps)
+                self._timestamps = np.resize(self._timestamps, size)
+                self._cpu_percent = np.resize(self._cpu_percent, size)
+                self._memory_mb = np.resize(self._memory_mb, size)
+                self._memory_percent = np.resize(self._memory_percent, size)
+            self._timestamps[i] = timestamp
+            self._cpu_percent[i] = cpu_percent
+            self._memory_mb[i] = memory_mb
+            self._memory_percent[i] = memory_percent
+            self._n = i + 1
+    
+    def __len__(self) -> int:
+        return self._n
+    
+    def __getitem__(self, i: int) -> ResourceSnapshot:
+        """Return sample ``i`` as a ResourceSnapshot."""
+        with self._lock:
+            if i < 0:
+                i += self._n
+            if not 0 <= i < self._n:
+                raise IndexError("snapshot index out of range")
+            return ResourceSnapshot(
+                timestamp=float(self._timestamps[i]),
+                cpu_percent=float(self._cpu_percent[i]),
+                memory_mb=float(self._memory_mb[i]),
+                memory_percent=float(self._memory_percent[i])
             )
-            self.snapshots.append(snapshot)
-            time.sleep(self.sample_interval)
+    
+    @property
+    def snapshots(self) -> List[ResourceSnapshot]:
+        """All samples as ResourceSnapshots (built on access)."""
+        with self._lock:
+            columns = (self._timestamps[:self._n].tolist(), self._cpu_percent[:self._n].tolist(),
+                       self._memory_mb[:self._n].tolist(), self._memory_percent[:self._n].tolist())
+        return [ResourceSnapshot(*sample) for sample in zip(*columns)]
     
     def get_stats(self) -> Dict:
         """Get summary statistics."""
-        if not self.snapshots:
-            return {}
+        from ._kernels import min_max_mean
         
-        cpu_values = [s.cpu_percent for s in self.snapshots]
-        memory_values = [s.memory_mb for s in self.snapshots]
+        with self._lock:
+            n = self._n
+            if not n:
+                return {}
+            cpu_min, cpu_max, cpu_mean = min_max_mean(self._cpu_percent[:n])
+            mem_min, mem_max, mem_mean = min_max_mean(self._memory_mb[:n])
         
         return {
             'cpu_percent': {
-                'mean': sum(cpu_values) / len(cpu_values),
-                'max': max(cpu_values),
-                'min': min(cpu_values)
+                'mean': cpu_mean,
+                'max': cpu_max,
+                'min': cpu_min
             },
             'memory_mb': {
-                'mean': sum(memory_values) / len(memory_values),
-                'max': max(memory_values),
-                'min': min(memory_values),
-                'peak': max(memory_values)
+                'mean': mem_mean,
+                'max': mem_max,
+                'min': mem_min,
+                'peak': mem_max
             },
-            'num_samples': len(self.snapshots)
+            'num_samples': n
         }
     
     def reset(self):
         """Clear collected snapshots."""
-        self.snapshots.clear()
+        with self._lock:
+            self._n = 0
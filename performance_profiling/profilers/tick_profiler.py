@@ -1,63 +1,165 @@
 """Per-tick processing time profiler."""
 
 import time
-import statistics
-from typing import List, Dict
-from collections import defaultdict
+from contextlib import contextmanager
+from typing import List, Dict, Iterator, Tuple
+
+import numpy as np
+
+_perf_counter_ns = time.perf_counter_ns
 
 
 class TickProfiler:
-    """Profile per-tick processing time."""
+    """Profile per-tick processing time.
     
-    def __init__(self):
-        self.tick_times: List[float] = []
-        self.component_times: Dict[str, List[float]] = defaultdict(list)
-        self._start_time: float = 0
-        self._component_start: float = 0
-        self.total_ticks: int = 0
+    Tick durations are stored as int64 nanoseconds in a pre-allocated
+    array, so recording a tick allocates nothing. The array doubles in
+    size if more than ``capacity`` ticks are recorded.
+    """
+    
+    def __init__(self, capacity: int = 1 << 20):
+        self._durations_ns = np.empty(capacity, dtype=np.int64)
+        self._n: int = 0
+        self._t0: int = 0
+        # Ticks recorded as block means by batch() rather than timed singly
+        self._batched: int = 0
+        # Per-component duration buffers, indexed by an id interned per name
+        self._component_ids: Dict[str, int] = {}
+        self._component_bufs: List[np.ndarray] = []
+        self._component_n: List[int] = []
+        # Open components as (id, start_ns), innermost last
+        self._component_stack: List[Tuple[int, int]] = []
+        
+    @property
+    def total_ticks(self) -> int:
+        """Number of ticks recorded."""
+        return self._n
+    
+    @property
+    def tick_times(self) -> np.ndarray:
+        """Recorded tick durations in seconds."""
+        return self._durations_ns[:self._n] / 1e9
+        
+    @property
+    def component_times(self) -> Dict[str, List[float]]:
+        """Recorded component durations in seconds, by component name."""
+        return {name: (self._component_bufs[cid][:self._component_n[cid]] / 1e9).tolist()
+                for name, cid in self._component_ids.items()}
+        
+    @property
+    def timing_mode(self) -> str:
+        """'per_tick', 'block_mean' (all ticks from batch()) or 'mixed'."""
+        if not self._batched:
+            return 'per_tick'
+        return 'block_mean' if self._batched == self._n else 'mixed'
         
     def start_tick(self):
         """Start timing a tick."""
-        self._start_time = time.perf_counter()
+        self._t0 = _perf_counter_ns()
         
     def end_tick(self):
         """End timing a tick."""
-        elapsed = time.perf_counter() - self._start_time
-        self.tick_times.append(elapsed)
-        self.total_ticks += 1
+        elapsed = _perf_counter_ns() - self._t0
+        n = self._n
+        if n == len(self._durations_ns):
+            self._reserve(1)
+        self._durations_ns[n] = elapsed
+        self._n = n + 1
+    
+    @contextmanager
+    def batch(self, n: int) -> Iterator[None]:
+        """Time ``n`` ticks as one block and record their mean duration.
+        
+        Amortizes the timer calls over the block, so per-tick profiler
+        overhead does not swamp cheap ticks. Each of the ``n`` slots
+        receives the block mean, so percentiles describe block means
+        (``get_stats`` reports the timing mode accordingly).
+        """
+        t0 = _perf_counter_ns()
+        yield
+        elapsed = _perf_counter_ns() - t0
+        if n <= 0:
+            return
+        self._reserve(n)
+        self._durations_ns[self._n:self._n + n] = elapsed // n
+        self._n += n
+        self._batched += n
+    
+    def _reserve(self, n: int):
+        """Grow the duration buffer to fit ``n`` more ticks."""
+        needed = self._n + n
+        if needed > len(self._durations_ns):
+            self._durations_ns = np.resize(self._durations_ns,
+                                           max(needed, 2 * len(self._durations_ns)))
+        
+    def _component_id(self, name: str) -> int:
+        """Return the id of a component, registering it on first use."""
+        cid = self._component_ids.get(name)
+        if cid is None:
+            cid = self._component_ids[name] = len(self._component_bufs)
+            self._component_bufs.append(np.empty(1024, dtype=np.int64))
+            self._component_n.append(0)
+        return cid
         
     def start_component(self, name: str):
-        """Start timing a component."""
-        self._component_start = time.perf_counter()
+        """Start timing a component (components may nest)."""
+        self._component_stack.append((self._component_id(name), _perf_counter_ns()))
         
     def end_component(self, name: str):
-        """End timing a component."""
-        elapsed = time.perf_counter() - self._component_start
-        self.component_times[name].append(elapsed)
+        """End timing the innermost open component.
+        
+        Raises:
+            ValueError: If ``name`` is not the innermost open component
+        """
+        end = _perf_counter_ns()
+        stack = self._component_stack
+        if not stack or stack[-1][0] != self._component_ids.get(name):
+            raise ValueError(f"end_component({name!r}) does not match the innermost open component")
+        cid, start = stack.pop()
+        n = self._component_n[cid]
+        buf = self._component_bufs[cid]
+        if n == len(buf):
+            buf = self._component_bufs[cid] = np.resize(buf, 2 * len(buf))
+        buf[n] = end - start
+        self._component_n[cid] = n + 1
     
     def get_stats(self) -> Dict:
         """Get timing statistics."""
-        if not self.tick_times:
+        if not self._n:
             return {}
         
+        from ._kernels import tick_moments, tick_percentiles
+        
+        n = self._n
+        durations_ns = self._durations_ns[:n]
+        mean_ns, min_ns, max_ns, std_ns = tick_moments(durations_ns)
+        middle = tick_percentiles(durations_ns, np.array([(n - 1) // 2, n // 2], dtype=np.int64))
+        total_seconds = mean_ns * n / 1e9
+        
         # Per-tick statistics
         tick_stats = {
-            'mean_us': statistics.mean(self.tick_times) * 1e6,
-            'median_us': statistics.median(self.tick_times) * 1e6,
-            'min_us': min(self.tick_times) * 1e6,
-            'max_us': max(self.tick_times) * 1e6,
-            'stddev_us': statistics.stdev(self.tick_times) * 1e6 if len(self.tick_times) > 1 else 0,
+            'mean_us': mean_ns / 1e3,
+            'median_us': float(middle.mean()) / 1e3,
+            'min_us': min_ns / 1e3,
+            'max_us': max_ns / 1e3,
+            'stddev_us': std_ns / 1e3,
             'total_ticks': self.total_ticks,
-            'ticks_per_second': self.total_ticks / sum(self.tick_times) if sum(self.tick_times) > 0 else 0
+            'batched_ticks': self._batched,
+            'timing': self.timing_mode,
+            'ticks_per_second': float(self.total_ticks / total_seconds) if total_seconds > 0 else 0
         }
         
         # Component-level statistics
         component_stats = {}
-        for name, times in self.component_times.items():
+        for name, cid in self._component_ids.items():
+            n = self._component_n[cid]
+            if not n:
+                continue
+            total_ns = int(self._component_bufs[cid][:n].sum())
             component_stats[name] = {
-                'mean_us': statistics.mean(times) * 1e6,
-                'total_calls': len(times),
-                'total_time_ms': sum(times) * 1000
+                'mean_us': total_ns / n / 1e3,
+                'total_calls': n,
+                'total_time_ms': total_ns / 1e6
             }
         
         return {
@@ -67,23 +169,23 @@ class TickProfiler:
     
     def get_percentiles(self, percentiles: List[int] = [50, 90, 95, 99]) -> Dict:
         """Get percentile statistics."""
-        if not self.tick_times:
+        if not self._n:
             return {}
         
-        sorted_times = sorted(self.tick_times)
-        n = len(sorted_times)
+        from ._kernels import tick_percentiles
         
-        result = {}
-        for p in percentiles:
-            idx = int((p / 100.0) * n)
-            if idx >= n:
-                idx = n - 1
-            result[f'p{p}_us'] = sorted_times[idx] * 1e6
+        n = self._n
+        ranks = np.array([min(int((p / 100.0) * n), n - 1) for p in percentiles], dtype=np.int64)
+        # One partial sort places every requested rank in its sorted position
+        values_ns = tick_percentiles(self._durations_ns[:n], ranks)
         
-        return result
+        return {f'p{p}_us': value / 1e3 for p, value in zip(percentiles, values_ns.tolist())}
     
     def reset(self):
         """Clear all timing data."""
-        self.tick_times.clear()
-        self.component_times.clear()
-        self.total_ticks = 0
+        self._n = 0
+        self._batched = 0
+        self._component_ids.clear()
+        self._component_bufs.clear()
+        self._component_n.clear()
+        self._component_stack.clear()
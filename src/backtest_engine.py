@@ -1,4 +1,3 @@
-from queue import Queue
 from datetime import datetime
 from typing import Type, Dict, Tuple
 
@@ -7,6 +6,7 @@ from .strategy.base_strategy import Strategy
 from .portfolio.portfolio import Portfolio
 from .execution.execution import ExecutionHandler
 from .utils.events import EventType
+from .utils.event_queue import EventQueue, EVENT_TYPE_CODES
 from .utils.performance import PerformanceMetrics
 import pandas as pd
 
@@ -23,14 +23,16 @@ class BacktestEngine:
         data_handler_cls: Type[DataHandler],
         execution_handler_cls: Type[ExecutionHandler],
         portfolio_cls: Type[Portfolio],
-        strategy_cls: Type[Strategy]
+        strategy_cls: Type[Strategy],
+        batch_size: int = 1024
     ):
         self.csv_dir = csv_dir
         self.symbol_list = symbol_list
         self.initial_capital = initial_capital
         self.start_date = start_date
+        self.batch_size = batch_size
         
-        self.events = Queue()
+        self.events = EventQueue()
         
         # Initialize components
         self.data_handler = data_handler_cls(self.events, csv_dir, symbol_list)
@@ -42,39 +44,63 @@ class BacktestEngine:
         self.signals = 0
         self.orders = 0
         self.fills = 0
+        
+        # Market timestamps whose portfolio snapshot is still to be recorded.
+        # Holdings only change on fills, so snapshots are written in blocks
+        # and flushed before every fill.
+        self._pending_timestamps = []
+        
+        # Event handlers indexed by the queue's integer type codes
+        self._handlers = [None] * len(EVENT_TYPE_CODES)
+        self._handlers[EVENT_TYPE_CODES[EventType.MARKET]] = self._on_market
+        self._handlers[EVENT_TYPE_CODES[EventType.SIGNAL]] = self._on_signal
+        self._handlers[EVENT_TYPE_CODES[EventType.ORDER]] = self._on_order
+        self._handlers[EVENT_TYPE_CODES[EventType.FILL]] = self._on_fill
+    
+    def _on_market(self, event) -> None:
+        self.strategy.on_tick(event)
+        pending = self._pending_timestamps
+        pending.append(event.timestamp)
+        if len(pending) >= self.batch_size:
+            self._flush_timeindex()
+    
+    def _flush_timeindex(self) -> None:
+        """Record portfolio snapshots for all pending market timestamps."""
+        if self._pending_timestamps:
+            self.portfolio.update_timeindex_batch(self._pending_timestamps)
+            self._pending_timestamps = []
+    
+    def _on_signal(self, event) -> None:
+        self.signals += 1
+        self.portfolio.generate_order(event)
+    
+    def _on_order(self, event) -> None:
+        self.orders += 1
+        self.execution_handler.execute_order(event)
+    
+    def _on_fill(self, event) -> None:
+        self.fills += 1
+        self._flush_timeindex()
+        self.portfolio.update_fill(event)
     
     def _run_backtest(self) -> None:
         """Execute the main event loop."""
-        while True:
+        # Bind everything the loop touches once, outside the loop
+        data_handler = self.data_handler
+        update_bars = data_handler.update_bars
+        pop, qsize = self.events.pop, self.events.qsize
+        handlers = self._handlers
+        
+        while data_handler.continue_backtest:
             # Update market data
-            if self.data_handler.continue_backtest:
-                self.data_handler.update_bars()
-            else:
-                break
+            update_bars()
             
-            # Process event queue
-            while True:
-                try:
-                    event = self.events.get(False)
-                except:
-                    break
-                else:
-                    if event is not None:
-                        if event.type == EventType.MARKET:
-                            self.strategy.on_tick(event)
-                            self.portfolio.update_timeindex(event)
-                        
-                        elif event.type == EventType.SIGNAL:
-                            self.signals += 1
-                            self.portfolio.generate_order(event)
-                        
-                        elif event.type == EventType.ORDER:
-                            self.orders += 1
-                            self.execution_handler.execute_order(event)
-                        
-                        elif event.type == EventType.FILL:
-                            self.fills += 1
-                            self.portfolio.update_fill(event)
+            # Process event queue in timestamp order
+            while qsize():
+                type_code, event = pop()
+                handlers[type_code](event)
+        
+        self._flush_timeindex()
     
     def run(self) -> Tuple[Dict[str, float], pd.DataFrame]:
         """Run backtest and return performance metrics."""
@@ -37,6 +37,10 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Streamlit re-executes this script on every interaction; cache_data keeps
+# deterministic loading, metric computation and figure building from being
+# redone each time
+@st.cache_data(ttl=3600)
 def load_sample_data():
     """Load or generate sample backtest data."""
     np.random.seed(42)
@@ -77,27 +81,121 @@ def load_sample_data():
         'market': market_data
     }
 
+@st.cache_data
 def calculate_metrics(equity_df):
     """Calculate key performance metrics."""
-    returns = equity_df['equity'].pct_change().dropna()
+    equity = equity_df['equity'].to_numpy(dtype=np.float64)
+    returns = np.diff(equity) / equity[:-1]
+    returns_std = returns.std(ddof=1) if len(returns) > 1 else 0.0
     
     # Calculate drawdown
-    cumulative = equity_df['equity']
-    running_max = cumulative.expanding().max()
-    drawdown = (cumulative - running_max) / running_max
+    running_max = np.maximum.accumulate(equity)
+    drawdown = (equity - running_max) / running_max
     
     metrics = {
-        'total_return': (equity_df['equity'].iloc[-1] / equity_df['equity'].iloc[0] - 1) * 100,
-        'sharpe_ratio': returns.mean() / returns.std() * np.sqrt(252) if returns.std() > 0 else 0,
+        'total_return': (equity[-1] / equity[0] - 1) * 100,
+        'sharpe_ratio': returns.mean() / returns_std * np.sqrt(252) if returns_std > 0 else 0,
         'max_drawdown': drawdown.min() * 100,
-        'win_rate': (returns > 0).sum() / len(returns) * 100,
-        'volatility': returns.std() * np.sqrt(252) * 100,
+        'win_rate': (returns > 0).mean() * 100,
+        'volatility': returns_std * np.sqrt(252) * 100,
         'total_trades': len(returns)
     }
     
     equity_df['drawdown'] = drawdown * 100
     return metrics, equity_df
 
+@st.cache_data
+def build_equity_figure(equity_data):
+    """Build the equity curve and drawdown figure."""
+    fig_equity = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.03,
+        subplot_titles=('Equity Curve', 'Drawdown %'),
+        row_heights=[0.7, 0.3]
+    )
+    
+    # Equity curve
+    fig_equity.add_trace(
+        go.Scatter(
+            x=equity_data['date'],
+            y=equity_data['equity'],
+            name='Equity',
+            line=dict(color='#2E86AB', width=2),
+            fill='tozeroy',
+            fillcolor='rgba(46, 134, 171, 0.1)'
+        ),
+        row=1, col=1
+    )
+    
+    # Drawdown
+    fig_equity.add_trace(
+        go.Scatter(
+            x=equity_data['date'],
+            y=equity_data['drawdown'],
+            name='Drawdown',
+            line=dict(color='#A23B72', width=2),
+            fill='tozeroy',
+            fillcolor='rgba(162, 59, 114, 0.2)'
+        ),
+        row=2, col=1
+    )
+    
+    fig_equity.update_xaxes(title_text="Date", row=2, col=1)
+    fig_equity.update_yaxes(title_text="Equity ($)", row=1, col=1)
+    fig_equity.update_yaxes(title_text="Drawdown (%)", row=2, col=1)
+    fig_equity.update_layout(height=600, showlegend=True, hovermode='x unified')
+    return fig_equity
+
+@st.cache_data
+def build_distribution_figure(values, name, xaxis_title, color, bins=30):
+    """Build a histogram figure for an execution quality series.
+    
+    Binning happens here rather than in the browser, so the figure ships
+    ``bins`` bars instead of every trade.
+    """
+    counts, edges = np.histogram(np.asarray(values, dtype=np.float64), bins=bins)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        name=name,
+        marker_color=color
+    ))
+    fig.update_layout(
+        xaxis_title=xaxis_title,
+        yaxis_title="Frequency",
+        showlegend=False,
+        height=400
+    )
+    return fig
+
+@st.cache_data
+def build_imbalance_figure(market):
+    """Build the volume imbalance bar figure."""
+    fig_imbalance = go.Figure()
+    fig_imbalance.add_trace(go.Bar(
+        x=market['timestamp'],
+        y=market['imbalance'],
+        name='Imbalance',
+        marker=dict(
+            color=market['imbalance'],
+            colorscale=['#A23B72', '#F0F0F0', '#2E86AB'],
+            cmid=0,
+            colorbar=dict(title="Imbalance")
+        )
+    ))
+    
+    fig_imbalance.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Buy/Sell Imbalance",
+        height=400,
+        showlegend=False,
+        hovermode='x unified'
+    )
+    return fig_imbalance
+
 # Title
 st.title("📈 Event-Driven Backtest Dashboard")
 st.markdown("Interactive visualization of backtest results with execution analytics")
@@ -152,45 +250,9 @@ st.markdown("---")
 
 # Equity Curve & Drawdown
 st.header("💵 Equity Curve & Drawdown")
-fig_equity = make_subplots(
-    rows=2, cols=1,
-    shared_xaxes=True,
-    vertical_spacing=0.03,
-    subplot_titles=('Equity Curve', 'Drawdown %'),
-    row_heights=[0.7, 0.3]
-)
-
-# Equity curve
-fig_equity.add_trace(
-    go.Scatter(
-        x=equity_data['date'],
-        y=equity_data['equity'],
-        name='Equity',
-        line=dict(color='#2E86AB', width=2),
-        fill='tozeroy',
-        fillcolor='rgba(46, 134, 171, 0.1)'
-    ),
-    row=1, col=1
-)
-
-# Drawdown
-if show_drawdown:
-    fig_equity.add_trace(
-        go.Scatter(
-            x=equity_data['date'],
-            y=equity_data['drawdown'],
-            name='Drawdown',
-            line=dict(color='#A23B72', width=2),
-            fill='tozeroy',
-            fillcolor='rgba(162, 59, 114, 0.2)'
-        ),
-        row=2, col=1
-    )
-
-fig_equity.update_xaxes(title_text="Date", row=2, col=1)
-fig_equity.update_yaxes(title_text="Equity ($)", row=1, col=1)
-fig_equity.update_yaxes(title_text="Drawdown (%)", row=2, col=1)
-fig_equity.update_layout(height=600, showlegend=True, hovermode='x unified')
+fig_equity = build_equity_figure(equity_data)
+# Toggle visibility instead of rebuilding so the cached figure stays valid
+fig_equity.update_traces(visible=show_drawdown, selector=dict(name='Drawdown'))
 st.plotly_chart(fig_equity, use_container_width=True)
 
 st.markdown("---")
@@ -201,19 +263,7 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Slippage Distribution")
-    fig_slippage = go.Figure()
-    fig_slippage.add_trace(go.Histogram(
-        x=data['trades']['slippage_bps'],
-        nbinsx=30,
-        name='Slippage',
-        marker_color='#F18F01'
-    ))
-    fig_slippage.update_layout(
-        xaxis_title="Slippage (bps)",
-        yaxis_title="Frequency",
-        showlegend=False,
-        height=400
-    )
+    fig_slippage = build_distribution_figure(data['trades']['slippage_bps'], 'Slippage', "Slippage (bps)", '#F18F01')
     st.plotly_chart(fig_slippage, use_container_width=True)
     
     # Slippage stats
@@ -222,19 +272,7 @@ with col1:
 
 with col2:
     st.subheader("Latency Distribution")
-    fig_latency = go.Figure()
-    fig_latency.add_trace(go.Histogram(
-        x=data['trades']['latency_ms'],
-        nbinsx=30,
-        name='Latency',
-        marker_color='#06A77D'
-    ))
-    fig_latency.update_layout(
-        xaxis_title="Latency (ms)",
-        yaxis_title="Frequency",
-        showlegend=False,
-        height=400
-    )
+    fig_latency = build_distribution_figure(data['trades']['latency_ms'], 'Latency', "Latency (ms)", '#06A77D')
     st.plotly_chart(fig_latency, use_container_width=True)
     
     # Latency stats
@@ -248,27 +286,7 @@ st.markdown("---")
 st.header("📋 Market Microstructure")
 st.subheader("Volume Imbalance")
 
-fig_imbalance = go.Figure()
-fig_imbalance.add_trace(go.Bar(
-    x=data['market']['timestamp'],
-    y=data['market']['imbalance'],
-    name='Imbalance',
-    marker=dict(
-        color=data['market']['imbalance'],
-        colorscale=['#A23B72', '#F0F0F0', '#2E86AB'],
-        cmid=0,
-        colorbar=dict(title="Imbalance")
-    )
-))
-
-fig_imbalance.update_layout(
-    xaxis_title="Date",
-    yaxis_title="Buy/Sell Imbalance",
-    height=400,
-    showlegend=False,
-    hovermode='x unified'
-)
-
+fig_imbalance = build_imbalance_figure(data['market'])
 st.plotly_chart(fig_imbalance, use_container_width=True)
 st.caption("Positive = More bid volume, Negative = More ask volume")
 
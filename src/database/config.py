@@ -1,12 +1,53 @@
 """Database configuration and connection pooling."""
-from typing import Optional
-from sqlalchemy import create_engine, event, Engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, Hashable, Iterator, Optional, Tuple
+from sqlalchemy import create_engine, event, inspect, Engine
+from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool, NullPool
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Table names per database, with the monotonic time they were read at
+_schema_cache: Dict[Hashable, Tuple[float, FrozenSet[str]]] = {}
+
+
+def _schema_key(engine: Engine) -> Hashable:
+    """Cache key for an engine's schema: its URL, unless the database is in-memory."""
+    if engine.url.database in (None, '', ':memory:'):
+        return id(engine)
+    return engine.url.render_as_string(hide_password=False)
+
+
+def cached_table_names(engine: Engine, ttl: float = 30.0) -> FrozenSet[str]:
+    """Return the database's table names, introspecting at most once per ``ttl`` seconds.
+    
+    Engines for the same database URL share the cached result, so creating
+    many engines (e.g. one repository per request) does not repeat the
+    introspection queries.
+    
+    Args:
+        engine: Database engine
+        ttl: Seconds a cached result stays valid
+        
+    Returns:
+        Set of table names
+    """
+    key = _schema_key(engine)
+    now = time.monotonic()
+    cached = _schema_cache.get(key)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+    names = frozenset(inspect(engine).get_table_names())
+    _schema_cache[key] = (now, names)
+    return names
+
+
+def invalidate_schema_cache(engine: Engine) -> None:
+    """Drop the cached table names for an engine's database (call after DDL)."""
+    _schema_cache.pop(_schema_key(engine), None)
+
 
 class DatabaseConfig:
     """Configuration for database connections."""
@@ -19,7 +60,9 @@ class DatabaseConfig:
         pool_timeout: int = 30,
         pool_recycle: int = 3600,
         echo: bool = False,
-        use_pool: bool = True
+        use_pool: bool = True,
+        pool_pre_ping: bool = False,
+        insert_page_size: int = 1000
     ):
         """Initialize database configuration.
         
@@ -30,7 +73,11 @@ class DatabaseConfig:
             pool_timeout: Timeout for getting connection from pool
             pool_recycle: Recycle connections after this many seconds
             echo: Echo SQL statements to log
-            use_pool: Use connection pooling (False for SQLite)
+            use_pool: Use connection pooling (False opens a connection per checkout)
+            pool_pre_ping: Test each connection with a round trip on checkout
+                (pool_recycle already retires stale connections)
+            insert_page_size: Rows rendered into one multi-row INSERT ... VALUES
+                statement when inserting many rows
         """
         self.database_url = database_url
         self.pool_size = pool_size
@@ -39,6 +86,8 @@ class DatabaseConfig:
         self.pool_recycle = pool_recycle
         self.echo = echo
         self.use_pool = use_pool
+        self.pool_pre_ping = pool_pre_ping
+        self.insert_page_size = insert_page_size
         self._engine: Optional[Engine] = None
         self._session_factory = None
     
@@ -53,21 +102,29 @@ class DatabaseConfig:
         
         engine_kwargs = {
             'echo': self.echo,
+            'insertmanyvalues_page_size': self.insert_page_size,
         }
+        if self.database_url.startswith('postgresql+psycopg2'):
+            # Batch executemany UPDATE/DELETE too, not just INSERT
+            engine_kwargs['executemany_mode'] = 'values_plus_batch'
         
         # Configure pooling based on database type
-        if self.use_pool and not self.database_url.startswith('sqlite'):
+        if not self.use_pool:
+            engine_kwargs['poolclass'] = NullPool
+        elif self.database_url.startswith('sqlite'):
+            # Keep SQLAlchemy's default SQLite pool and let pooled
+            # connections be handed to other threads
+            engine_kwargs['connect_args'] = {'check_same_thread': False}
+        else:
             engine_kwargs.update({
                 'poolclass': QueuePool,
                 'pool_size': self.pool_size,
                 'max_overflow': self.max_overflow,
                 'pool_timeout': self.pool_timeout,
                 'pool_recycle': self.pool_recycle,
-                'pool_pre_ping': True,  # Verify connections before using
+                'pool_pre_ping': self.pool_pre_ping,
+                'pool_use_lifo': True,  # Reuse the most recently returned (warm) connection
             })
-        else:
-            # SQLite doesn't support connection pooling well
-            engine_kwargs['poolclass'] = NullPool
         
         self._engine = create_engine(self.database_url, **engine_kwargs)
         
@@ -83,14 +140,34 @@ class DatabaseConfig:
         Args:
             engine: Database engine
         """
-        @event.listens_for(engine, "connect")
-        def set_sqlite_pragma(dbapi_conn, connection_record):
-            """Enable foreign keys and WAL mode for SQLite."""
-            if 'sqlite' in str(dbapi_conn):
+        if engine.dialect.name == 'sqlite':
+            @event.listens_for(engine, "connect")
+            def set_sqlite_pragma(dbapi_conn, connection_record):
+                """Enable foreign keys, WAL mode and in-memory temp storage for SQLite.
+                
+                With WAL, readers don't block on writers and synchronous=NORMAL
+                only syncs at checkpoints instead of on every commit. The
+                driver's implicit transaction handling is switched off so
+                that transactions begin exactly where SQLAlchemy begins them.
+                """
+                dbapi_conn.isolation_level = None
                 cursor = dbapi_conn.cursor()
                 cursor.execute("PRAGMA foreign_keys=ON")
                 cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+                cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
                 cursor.close()
+            
+            @event.listens_for(engine, "begin")
+            def begin_sqlite_transaction(conn):
+                """Emit BEGIN ourselves now that the driver no longer does."""
+                conn.exec_driver_sql("BEGIN")
+        
+        # Pool tracing fires on every checkout/checkin; only pay for it when echoing
+        if not self.echo:
+            return
         
         @event.listens_for(engine, "checkin")
         def receive_checkin(dbapi_conn, connection_record):
@@ -102,36 +179,54 @@ class DatabaseConfig:
             """Log connection checkout."""
             logger.debug("Connection retrieved from pool")
     
-    def get_session_factory(self) -> scoped_session:
-        """Get thread-safe session factory.
+    def get_session_factory(self) -> sessionmaker:
+        """Get session factory.
+        
+        Sessions are independent (one per call, no thread-local registry)
+        and keep loaded attributes after commit, so read-heavy callers do
+        not reload every object they touch after committing.
         
         Returns:
-            Scoped session factory
+            Session factory
         """
         if self._session_factory is None:
             engine = self.create_engine()
-            session_factory = sessionmaker(bind=engine)
-            self._session_factory = scoped_session(session_factory)
-            logger.info("Created scoped session factory")
+            self._session_factory = sessionmaker(bind=engine, expire_on_commit=False,
+                                                 autoflush=False)
+            logger.info("Created session factory")
         return self._session_factory
     
-    def get_session(self):
+    def get_session(self) -> Session:
         """Get a new database session.
         
         Returns:
             Database session (context manager)
         """
-        Session = self.get_session_factory()
-        return Session()
+        return self.get_session_factory()()
+    
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a session that commits on success and rolls back on error.
+        
+        Yields:
+            Database session, closed on exit
+        """
+        session = self.get_session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
     
     def dispose(self) -> None:
         """Dispose of the engine and close all connections."""
         if self._engine is not None:
             self._engine.dispose()
             logger.info("Database engine disposed")
-        if self._session_factory is not None:
-            self._session_factory.remove()
-            logger.info("Session factory removed")
+        self._session_factory = None
     
     def get_pool_status(self) -> dict:
         """Get current connection pool status.
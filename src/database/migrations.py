@@ -1,11 +1,38 @@
 """Database migration utilities."""
-from typing import List, Callable
-from sqlalchemy import inspect, Table, MetaData
+from typing import List, Callable, Optional
+from sqlalchemy import inspect, text, Table, MetaData
 from sqlalchemy.orm import Session
 import logging
+import time
+from .config import cached_table_names, invalidate_schema_cache
 
 logger = logging.getLogger(__name__)
 
+# Version table statements, built once and reused (SQLAlchemy caches their compiled form)
+_CREATE_VERSION_TABLE = text("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        version INTEGER NOT NULL,
+        applied_at TIMESTAMP NOT NULL
+    )
+""")
+_GET_VERSION = text("SELECT version FROM schema_version ORDER BY version DESC LIMIT 1")
+_SET_VERSION = text("INSERT INTO schema_version (version, applied_at) VALUES (:version, CURRENT_TIMESTAMP)")
+
+# Rows processed so far by paged migrations that have not finished
+_CREATE_PROGRESS_TABLE = text("""
+    CREATE TABLE IF NOT EXISTS schema_migration_progress (
+        version INTEGER PRIMARY KEY,
+        progress_offset INTEGER NOT NULL
+    )
+""")
+_GET_PROGRESS = text("SELECT progress_offset FROM schema_migration_progress WHERE version = :version")
+_UPDATE_PROGRESS = text(
+    "UPDATE schema_migration_progress SET progress_offset = :offset WHERE version = :version")
+_INSERT_PROGRESS = text(
+    "INSERT INTO schema_migration_progress (version, progress_offset) VALUES (:version, :offset)")
+_CLEAR_PROGRESS = text("DELETE FROM schema_migration_progress WHERE version = :version")
+
 
 class MigrationManager:
     """Manager for database schema migrations."""
@@ -19,6 +46,7 @@ class MigrationManager:
         self.engine = engine
         self.metadata = MetaData()
         self.migrations: List[Migration] = []
+        self._current_version: Optional[int] = None
     
     def register_migration(self, migration: 'Migration') -> None:
         """Register a migration.
@@ -33,19 +61,25 @@ class MigrationManager:
     def get_current_version(self) -> int:
         """Get current database schema version.
         
+        The version is read from the database once and then tracked in
+        process; call invalidate() if something else migrates the database.
+        
         Returns:
             Current version number
         """
-        inspector = inspect(self.engine)
-        if 'schema_version' not in inspector.get_table_names():
+        if self._current_version is not None:
+            return self._current_version
+        if 'schema_version' not in cached_table_names(self.engine):
             return 0
         
         with Session(self.engine) as session:
-            result = session.execute(
-                "SELECT version FROM schema_version ORDER BY version DESC LIMIT 1"
-            )
-            row = result.first()
-            return row[0] if row else 0
+            row = session.execute(_GET_VERSION).first()
+        self._current_version = row[0] if row else 0
+        return self._current_version
+    
+    def invalidate(self) -> None:
+        """Forget the tracked version so the next lookup reads the database."""
+        self._current_version = None
     
     def set_version(self, version: int) -> None:
         """Set database schema version.
@@ -54,31 +88,63 @@ class MigrationManager:
             version: Version number to set
         """
         with Session(self.engine) as session:
-            session.execute(
-                "INSERT INTO schema_version (version, applied_at) VALUES (?, CURRENT_TIMESTAMP)",
-                (version,)
-            )
+            session.execute(_SET_VERSION, {'version': version})
             session.commit()
+        self._current_version = version
         logger.info(f"Set schema version to {version}")
     
     def create_version_table(self) -> None:
-        """Create schema version tracking table if it doesn't exist."""
+        """Create schema version and migration progress tables if they don't exist."""
+        if {'schema_version', 'schema_migration_progress'} <= cached_table_names(self.engine):
+            return
         with Session(self.engine) as session:
-            session.execute("""
-                CREATE TABLE IF NOT EXISTS schema_version (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    version INTEGER NOT NULL,
-                    applied_at TIMESTAMP NOT NULL
-                )
-            """)
+            session.execute(_CREATE_VERSION_TABLE)
+            session.execute(_CREATE_PROGRESS_TABLE)
             session.commit()
+        invalidate_schema_cache(self.engine)
         logger.info("Created schema_version table")
     
-    def migrate(self, target_version: int = None) -> None:
+    def _upgrade_paged(self, migration: 'Migration') -> None:
+        """Run a paged migration, committing each page with its progress.
+        
+        Progress is stored in the same transaction as the page, so an
+        interrupted migration resumes at the first uncommitted page.
+        
+        Args:
+            migration: Migration with ``paginated`` set
+        """
+        with self.engine.connect() as conn:
+            row = conn.execute(_GET_PROGRESS, {'version': migration.version}).first()
+        offset = row[0] if row else 0
+        if offset:
+            logger.info(f"Resuming migration v{migration.version} at row {offset}")
+        
+        while True:
+            with self.engine.begin() as conn:
+                with Session(bind=conn) as session:
+                    processed = migration.upgrade_page(session, offset, migration.page_size)
+                    session.flush()
+                offset += processed
+                params = {'version': migration.version, 'offset': offset}
+                if conn.execute(_UPDATE_PROGRESS, params).rowcount == 0:
+                    conn.execute(_INSERT_PROGRESS, params)
+            if processed < migration.page_size:
+                break
+        
+        with self.engine.begin() as conn:
+            conn.execute(_CLEAR_PROGRESS, {'version': migration.version})
+    
+    def migrate(self, target_version: int = None, defer_indexes: bool = False) -> None:
         """Run migrations up to target version.
         
+        Building indexes before a bulk load makes every inserted row update
+        them, so with ``defer_indexes`` the run stops before the first
+        index-building migration; call finalize_indexes() once the data is
+        loaded to apply it and the migrations after it.
+        
         Args:
             target_version: Version to migrate to (None for latest)
+            defer_indexes: Stop before migrations that build indexes
         """
         self.create_version_table()
         current_version = self.get_current_version()
@@ -90,11 +156,26 @@ class MigrationManager:
         
         for migration in self.migrations:
             if current_version < migration.version <= target_version:
+                if defer_indexes and migration.builds_indexes:
+                    logger.info(f"Deferring migration v{migration.version}: {migration.name}")
+                    return
                 logger.info(f"Applying migration v{migration.version}: {migration.name}")
-                migration.upgrade(self.engine)
+                if migration.paginated:
+                    self._upgrade_paged(migration)
+                else:
+                    migration.upgrade(self.engine)
+                invalidate_schema_cache(self.engine)
                 self.set_version(migration.version)
                 logger.info(f"Migration v{migration.version} applied successfully")
     
+    def finalize_indexes(self, target_version: int = None) -> None:
+        """Apply migrations held back by ``migrate(defer_indexes=True)``.
+        
+        Args:
+            target_version: Version to migrate to (None for latest)
+        """
+        self.migrate(target_version)
+    
     def rollback(self, target_version: int) -> None:
         """Rollback migrations to target version.
         
@@ -108,12 +189,20 @@ class MigrationManager:
             if target_version < migration.version <= current_version:
                 logger.info(f"Rolling back migration v{migration.version}: {migration.name}")
                 migration.downgrade(self.engine)
+                invalidate_schema_cache(self.engine)
                 logger.info(f"Migration v{migration.version} rolled back")
 
 
 class Migration:
     """Base class for database migrations."""
     
+    # Whether the migration builds indexes (and can be deferred past bulk loads)
+    builds_indexes = False
+    
+    # Paged migrations implement upgrade_page() and commit once per page
+    paginated = False
+    page_size = 1000
+    
     def __init__(self, version: int, name: str):
         """Initialize migration.
         
@@ -132,6 +221,22 @@ class Migration:
         """
         raise NotImplementedError("Subclasses must implement upgrade()")
     
+    def upgrade_page(self, session: Session, offset: int, limit: int) -> int:
+        """Apply one page of a paged migration.
+        
+        Called repeatedly with increasing offsets, each in its own
+        transaction, until it processes fewer than ``limit`` rows.
+        
+        Args:
+            session: Session bound to the page's transaction
+            offset: Rows already processed
+            limit: Maximum rows to process
+            
+        Returns:
+            Number of rows processed
+        """
+        raise NotImplementedError("Paginated migrations must implement upgrade_page()")
+    
     def downgrade(self, engine) -> None:
         """Revert migration.
         
@@ -142,45 +247,124 @@ class Migration:
 
 
 class AddIndexMigration(Migration):
-    """Migration to add database indexes for performance."""
+    """Migration to add database indexes for performance.
     
-    def __init__(self):
-        super().__init__(version=1, name="Add performance indexes")
+    Indexes that already exist are skipped, and the rest are built one at
+    a time, each on its own short-lived connection with a pause in between,
+    so startup does not tie up the connection pool. On PostgreSQL they are
+    built CONCURRENTLY outside a transaction, so writers to the tables are
+    not blocked while they build.
+    """
+    
+    builds_indexes = True
+    
+    # (index name, table, column expression)
+    INDEXES = (
+        ('idx_backtest_runs_strategy', 'backtest_runs', 'strategy_name'),  # Faster filtering
+        ('idx_backtest_runs_created', 'backtest_runs', 'created_at'),  # Sorting
+        ('idx_trades_backtest_run', 'trades', 'backtest_run_id'),  # Joins
+        ('idx_trades_symbol', 'trades', 'symbol'),  # Filtering
+    )
+    
+    # Seconds to wait between consecutive index builds
+    BUILD_DELAY = 0.5
+    
+    def __init__(self, version: int = 1, name: str = "Add performance indexes"):
+        super().__init__(version=version, name=name)
+    
+    @staticmethod
+    def _connect(engine):
+        """Open a connection suitable for index DDL on this dialect."""
+        if engine.dialect.name == 'postgresql':
+            return engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        return engine.begin()
+    
+    def _existing_indexes(self, engine) -> set:
+        """Names of indexes already present on the migration's tables."""
+        inspector = inspect(engine)
+        return {index['name']
+                for table in {table for _, table, _ in self.INDEXES}
+                for index in inspector.get_indexes(table)}
     
     def upgrade(self, engine) -> None:
         """Add indexes to improve query performance."""
-        with Session(engine) as session:
-            # Add index on backtest_runs.strategy_name for faster filtering
-            session.execute("""
-                CREATE INDEX IF NOT EXISTS idx_backtest_runs_strategy 
-                ON backtest_runs(strategy_name)
-            """)
-            
-            # Add index on backtest_runs.created_at for sorting
-            session.execute("""
-                CREATE INDEX IF NOT EXISTS idx_backtest_runs_created 
-                ON backtest_runs(created_at)
-            """)
-            
-            # Add index on trades.backtest_run_id for joins
-            session.execute("""
-                CREATE INDEX IF NOT EXISTS idx_trades_backtest_run 
-                ON trades(backtest_run_id)
-            """)
-            
-            # Add index on trades.symbol for filtering
-            session.execute("""
-                CREATE INDEX IF NOT EXISTS idx_trades_symbol 
-                ON trades(symbol)
-            """)
-            
-            session.commit()
+        concurrently = ' CONCURRENTLY' if engine.dialect.name == 'postgresql' else ''
+        existing = self._existing_indexes(engine)
+        missing = [spec for spec in self.INDEXES if spec[0] not in existing]
+        for i, (name, table, column) in enumerate(missing):
+            if i:
+                time.sleep(self.BUILD_DELAY)
+            with self._connect(engine) as conn:
+                conn.execute(text(f"CREATE INDEX{concurrently} IF NOT EXISTS {name} ON {table}({column})"))
+            logger.info(f"Created index {name}")
     
     def downgrade(self, engine) -> None:
         """Remove indexes."""
-        with Session(engine) as session:
-            session.execute("DROP INDEX IF EXISTS idx_backtest_runs_strategy")
-            session.execute("DROP INDEX IF EXISTS idx_backtest_runs_created")
-            session.execute("DROP INDEX IF EXISTS idx_trades_backtest_run")
-            session.execute("DROP INDEX IF EXISTS idx_trades_symbol")
-            session.commit()
+        concurrently = ' CONCURRENTLY' if engine.dialect.name == 'postgresql' else ''
+        with self._connect(engine) as conn:
+            for name, _, _ in self.INDEXES:
+                conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
+
+
+class CompositeIndexMigration(AddIndexMigration):
+    """Migration adding composite indexes for the common query shapes.
+    
+    The backtest_runs index serves strategy + symbol filters ordered by
+    creation time straight from index order; the trades index covers
+    aggregate_stats filtered by run and symbol without reading the table.
+    """
+    
+    INDEXES = (
+        ('idx_backtest_runs_strat_sym_created', 'backtest_runs', 'strategy_name, symbol, created_at DESC'),
+        ('idx_trades_run_symbol_pnl', 'trades', 'backtest_run_id, symbol, pnl'),
+    )
+    
+    def __init__(self):
+        super().__init__(version=2, name="Add composite indexes")
+
+
+class ReturnIndexMigration(AddIndexMigration):
+    """Migration indexing backtest runs by return for top-N queries."""
+    
+    INDEXES = (
+        ('idx_backtest_runs_return', 'backtest_runs', 'total_return_pct DESC'),
+    )
+    
+    def __init__(self):
+        super().__init__(version=3, name="Add return index")
+
+
+class RenameTradesRunIndexMigration(AddIndexMigration):
+    """Migration replacing v1's trades join index with the model-declared one.
+    
+    The Trade model declares ``index=True`` on backtest_run_id, so
+    create_all already builds ix_trades_backtest_run_id and v1's
+    idx_trades_backtest_run duplicates it. Upgrade makes sure the declared
+    index exists and drops the duplicate. Downgrade restores the duplicate.
+    The declared index stays, since the model owns it.
+    """
+    
+    INDEXES = (
+        ('ix_trades_backtest_run_id', 'trades', 'backtest_run_id'),
+    )
+    REPLACED = (
+        ('idx_trades_backtest_run', 'trades', 'backtest_run_id'),
+    )
+    
+    def __init__(self):
+        super().__init__(version=4, name="Rename trades run index")
+    
+    def upgrade(self, engine) -> None:
+        """Create the declared index, then drop the one it replaces."""
+        super().upgrade(engine)
+        concurrently = ' CONCURRENTLY' if engine.dialect.name == 'postgresql' else ''
+        with self._connect(engine) as conn:
+            for name, _, _ in self.REPLACED:
+                conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
+    
+    def downgrade(self, engine) -> None:
+        """Recreate the replaced index."""
+        concurrently = ' CONCURRENTLY' if engine.dialect.name == 'postgresql' else ''
+        with self._connect(engine) as conn:
+            for name, table, column in self.REPLACED:
+                conn.execute(text(f"CREATE INDEX{concurrently} IF NOT EXISTS {name} ON {table}({column})"))
@@ -1,63 +1,84 @@
 """SQLAlchemy database models for storing backtest results."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from typing import Any, Dict, List, Optional
+from sqlalchemy import String, ForeignKey, JSON
+from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, mapped_column, relationship
 
-Base = declarative_base()
+
+class Base(MappedAsDataclass, DeclarativeBase):
+    """Declarative base; models are dataclasses with generated ``__init__``.
+    
+    Models compare by identity (``eq=False`` on each model), like the ORM
+    instances they replace.
+    """
 
 
-class BacktestRun(Base):
+class BacktestRun(Base, eq=False):
     """Model for storing backtest run information."""
     __tablename__ = 'backtest_runs'
     
-    id = Column(Integer, primary_key=True)
-    name = Column(String(200), nullable=False)
-    strategy_name = Column(String(100), nullable=False)
-    symbol = Column(String(20), nullable=False)
-    start_date = Column(DateTime, nullable=False)
-    end_date = Column(DateTime, nullable=False)
-    initial_capital = Column(Float, nullable=False)
-    final_capital = Column(Float, nullable=False)
-    total_return_pct = Column(Float)
-    sharpe_ratio = Column(Float)
-    max_drawdown_pct = Column(Float)
-    win_rate_pct = Column(Float)
-    total_trades = Column(Integer)
-    config = Column(JSON)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    
-    trades = relationship("Trade", back_populates="backtest_run", cascade="all, delete-orphan")
-    metrics = relationship("PerformanceMetric", back_populates="backtest_run", cascade="all, delete-orphan")
-
-
-class Trade(Base):
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    name: Mapped[str] = mapped_column(String(200))
+    strategy_name: Mapped[str] = mapped_column(String(100))
+    symbol: Mapped[str] = mapped_column(String(20))
+    start_date: Mapped[datetime]
+    end_date: Mapped[datetime]
+    initial_capital: Mapped[float]
+    final_capital: Mapped[float]
+    total_return_pct: Mapped[Optional[float]] = mapped_column(default=None)
+    sharpe_ratio: Mapped[Optional[float]] = mapped_column(default=None)
+    max_drawdown_pct: Mapped[Optional[float]] = mapped_column(default=None)
+    win_rate_pct: Mapped[Optional[float]] = mapped_column(default=None)
+    total_trades: Mapped[Optional[int]] = mapped_column(default=None)
+    config: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, default=None)
+    created_at: Mapped[Optional[datetime]] = mapped_column(insert_default=datetime.utcnow, init=False)
+    
+    trades: Mapped[List['Trade']] = relationship(
+        back_populates="backtest_run", cascade="all, delete-orphan", default_factory=list, repr=False)
+    metrics: Mapped[List['PerformanceMetric']] = relationship(
+        back_populates="backtest_run", cascade="all, delete-orphan", default_factory=list, repr=False)
+
+
+class Trade(Base, eq=False):
     """Model for storing individual trades."""
     __tablename__ = 'trades'
     
-    id = Column(Integer, primary_key=True)
-    backtest_run_id = Column(Integer, ForeignKey('backtest_runs.id'), nullable=False)
-    timestamp = Column(DateTime, nullable=False)
-    symbol = Column(String(20), nullable=False)
-    direction = Column(String(10), nullable=False)
-    quantity = Column(Integer, nullable=False)
-    price = Column(Float, nullable=False)
-    commission = Column(Float, default=0.0)
-    pnl = Column(Float)
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    backtest_run_id: Mapped[int] = mapped_column(ForeignKey('backtest_runs.id'), index=True)
+    timestamp: Mapped[datetime]
+    symbol: Mapped[str] = mapped_column(String(20))
+    direction: Mapped[str] = mapped_column(String(10))
+    quantity: Mapped[int]
+    price: Mapped[float]
+    commission: Mapped[Optional[float]] = mapped_column(default=0.0)
+    pnl: Mapped[Optional[float]] = mapped_column(default=None)
+    
+    backtest_run: Mapped[Optional[BacktestRun]] = relationship(
+        back_populates="trades", init=False, repr=False)
     
-    backtest_run = relationship("BacktestRun", back_populates="trades")
+    @staticmethod
+    def make_dict(backtest_run_id: int, timestamp: datetime, symbol: str, direction: str,
+                  quantity: int, price: float, commission: float = 0.0,
+                  pnl: Optional[float] = None) -> Dict[str, Any]:
+        """Build a trade row for BacktestRepository.save_trades without an ORM instance."""
+        return {
+            'backtest_run_id': backtest_run_id, 'timestamp': timestamp, 'symbol': symbol,
+            'direction': direction, 'quantity': quantity, 'price': price,
+            'commission': commission, 'pnl': pnl
+        }
 
 
-class PerformanceMetric(Base):
+class PerformanceMetric(Base, eq=False):
     """Model for storing daily performance metrics."""
     __tablename__ = 'performance_metrics'
     
-    id = Column(Integer, primary_key=True)
-    backtest_run_id = Column(Integer, ForeignKey('backtest_runs.id'), nullable=False)
-    date = Column(DateTime, nullable=False)
-    portfolio_value = Column(Float, nullable=False)
-    daily_return = Column(Float)
-    cumulative_return = Column(Float)
-    drawdown = Column(Float)
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    backtest_run_id: Mapped[int] = mapped_column(ForeignKey('backtest_runs.id'), index=True)
+    date: Mapped[datetime]
+    portfolio_value: Mapped[float]
+    daily_return: Mapped[Optional[float]] = mapped_column(default=None)
+    cumulative_return: Mapped[Optional[float]] = mapped_column(default=None)
+    drawdown: Mapped[Optional[float]] = mapped_column(default=None)
     
-    backtest_run = relationship("BacktestRun", back_populates="metrics")
+    backtest_run: Mapped[Optional[BacktestRun]] = relationship(
+        back_populates="metrics", init=False, repr=False)
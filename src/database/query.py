@@ -1,24 +1,83 @@
 """Query utilities for advanced database operations."""
-from typing import List, Optional, Dict, Any
+import pickle
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime
-from sqlalchemy import and_, or_, desc, asc
-from sqlalchemy.orm import Session
+import numpy as np
+from sqlalchemy import and_, or_, desc, asc, case, event, func, lambda_stmt, select
+from sqlalchemy.orm import Session, selectinload
+from .config import _schema_key
 from .models import BacktestRun, Trade, PerformanceMetric
 
 
+# Results of BacktestQueryBuilder queries keyed by the builder's inputs, as
+# (data version, result), least recently used first. Any ORM write bumps the
+# data version, so entries cached before it are never served again. The
+# cache is per process and only sees writes made through ORM sessions.
+RESULT_CACHE_SIZE = 256
+_result_cache: 'OrderedDict[Hashable, Tuple[int, Any]]' = OrderedDict()
+_data_version = 0
+
+
+def invalidate_query_cache() -> None:
+    """Invalidate all cached query results.
+    
+    ORM session flushes and DML executed through a session do this
+    automatically. Call it after writes the cache cannot see: Core or
+    ``text()`` statements on a connection (``engine.begin()``), raw DBAPI
+    writes, or writes from another process.
+    """
+    global _data_version
+    _data_version += 1
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_on_flush(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        invalidate_query_cache()
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _invalidate_on_dml(orm_execute_state):
+    if not orm_execute_state.is_select:
+        invalidate_query_cache()
+
+
 class BacktestQueryBuilder:
-    """Advanced query builder for backtest data."""
+    """Advanced query builder for backtest data.
     
-    def __init__(self, session: Session):
+    Statements are assembled from lambdas with lambda_stmt, so SQLAlchemy
+    builds and compiles each distinct filter combination once and only
+    extracts the bound values from the lambdas' closures on later calls.
+    
+    With ``use_cache`` the results of execute(), execute_with_count() and
+    count() are cached per process, keyed by the filters, ordering, limit
+    and eager loads recorded on the builder. Cached results are dropped on
+    every ORM write in this process; writes made any other way (Core or
+    ``text()`` on a connection, another process) are not seen until
+    invalidate_query_cache() is called. Pass ``use_cache=False`` when other
+    writers share the database.
+    """
+    
+    def __init__(self, session: Session, use_cache: bool = True):
         """Initialize query builder.
         
         Args:
             session: Database session
+            use_cache: Serve repeated execute()/count() calls from the
+                process-wide result cache until the next ORM write (see
+                invalidate_query_cache for writes it cannot see)
         """
         self.session = session
-        self._filters = []
-        self._order_by = None
-        self._limit = None
+        self.use_cache = use_cache
+        self._criteria: List[Callable] = []
+        self._order_by: Optional[Callable] = None
+        self._limit: Optional[Callable] = None
+        self._eager: List[str] = []
+        # Hashable record of the inputs above, for the result cache key
+        self._filter_key: List[Tuple] = []
+        self._order_key: Optional[Tuple] = None
+        self._limit_key: Optional[int] = None
     
     def filter_by_strategy(self, strategy_name: str) -> 'BacktestQueryBuilder':
         """Filter by strategy name.
@@ -29,7 +88,8 @@ class BacktestQueryBuilder:
         Returns:
             Self for chaining
         """
-        self._filters.append(BacktestRun.strategy_name == strategy_name)
+        self._criteria.append(lambda s: s.where(BacktestRun.strategy_name == strategy_name))
+        self._filter_key.append(('strategy', strategy_name))
         return self
     
     def filter_by_symbol(self, symbol: str) -> 'BacktestQueryBuilder':
@@ -41,7 +101,8 @@ class BacktestQueryBuilder:
         Returns:
             Self for chaining
         """
-        self._filters.append(BacktestRun.symbol == symbol)
+        self._criteria.append(lambda s: s.where(BacktestRun.symbol == symbol))
+        self._filter_key.append(('symbol', symbol))
         return self
     
     def filter_by_date_range(
@@ -59,9 +120,11 @@ class BacktestQueryBuilder:
             Self for chaining
         """
         if start_date:
-            self._filters.append(BacktestRun.start_date >= start_date)
+            self._criteria.append(lambda s: s.where(BacktestRun.start_date >= start_date))
+            self._filter_key.append(('start_date', start_date))
         if end_date:
-            self._filters.append(BacktestRun.end_date <= end_date)
+            self._criteria.append(lambda s: s.where(BacktestRun.end_date <= end_date))
+            self._filter_key.append(('end_date', end_date))
         return self
     
     def filter_by_sharpe_ratio(
@@ -79,9 +142,11 @@ class BacktestQueryBuilder:
             Self for chaining
         """
         if min_sharpe is not None:
-            self._filters.append(BacktestRun.sharpe_ratio >= min_sharpe)
+            self._criteria.append(lambda s: s.where(BacktestRun.sharpe_ratio >= min_sharpe))
+            self._filter_key.append(('min_sharpe', min_sharpe))
         if max_sharpe is not None:
-            self._filters.append(BacktestRun.sharpe_ratio <= max_sharpe)
+            self._criteria.append(lambda s: s.where(BacktestRun.sharpe_ratio <= max_sharpe))
+            self._filter_key.append(('max_sharpe', max_sharpe))
         return self
     
     def order_by_created(self, ascending: bool = False) -> 'BacktestQueryBuilder':
@@ -93,7 +158,11 @@ class BacktestQueryBuilder:
         Returns:
             Self for chaining
         """
-        self._order_by = asc(BacktestRun.created_at) if ascending else desc(BacktestRun.created_at)
+        if ascending:
+            self._order_by = lambda s: s.order_by(asc(BacktestRun.created_at))
+        else:
+            self._order_by = lambda s: s.order_by(desc(BacktestRun.created_at))
+        self._order_key = ('created', ascending)
         return self
     
     def order_by_return(self, ascending: bool = False) -> 'BacktestQueryBuilder':
@@ -105,7 +174,32 @@ class BacktestQueryBuilder:
         Returns:
             Self for chaining
         """
-        self._order_by = asc(BacktestRun.total_return) if ascending else desc(BacktestRun.total_return)
+        if ascending:
+            self._order_by = lambda s: s.order_by(asc(BacktestRun.total_return_pct))
+        else:
+            self._order_by = lambda s: s.order_by(desc(BacktestRun.total_return_pct))
+        self._order_key = ('return', ascending)
+        return self
+    
+    def with_trades(self) -> 'BacktestQueryBuilder':
+        """Eager-load each run's trades.
+        
+        Trades for all returned runs are fetched with one extra
+        ``WHERE backtest_run_id IN (...)`` query instead of one query per run.
+        
+        Returns:
+            Self for chaining
+        """
+        self._eager.append('trades')
+        return self
+    
+    def with_metrics(self) -> 'BacktestQueryBuilder':
+        """Eager-load each run's performance metrics (see with_trades).
+        
+        Returns:
+            Self for chaining
+        """
+        self._eager.append('metrics')
         return self
     
     def limit(self, count: int) -> 'BacktestQueryBuilder':
@@ -117,27 +211,125 @@ class BacktestQueryBuilder:
         Returns:
             Self for chaining
         """
-        self._limit = count
+        self._limit = (lambda s: s.limit(count)) if count else None
+        self._limit_key = count or None
         return self
     
+    def _statement(self, with_total: bool = False):
+        """Build the filtered, ordered and limited statement.
+        
+        Args:
+            with_total: Add a ``total`` column counting all matching rows
+                (window aggregate, computed before the limit)
+        """
+        if with_total:
+            stmt = lambda_stmt(lambda: select(BacktestRun, func.count().over().label('total')))
+        else:
+            stmt = lambda_stmt(lambda: select(BacktestRun))
+        for criterion in self._criteria:
+            stmt += criterion
+        
+        if 'trades' in self._eager:
+            stmt += lambda s: s.options(selectinload(BacktestRun.trades))
+        if 'metrics' in self._eager:
+            stmt += lambda s: s.options(selectinload(BacktestRun.metrics))
+        
+        if self._order_by is not None:
+            stmt += self._order_by
+        
+        if self._limit is not None:
+            stmt += self._limit
+        
+        return stmt
+    
+    def _cache_key(self, kind: str) -> Hashable:
+        """Key identifying a query's database and the builder inputs it depends on.
+        
+        Built from the values recorded by the filter methods, so a cache hit
+        never compiles the statement. count() ignores ordering, limit and
+        eager loads.
+        """
+        key = (kind, _schema_key(self.session.get_bind().engine), tuple(self._filter_key))
+        if kind == 'count':
+            return key
+        return key + (self._order_key, self._limit_key, frozenset(self._eager))
+    
+    def _cached(self, key: Hashable) -> Any:
+        """Return the cached result for a key, or None if absent or stale."""
+        entry = _result_cache.get(key)
+        if entry is None or entry[0] != _data_version:
+            return None
+        _result_cache.move_to_end(key)
+        return entry[1]
+    
+    @staticmethod
+    def _store(key: Hashable, version: int, result: Any) -> None:
+        _result_cache[key] = (version, result)
+        _result_cache.move_to_end(key)
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    
     def execute(self) -> List[BacktestRun]:
         """Execute the query and return results.
         
+        Cached results are stored pickled and merged into this session
+        without loading, so callers never share instances.
+        
         Returns:
             List of matching backtest runs
         """
-        query = self.session.query(BacktestRun)
+        if not self.use_cache:
+            return self.session.scalars(self._statement()).all()
         
-        if self._filters:
-            query = query.filter(and_(*self._filters))
+        key = self._cache_key('execute')
+        cached = self._cached(key)
+        if cached is not None:
+            return [self.session.merge(run, load=False) for run in pickle.loads(cached)]
         
-        if self._order_by is not None:
-            query = query.order_by(self._order_by)
+        version = _data_version
+        runs = self.session.scalars(self._statement()).all()
+        self._store(key, version, pickle.dumps(runs))
+        return runs
+    
+    def execute_with_count(self) -> Tuple[List[BacktestRun], int]:
+        """Execute the query and count all matches in the same round trip.
         
-        if self._limit:
-            query = query.limit(self._limit)
+        The total ignores the limit, as needed for pagination. It comes
+        from a ``COUNT(*) OVER ()`` column on the result query; SQLite
+        older than 3.25 lacks window functions and gets a second query.
         
-        return query.all()
+        Returns:
+            (matching backtest runs, total number of matches)
+        """
+        dialect = self.session.get_bind().dialect
+        if dialect.name == 'sqlite' and dialect.dbapi.sqlite_version_info < (3, 25):
+            return self.execute(), self.count()
+        
+        key = self._cache_key('execute_with_count') if self.use_cache else None
+        cached = self._cached(key) if key else None
+        if cached is not None:
+            runs, total = pickle.loads(cached)
+            return [self.session.merge(run, load=False) for run in runs], total
+        
+        version = _data_version
+        rows = self.session.execute(self._statement(with_total=True)).all()
+        runs = [row[0] for row in rows]
+        total = rows[0].total if rows else 0
+        if key:
+            self._store(key, version, pickle.dumps((runs, total)))
+        return runs, total
+    
+    def iter_execute(self, batch_size: int = 500) -> Iterator[BacktestRun]:
+        """Stream matching runs, fetching ``batch_size`` rows at a time.
+        
+        Args:
+            batch_size: Rows fetched from the cursor per batch
+            
+        Returns:
+            Iterator over matching backtest runs
+        """
+        return iter(self.session.scalars(self._statement(),
+                                         execution_options={'yield_per': batch_size}))
     
     def count(self) -> int:
         """Count matching results without fetching them.
@@ -145,10 +337,21 @@ class BacktestQueryBuilder:
         Returns:
             Number of matching records
         """
-        query = self.session.query(BacktestRun)
-        if self._filters:
-            query = query.filter(and_(*self._filters))
-        return query.count()
+        key = self._cache_key('count') if self.use_cache else None
+        cached = self._cached(key) if key else None
+        if cached is not None:
+            return cached
+        
+        stmt = lambda_stmt(lambda: select(func.count()).select_from(BacktestRun))
+        for criterion in self._criteria:
+            stmt += criterion
+        if not key:
+            return self.session.scalar(stmt)
+        
+        version = _data_version
+        count = self.session.scalar(stmt)
+        self._store(key, version, count)
+        return count
 
 
 class TradeQueryBuilder:
@@ -196,7 +399,7 @@ class TradeQueryBuilder:
         Returns:
             Self for chaining
         """
-        self._filters.append(Trade.side == side)
+        self._filters.append(Trade.direction == side)
         return self
     
     def filter_profitable(self, profitable: bool = True) -> 'TradeQueryBuilder':
@@ -214,37 +417,80 @@ class TradeQueryBuilder:
             self._filters.append(Trade.pnl < 0)
         return self
     
+    def _query(self):
+        """Build the filtered query."""
+        query = self.session.query(Trade)
+        if self._filters:
+            query = query.filter(and_(*self._filters))
+        return query
+    
     def execute(self) -> List[Trade]:
         """Execute the query and return results.
         
         Returns:
             List of matching trades
         """
-        query = self.session.query(Trade)
+        return self._query().all()
+    
+    def iter_execute(self, batch_size: int = 500) -> Iterator[Trade]:
+        """Stream matching trades, fetching ``batch_size`` rows at a time.
+        
+        Args:
+            batch_size: Rows fetched from the cursor per batch
+            
+        Returns:
+            Iterator over matching trades
+        """
+        return self._query().yield_per(batch_size)
+    
+    def pnl_array(self) -> np.ndarray:
+        """Fetch only the pnl column of the filtered trades as a float64 array.
+        
+        Loads no Trade objects, for callers that need per-trade pnl detail
+        (distributions, percentiles) and can work on it with NumPy. Trades
+        without pnl are NaN.
+        
+        Returns:
+            Array of pnl values in trade id order
+        """
+        stmt = select(Trade.pnl).order_by(Trade.id)
         if self._filters:
-            query = query.filter(and_(*self._filters))
-        return query.all()
+            stmt = stmt.where(and_(*self._filters))
+        return np.array(self.session.scalars(stmt).all(), dtype=np.float64)
     
     def aggregate_stats(self) -> Dict[str, Any]:
         """Calculate aggregate statistics for filtered trades.
         
+        Computed by the database in a single aggregate query, so only one
+        row comes back regardless of the number of trades.
+        
         Returns:
             Dictionary with trade statistics
         """
-        trades = self.execute()
-        if not trades:
-            return {}
+        won = Trade.pnl > 0
+        lost = Trade.pnl < 0
+        stmt = select(
+            func.count(Trade.id),
+            func.coalesce(func.sum(Trade.pnl), 0.0),
+            func.coalesce(func.sum(case((won, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((won, Trade.pnl), else_=0.0)), 0.0),
+            func.coalesce(func.sum(case((lost, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((lost, Trade.pnl), else_=0.0)), 0.0),
+        )
+        if self._filters:
+            stmt = stmt.where(and_(*self._filters))
         
-        total_trades = len(trades)
-        winning_trades = [t for t in trades if t.pnl > 0]
-        losing_trades = [t for t in trades if t.pnl < 0]
+        (total_trades, total_pnl, winning_trades, win_pnl,
+         losing_trades, loss_pnl) = self.session.execute(stmt).one()
+        if not total_trades:
+            return {}
         
         return {
             'total_trades': total_trades,
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': len(winning_trades) / total_trades if total_trades > 0 else 0,
-            'total_pnl': sum(t.pnl for t in trades if t.pnl),
-            'avg_win': sum(t.pnl for t in winning_trades) / len(winning_trades) if winning_trades else 0,
-            'avg_loss': sum(t.pnl for t in losing_trades) / len(losing_trades) if losing_trades else 0,
+            'winning_trades': winning_trades,
+            'losing_trades': losing_trades,
+            'win_rate': winning_trades / total_trades,
+            'total_pnl': total_pnl,
+            'avg_win': win_pnl / winning_trades if winning_trades else 0,
+            'avg_loss': loss_pnl / losing_trades if losing_trades else 0,
         }
@@ -1,28 +1,81 @@
 """Database repository for managing backtest results."""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from typing import List, Optional
+import weakref
+from contextlib import contextmanager
+from sqlalchemy import insert, make_url
+from sqlalchemy.orm import Session
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Union
+from .config import DatabaseConfig, cached_table_names, invalidate_schema_cache
 from .models import Base, BacktestRun, Trade, PerformanceMetric
+from .query import invalidate_query_cache
+
+
+def _row_dicts(model, rows: List[Union[Dict[str, Any], Base]]) -> List[Dict[str, Any]]:
+    """Convert ORM instances to column dicts for bulk insert; dicts pass through.
+    
+    Unset (None) attributes are left out so column defaults still apply.
+    """
+    columns = [c.key for c in model.__table__.columns if not c.primary_key]
+    return [row if isinstance(row, dict) else
+            {key: value for key in columns if (value := getattr(row, key)) is not None}
+            for row in rows]
 
 
 class BacktestRepository:
     """Repository pattern for database operations."""
     
-    def __init__(self, database_url: str = 'sqlite:///backtests.db'):
+    # Rows per bulk INSERT statement
+    INSERT_CHUNK_SIZE = 1000
+    RAW_INSERT_CHUNK_SIZE = 5000
+    
+    # Configurations (engine, pool, session factory) shared per database URL
+    _shared_configs: ClassVar[Dict[str, DatabaseConfig]] = {}
+    # Engines whose tables are known to exist
+    _initialized_engines: ClassVar['weakref.WeakSet'] = weakref.WeakSet()
+    
+    def __init__(self, database_url: str = 'sqlite:///backtests.db',
+                 config: Optional[DatabaseConfig] = None):
         """
         Initialize repository with database connection.
         
+        The engine, connection pool and session factory are created once
+        per database URL and shared by every repository and operation on
+        it (in-memory databases get their own), and tables are only
+        checked for on the first repository per engine.
+        
         Args:
             database_url: SQLAlchemy database URL
+            config: Database configuration (overrides database_url)
         """
-        self.engine = create_engine(database_url)
-        Base.metadata.create_all(self.engine)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.config = config or self._shared_config(database_url)
+        self.engine = self.config.create_engine()
+        if self.engine not in BacktestRepository._initialized_engines:
+            if not Base.metadata.tables.keys() <= cached_table_names(self.engine):
+                Base.metadata.create_all(self.engine)
+                invalidate_schema_cache(self.engine)
+            BacktestRepository._initialized_engines.add(self.engine)
+        self.SessionLocal = self.config.get_session_factory()
+    
+    @classmethod
+    def _shared_config(cls, database_url: str) -> DatabaseConfig:
+        """Return the configuration shared by repositories on a database URL."""
+        if make_url(database_url).database in (None, '', ':memory:'):
+            return DatabaseConfig(database_url, pool_size=8, max_overflow=16)
+        config = cls._shared_configs.get(database_url)
+        if config is None:
+            config = cls._shared_configs[database_url] = DatabaseConfig(
+                database_url, pool_size=8, max_overflow=16)
+        return config
     
     def get_session(self) -> Session:
         """Get a new database session."""
         return self.SessionLocal()
     
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a session that commits on success and rolls back on error."""
+        with self.config.session_scope() as session:
+            yield session
+    
     def save_backtest_run(self, backtest_run: BacktestRun) -> BacktestRun:
         """
         Save a backtest run to database.
@@ -33,14 +86,9 @@ class BacktestRepository:
         Returns:
             Saved BacktestRun with ID
         """
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             session.add(backtest_run)
-            session.commit()
-            session.refresh(backtest_run)
-            return backtest_run
-        finally:
-            session.close()
+        return backtest_run
     
     def get_backtest_run(self, run_id: int) -> Optional[BacktestRun]:
         """
@@ -52,11 +100,8 @@ class BacktestRepository:
         Returns:
             BacktestRun or None
         """
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(BacktestRun).filter(BacktestRun.id == run_id).first()
-        finally:
-            session.close()
     
     def list_backtest_runs(self, limit: int = 100) -> List[BacktestRun]:
         """
@@ -68,41 +113,76 @@ class BacktestRepository:
         Returns:
             List of BacktestRun objects
         """
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(BacktestRun).order_by(
                 BacktestRun.created_at.desc()
             ).limit(limit).all()
-        finally:
-            session.close()
     
-    def save_trades(self, trades: List[Trade]):
+    def iter_backtest_runs(self, batch_size: int = 500) -> Iterator[BacktestRun]:
+        """
+        Stream all backtest runs, newest first, without loading them at once.
+        
+        The session stays open until the iterator is exhausted or closed.
+        
+        Args:
+            batch_size: Rows fetched from the cursor per batch
+            
+        Yields:
+            BacktestRun objects
+        """
+        with self.session_scope() as session:
+            yield from session.query(BacktestRun).order_by(
+                BacktestRun.created_at.desc()
+            ).yield_per(batch_size)
+    
+    def _bulk_insert(self, model, rows: List[Union[Dict[str, Any], Base]]):
+        """Insert rows as multi-row INSERTs in one transaction."""
+        rows = _row_dicts(model, rows)
+        if not rows:
+            return
+        with self.session_scope() as session:
+            for start in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+                session.execute(insert(model), rows[start:start + self.INSERT_CHUNK_SIZE])
+    
+    def save_trades(self, trades: List[Union[Dict[str, Any], Trade]]):
+        """
+        Save multiple trades with bulk INSERTs.
+        
+        Trade instances are read but not attached to a session, so their
+        ids are not populated.
+        
+        Args:
+            trades: Trade instances or dicts of Trade column values
+        """
+        self._bulk_insert(Trade, trades)
+    
+    def save_trades_raw(self, rows: List[Dict[str, Any]]):
         """
-        Save multiple trades.
+        Save trade rows with Core INSERTs, bypassing the ORM entirely.
+        
+        For the hot end-of-backtest write: no Trade objects, sessions or
+        identity map are involved. Build rows with Trade.make_dict(); all
+        rows must have the same keys.
         
         Args:
-            trades: List of Trade instances
+            rows: Dicts of Trade column values
         """
-        session = self.get_session()
-        try:
-            session.add_all(trades)
-            session.commit()
-        finally:
-            session.close()
+        if not rows:
+            return
+        table = Trade.__table__
+        with self.engine.begin() as conn:
+            for start in range(0, len(rows), self.RAW_INSERT_CHUNK_SIZE):
+                conn.execute(table.insert(), rows[start:start + self.RAW_INSERT_CHUNK_SIZE])
+        invalidate_query_cache()
     
-    def save_metrics(self, metrics: List[PerformanceMetric]):
+    def save_metrics(self, metrics: List[Union[Dict[str, Any], PerformanceMetric]]):
         """
-        Save performance metrics.
+        Save performance metrics with bulk INSERTs.
         
         Args:
-            metrics: List of PerformanceMetric instances
+            metrics: PerformanceMetric instances or dicts of column values
         """
-        session = self.get_session()
-        try:
-            session.add_all(metrics)
-            session.commit()
-        finally:
-            session.close()
+        self._bulk_insert(PerformanceMetric, metrics)
     
     def delete_backtest_run(self, run_id: int):
         """
@@ -111,11 +191,7 @@ class BacktestRepository:
         Args:
             run_id: Backtest run ID
         """
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             run = session.query(BacktestRun).filter(BacktestRun.id == run_id).first()
             if run:
                 session.delete(run)
-                session.commit()
-        finally:
-            session.close()
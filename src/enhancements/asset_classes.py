@@ -1,8 +1,15 @@
 """Support for multiple asset classes in backtesting."""
+import logging
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+import numpy as np
 import pandas as pd
+from src.utils.jit import njit
+from src.utils.timestamps import to_ns
+
+logger = logging.getLogger(__name__)
 
 
 class AssetClass(Enum):
@@ -36,6 +43,28 @@ class AssetSpecification:
     margin_requirement: float = 1.0
 
 
+# Asset classes in a fixed order; positions store their index into this tuple
+_ASSET_CLASSES = tuple(AssetClass)
+_ASSET_CLASS_IDS = {asset_class: i for i, asset_class in enumerate(_ASSET_CLASSES)}
+
+# Trade log timestamp of trades executed without one
+_NAT = np.iinfo(np.int64).min
+
+
+# Reassociation lets LLVM vectorize the sum; no-NaN assumptions stay off so
+# the unpriced check survives.
+@njit('float64(int64[::1], float64[::1], float64[::1], float64)',
+      cache=True, fastmath={'reassoc', 'contract', 'nsz', 'arcp'})
+def _portfolio_value(qty, prices, unit, capital):
+    """Capital plus the base-currency value of all priced positions."""
+    total = 0.0
+    for i in range(qty.shape[0]):
+        price = prices[i]
+        if price == price:  # NaN: unpriced
+            total += qty[i] * price * unit[i]
+    return capital + total
+
+
 class MultiAssetPortfolio:
     """
     Portfolio manager supporting multiple asset classes.
@@ -43,8 +72,17 @@ class MultiAssetPortfolio:
     This class extends the basic portfolio to handle different asset types
     with varying characteristics like contract multipliers, margin requirements,
     and currency conversions.
+    
+    Per-symbol state is stored as parallel NumPy arrays indexed by the order
+    in which assets were registered, so portfolio-wide valuations are single
+    vectorized expressions instead of per-symbol dict traversals. Valuations
+    only visit the rows of open positions, so symbols registered but not
+    held cost nothing.
     """
     
+    INITIAL_CAPACITY = 64
+    INITIAL_LOG_CAPACITY = 1024
+    
     def __init__(self, initial_capital: float = 100000.0, base_currency: str = "USD"):
         """
         Initialize multi-asset portfolio.
@@ -57,17 +95,108 @@ class MultiAssetPortfolio:
         self.base_currency = base_currency
         self.current_capital = initial_capital
         
-        # Track assets by symbol
+        # Registered assets; row i of each array belongs to _symbols[i]
         self.asset_specs: Dict[str, AssetSpecification] = {}
-        self.positions: Dict[str, int] = {}  # symbol -> quantity
-        self.entry_prices: Dict[str, float] = {}  # symbol -> avg entry price
+        self._symbols: List[str] = []
+        self._sym_idx: Dict[str, int] = {}
+        self._n = 0
+        
+        capacity = self.INITIAL_CAPACITY
+        self._qty = np.zeros(capacity, dtype=np.int64)
+        self._entry = np.zeros(capacity)
+        self._mult = np.ones(capacity)
+        self._margin = np.ones(capacity)
+        self._currency_id = np.zeros(capacity, dtype=np.int32)
+        self._class_id = np.zeros(capacity, dtype=np.int8)
+        self._fx = np.ones(capacity)
+        # Base-currency value of one unit of price per contract: _mult * _fx,
+        # kept up to date by register_asset and update_fx_rate so valuations
+        # read one array instead of two
+        self._unit = np.ones(capacity)
+        # Rows with an open position, rebuilt after a position opens or closes
+        self._held_rows: Optional[np.ndarray] = None
+        
+        # Distinct asset currencies, indexed by _currency_id
+        self._currencies: List[str] = []
+        self._currency_idx: Dict[str, int] = {}
         
         # Track performance
         self.equity_curve = [initial_capital]
-        self.trade_log = []
+        
+        # Trade log columns; row i is the i-th executed trade
+        log_capacity = self.INITIAL_LOG_CAPACITY
+        self._log_ts = np.empty(log_capacity, dtype=np.int64)  # ns since epoch
+        self._log_sym_id = np.empty(log_capacity, dtype=np.int32)
+        self._log_qty = np.empty(log_capacity, dtype=np.int64)
+        self._log_price = np.empty(log_capacity)
+        self._log_comm = np.empty(log_capacity)
+        self._log_pos = np.empty(log_capacity, dtype=np.int64)
+        self._log_n = 0
         
         # FX rates for currency conversion (symbol pair -> rate)
-        self.fx_rates: Dict[str, float] = {}
+        self._fx_rates: Dict[str, float] = {}
+        # Resolved rate from each known currency to the base currency
+        self._to_base: Dict[str, float] = {base_currency: 1.0}
+    
+    @property
+    def positions(self) -> Mapping[str, int]:
+        """Read-only snapshot of the quantity per registered symbol.
+        
+        Positions change only through execute_trade.
+        """
+        return MappingProxyType(dict(zip(self._symbols, self._qty[:self._n].tolist())))
+    
+    @property
+    def entry_prices(self) -> Mapping[str, float]:
+        """Read-only snapshot of the average entry price per open position."""
+        held = self._held().tolist()
+        return MappingProxyType(dict(zip([self._symbols[i] for i in held],
+                                         self._entry[held].tolist())))
+    
+    @property
+    def fx_rates(self) -> Mapping[str, float]:
+        """Read-only view of the quoted FX rates; set them with update_fx_rate."""
+        return MappingProxyType(self._fx_rates)
+    
+    @property
+    def trade_log(self) -> List[Dict[str, Any]]:
+        """Executed trades as one dict per trade, built on access.
+        
+        Timestamps are pandas Timestamps, or None where the trade had none.
+        Use trade_log_df() for analysis.
+        """
+        records = self.trade_log_df().to_dict('records')
+        for record in records:
+            if record['timestamp'] is pd.NaT:
+                record['timestamp'] = None
+        return records
+    
+    def trade_log_df(self) -> pd.DataFrame:
+        """
+        Executed trades as a DataFrame built from the trade log columns.
+        
+        Returns:
+            DataFrame with timestamp, symbol, quantity, price, commission
+            and resulting position columns, one row per trade
+        """
+        n = self._log_n
+        return pd.DataFrame({
+            'timestamp': self._log_ts[:n].view('datetime64[ns]'),
+            'symbol': pd.Categorical.from_codes(self._log_sym_id[:n], categories=self._symbols),
+            'quantity': self._log_qty[:n],
+            'price': self._log_price[:n],
+            'commission': self._log_comm[:n],
+            'position': self._log_pos[:n],
+        })
+    
+    def _grow(self, names=('_qty', '_entry', '_mult', '_margin', '_currency_id',
+                           '_class_id', '_fx', '_unit')):
+        """Double the capacity of the per-symbol arrays (or the named ones)."""
+        for name in names:
+            old = getattr(self, name)
+            new = np.zeros(2 * len(old), dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
     
     def register_asset(self, asset_spec: AssetSpecification):
         """
@@ -76,9 +205,76 @@ class MultiAssetPortfolio:
         Args:
             asset_spec: Asset specification
         """
-        self.asset_specs[asset_spec.symbol] = asset_spec
-        if asset_spec.symbol not in self.positions:
-            self.positions[asset_spec.symbol] = 0
+        symbol = asset_spec.symbol
+        self.asset_specs[symbol] = asset_spec
+        
+        idx = self._sym_idx.get(symbol)
+        if idx is None:
+            if self._n == len(self._qty):
+                self._grow()
+            idx = self._n
+            self._sym_idx[symbol] = idx
+            self._symbols.append(symbol)
+            self._n += 1
+        
+        currency_id = self._currency_idx.get(asset_spec.currency)
+        if currency_id is None:
+            currency_id = len(self._currencies)
+            self._currency_idx[asset_spec.currency] = currency_id
+            self._currencies.append(asset_spec.currency)
+        
+        self._mult[idx] = asset_spec.multiplier
+        self._margin[idx] = asset_spec.margin_requirement
+        self._currency_id[idx] = currency_id
+        self._class_id[idx] = _ASSET_CLASS_IDS[asset_spec.asset_class]
+        self._fx[idx] = self._to_base.get(asset_spec.currency, 1.0)
+        self._unit[idx] = self._mult[idx] * self._fx[idx]
+    
+    def _index(self, symbol: str) -> int:
+        """Array row of a registered symbol."""
+        idx = self._sym_idx.get(symbol)
+        if idx is None:
+            raise ValueError(f"Asset {symbol} not registered")
+        return idx
+    
+    def _fx_vector(self) -> np.ndarray:
+        """Rate to base currency for each registered symbol."""
+        for currency in self._currencies:
+            if currency not in self._to_base:
+                self.convert_to_base_currency(1.0, currency)  # Warns, sets 1:1
+        return self._fx[:self._n]
+    
+    def _unit_vector(self) -> np.ndarray:
+        """Base-currency value per unit of price for each registered symbol."""
+        self._fx_vector()  # Warns about currencies without a rate
+        return self._unit[:self._n]
+    
+    def _held(self) -> np.ndarray:
+        """Rows of the symbols with an open position, in registration order."""
+        rows = self._held_rows
+        if rows is None:
+            rows = self._held_rows = np.flatnonzero(self._qty[:self._n])
+        return rows
+    
+    def _price_vector(self, current_prices, rows: np.ndarray) -> np.ndarray:
+        """
+        Look up current prices for some symbol rows.
+        
+        Args:
+            current_prices: Dictionary of symbol -> price, or an array
+                already ordered like the registered symbols
+            rows: Symbol rows to price
+            
+        Returns:
+            Price per row, NaN where no price is given
+        """
+        if isinstance(current_prices, np.ndarray):
+            if current_prices.shape != (self._n,):
+                raise ValueError(f"Expected {self._n} prices, got shape {current_prices.shape}")
+            return current_prices[rows].astype(np.float64, copy=False)
+        symbols = self._symbols
+        return np.fromiter((current_prices.get(symbols[i], np.nan) for i in rows.tolist()),
+                           dtype=np.float64, count=len(rows))
     
     def update_fx_rate(self, currency_pair: str, rate: float):
         """
@@ -88,7 +284,28 @@ class MultiAssetPortfolio:
             currency_pair: Currency pair (e.g., 'EUR/USD')
             rate: Exchange rate
         """
-        self.fx_rates[currency_pair] = rate
+        self._fx_rates[currency_pair] = rate
+        
+        base, _, quote = currency_pair.partition('/')
+        if quote == self.base_currency:
+            currency = base
+        elif base == self.base_currency:
+            currency = quote
+        else:
+            return  # Cross rates are not resolved
+        if currency == self.base_currency:
+            return
+        
+        # A direct quote takes precedence over an inverse one
+        direct = self._fx_rates.get(f"{currency}/{self.base_currency}")
+        self._to_base[currency] = direct if direct is not None else 1.0 / rate
+        
+        currency_id = self._currency_idx.get(currency)
+        if currency_id is not None:
+            n = self._n
+            rows = self._currency_id[:n] == currency_id
+            self._fx[:n][rows] = self._to_base[currency]
+            self._unit[:n][rows] = self._mult[:n][rows] * self._to_base[currency]
     
     def convert_to_base_currency(self, amount: float, currency: str) -> float:
         """
@@ -101,20 +318,14 @@ class MultiAssetPortfolio:
         Returns:
             Amount in base currency
         """
-        if currency == self.base_currency:
-            return amount
-        
-        pair = f"{currency}/{self.base_currency}"
-        if pair in self.fx_rates:
-            return amount * self.fx_rates[pair]
-        
-        # If direct pair not available, try inverse
-        inverse_pair = f"{self.base_currency}/{currency}"
-        if inverse_pair in self.fx_rates:
-            return amount / self.fx_rates[inverse_pair]
-        
-        # Default to 1:1 if no rate available (with warning)
-        print(f"Warning: No FX rate for {pair}, assuming 1:1")
+        rate = self._to_base.get(currency)
+        if rate is not None:
+            return amount * rate
+        
+        # Default to 1:1 if no rate available, warning once per currency; a
+        # later update_fx_rate replaces the placeholder
+        logger.warning("No FX rate for %s/%s, assuming 1:1", currency, self.base_currency)
+        self._to_base[currency] = 1.0
         return amount
     
     def calculate_position_value(self, symbol: str, current_price: float) -> float:
@@ -128,14 +339,11 @@ class MultiAssetPortfolio:
         Returns:
             Position value in base currency
         """
-        if symbol not in self.asset_specs:
-            raise ValueError(f"Asset {symbol} not registered")
-        
+        idx = self._index(symbol)
         spec = self.asset_specs[symbol]
-        quantity = self.positions.get(symbol, 0)
         
         # Calculate value considering multiplier
-        value = quantity * current_price * spec.multiplier
+        value = int(self._qty[idx]) * current_price * spec.multiplier
         
         # Convert to base currency
         return self.convert_to_base_currency(value, spec.currency)
@@ -152,9 +360,7 @@ class MultiAssetPortfolio:
         Returns:
             Required margin in base currency
         """
-        if symbol not in self.asset_specs:
-            raise ValueError(f"Asset {symbol} not registered")
-        
+        self._index(symbol)
         spec = self.asset_specs[symbol]
         position_value = abs(quantity) * price * spec.multiplier
         margin = position_value * spec.margin_requirement
@@ -173,113 +379,103 @@ class MultiAssetPortfolio:
             commission: Commission cost
             timestamp: Trade timestamp
         """
-        if symbol not in self.asset_specs:
-            raise ValueError(f"Asset {symbol} not registered")
-        
+        idx = self._index(symbol)
         spec = self.asset_specs[symbol]
+        multiplier = spec.multiplier
+        fx = self._to_base.get(spec.currency)
+        if fx is None:
+            fx = self.convert_to_base_currency(1.0, spec.currency)  # Warns, sets 1:1
         
         # Calculate trade value
-        trade_value = quantity * price * spec.multiplier
-        trade_value_base = self.convert_to_base_currency(trade_value, spec.currency)
-        commission_base = self.convert_to_base_currency(commission, spec.currency)
+        trade_value_base = quantity * price * multiplier * fx
+        commission_base = commission * fx
         
-        # Check margin requirements
-        required_margin = self.calculate_required_margin(symbol, quantity, price)
+        # Check margin requirements (as calculate_required_margin)
+        required_margin = abs(quantity) * price * multiplier * spec.margin_requirement * fx
         if required_margin > self.current_capital:
             raise ValueError(f"Insufficient margin: need {required_margin}, have {self.current_capital}")
         
         # Update position
-        old_position = self.positions.get(symbol, 0)
+        old_position = int(self._qty[idx])
         new_position = old_position + quantity
-        self.positions[symbol] = new_position
+        self._qty[idx] = new_position
+        if (old_position == 0) != (new_position == 0):
+            self._held_rows = None
         
         # Update entry price (weighted average for additions)
         if new_position != 0:
             if old_position == 0:
-                self.entry_prices[symbol] = price
+                self._entry[idx] = price
             elif (old_position > 0 and quantity > 0) or (old_position < 0 and quantity < 0):
                 # Adding to position
-                total_cost = (old_position * self.entry_prices[symbol] + quantity * price)
-                self.entry_prices[symbol] = total_cost / new_position
+                total_cost = (old_position * self._entry[idx] + quantity * price)
+                self._entry[idx] = total_cost / new_position
         
         # Update capital (subtract cost and commission)
         self.current_capital -= (trade_value_base + commission_base)
         
         # Log trade
-        self.trade_log.append({
-            'timestamp': timestamp,
-            'symbol': symbol,
-            'quantity': quantity,
-            'price': price,
-            'commission': commission,
-            'position': new_position
-        })
+        row = self._log_n
+        if row == len(self._log_qty):
+            self._grow(('_log_ts', '_log_sym_id', '_log_qty', '_log_price', '_log_comm',
+                        '_log_pos'))
+        self._log_ts[row] = _NAT if timestamp is None else to_ns(timestamp)
+        self._log_sym_id[row] = idx
+        self._log_qty[row] = quantity
+        self._log_price[row] = price
+        self._log_comm[row] = commission
+        self._log_pos[row] = new_position
+        self._log_n = row + 1
     
-    def get_portfolio_value(self, current_prices: Dict[str, float]) -> float:
+    def get_portfolio_value(self, current_prices) -> float:
         """
         Calculate total portfolio value.
         
         Args:
-            current_prices: Dictionary of symbol -> current price
+            current_prices: Dictionary of symbol -> current price, or an array
+                ordered like the registered symbols
             
         Returns:
             Total portfolio value in base currency
         """
-        total_value = self.current_capital
-        
-        for symbol, quantity in self.positions.items():
-            if quantity != 0 and symbol in current_prices:
-                position_value = self.calculate_position_value(symbol, current_prices[symbol])
-                total_value += position_value
-        
-        return total_value
+        rows = self._held()
+        return _portfolio_value(self._qty[rows], self._price_vector(current_prices, rows),
+                                self._unit_vector()[rows], float(self.current_capital))
     
-    def get_pnl_by_asset(self, current_prices: Dict[str, float]) -> Dict[str, float]:
+    def get_pnl_by_asset(self, current_prices) -> Dict[str, float]:
         """
         Calculate profit/loss for each asset.
         
         Args:
-            current_prices: Dictionary of symbol -> current price
+            current_prices: Dictionary of symbol -> current price, or an array
+                ordered like the registered symbols
             
         Returns:
             Dictionary of symbol -> PnL in base currency
         """
-        pnl_by_asset = {}
-        
-        for symbol, quantity in self.positions.items():
-            if quantity == 0:
-                continue
-            
-            if symbol not in current_prices or symbol not in self.entry_prices:
-                continue
-            
-            spec = self.asset_specs[symbol]
-            entry_price = self.entry_prices[symbol]
-            current_price = current_prices[symbol]
-            
-            # Calculate P&L
-            pnl = quantity * (current_price - entry_price) * spec.multiplier
-            pnl_base = self.convert_to_base_currency(pnl, spec.currency)
-            pnl_by_asset[symbol] = pnl_base
-        
-        return pnl_by_asset
+        rows = self._held()
+        prices = self._price_vector(current_prices, rows)
+        pnl = self._qty[rows] * (prices - self._entry[rows]) * self._unit_vector()[rows]
+        
+        # Skip positions without a price
+        priced = ~np.isnan(prices)
+        symbols = self._symbols
+        return {symbols[i]: value
+                for i, value in zip(rows[priced].tolist(), pnl[priced].tolist())}
     
-    def get_exposure_by_asset_class(self, current_prices: Dict[str, float]) -> Dict[AssetClass, float]:
+    def get_exposure_by_asset_class(self, current_prices) -> Dict[AssetClass, float]:
         """
         Calculate exposure by asset class.
         
         Args:
-            current_prices: Dictionary of symbol -> current price
+            current_prices: Dictionary of symbol -> current price, or an array
+                ordered like the registered symbols
             
         Returns:
             Dictionary of asset_class -> total exposure
         """
-        exposure = {ac: 0.0 for ac in AssetClass}
-        
-        for symbol, quantity in self.positions.items():
-            if quantity != 0 and symbol in current_prices:
-                spec = self.asset_specs[symbol]
-                position_value = abs(self.calculate_position_value(symbol, current_prices[symbol]))
-                exposure[spec.asset_class] += position_value
-        
-        return exposure
+        rows = self._held()
+        values = self._qty[rows] * self._price_vector(current_prices, rows) * self._unit_vector()[rows]
+        totals = np.bincount(self._class_id[rows], weights=np.abs(np.nan_to_num(values, nan=0.0)),
+                             minlength=len(_ASSET_CLASSES))
+        return dict(zip(_ASSET_CLASSES, totals.tolist()))
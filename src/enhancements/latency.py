@@ -3,7 +3,9 @@ from abc import ABC, abstractmethod
 import random
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
+
+from src.utils.params import param_property
 
 
 class LatencyModel(ABC):
@@ -22,6 +24,21 @@ class LatencyModel(ABC):
             Latency in seconds
         """
         pass
+    
+    def get_latency_batch(self, n: int) -> np.ndarray:
+        """
+        Get ``n`` latencies at once, e.g. to pre-resolve a batch of orders.
+        
+        Subclasses override this with a vectorized draw; the default simply
+        calls ``get_latency`` ``n`` times.
+        
+        Args:
+            n: Number of latencies
+            
+        Returns:
+            Array of latencies in seconds
+        """
+        return np.fromiter((self.get_latency() for _ in range(n)), dtype=np.float64, count=n)
 
 
 class FixedLatency(LatencyModel):
@@ -44,6 +61,10 @@ class FixedLatency(LatencyModel):
     def get_latency(self) -> float:
         """Return fixed latency."""
         return self.latency_seconds
+    
+    def get_latency_batch(self, n: int) -> np.ndarray:
+        """Return ``n`` copies of the fixed latency."""
+        return np.full(n, self.latency_seconds, dtype=np.float64)
 
 
 class VariableLatency(LatencyModel):
@@ -51,15 +72,27 @@ class VariableLatency(LatencyModel):
     Variable latency model with random delays.
     
     Models realistic network and system latencies with statistical
-    distribution (normal, exponential, or uniform).
+    distribution (normal, exponential, or uniform). Samples are drawn
+    ``BUFFER_SIZE`` at a time in one vectorized call from the model's own
+    generator and handed out one by one, so a single draw costs a list
+    read rather than a NumPy call. Changing a distribution parameter
+    discards the samples drawn with the old one.
     """
     
+    BUFFER_SIZE = 1024
+    mean_latency = param_property('mean_latency', '_discard_buffer')
+    std_dev = param_property('std_dev', '_discard_buffer')
+    distribution = param_property('distribution', '_discard_buffer')
+    min_latency = param_property('min_latency', '_discard_buffer')
+    max_latency = param_property('max_latency', '_discard_buffer')
+    
     def __init__(self, 
                  mean_latency: float = 0.005,
                  std_dev: float = 0.002,
                  distribution: str = 'normal',
                  min_latency: float = 0.001,
-                 max_latency: float = 0.050):
+                 max_latency: float = 0.050,
+                 seed: Optional[int] = None):
         """
         Initialize variable latency model.
         
@@ -69,31 +102,51 @@ class VariableLatency(LatencyModel):
             distribution: 'normal', 'exponential', or 'uniform'
             min_latency: Minimum latency bound
             max_latency: Maximum latency bound
+            seed: Seed for the model's random generator
         """
+        self._rng = np.random.default_rng(seed)
+        self._buffer: List[float] = []  # Pre-drawn samples, as Python floats
+        self._idx = 0
         self.mean_latency = mean_latency
         self.std_dev = std_dev
         self.distribution = distribution
         self.min_latency = min_latency
         self.max_latency = max_latency
     
-    def get_latency(self) -> float:
-        """
-        Sample latency from distribution.
-        
-        Returns:
-            Latency in seconds
-        """
+    def _discard_buffer(self) -> None:
+        self._buffer = []
+    
+    def _sample(self, n: int) -> np.ndarray:
+        """Draw ``n`` clamped latencies in one vectorized call."""
         if self.distribution == 'normal':
-            latency = np.random.normal(self.mean_latency, self.std_dev)
+            latency = self._rng.normal(self.mean_latency, self.std_dev, n)
         elif self.distribution == 'exponential':
-            latency = np.random.exponential(self.mean_latency)
+            latency = self._rng.exponential(self.mean_latency, n)
         elif self.distribution == 'uniform':
-            latency = np.random.uniform(self.min_latency, self.max_latency)
+            latency = self._rng.uniform(self.min_latency, self.max_latency, n)
         else:
             raise ValueError(f"Unknown distribution: {self.distribution}")
         
         # Clamp to bounds
-        return max(self.min_latency, min(self.max_latency, latency))
+        return np.clip(latency, self.min_latency, self.max_latency, out=latency)
+    
+    def get_latency(self) -> float:
+        """
+        Sample latency from distribution.
+        
+        Returns:
+            Latency in seconds
+        """
+        idx = self._idx
+        if idx >= len(self._buffer):
+            self._buffer = self._sample(self.BUFFER_SIZE).tolist()
+            idx = 0
+        self._idx = idx + 1
+        return self._buffer[idx]
+    
+    def get_latency_batch(self, n: int) -> np.ndarray:
+        """Sample ``n`` latencies in one vectorized draw."""
+        return self._sample(n)
 
 
 class TimeOfDayLatency(LatencyModel):
@@ -101,9 +154,15 @@ class TimeOfDayLatency(LatencyModel):
     Latency model that varies by time of day.
     
     Models realistic patterns where latency may be higher during
-    market open/close or other high-activity periods.
+    market open/close or other high-activity periods. Latencies are looked
+    up in a 24-entry per-hour table, rebuilt when a parameter changes.
     """
     
+    base_latency = param_property('base_latency', '_discard_hour_table')
+    peak_multiplier = param_property('peak_multiplier', '_discard_hour_table')
+    peak_start = param_property('peak_start', '_discard_hour_table')
+    peak_end = param_property('peak_end', '_discard_hour_table')
+    
     def __init__(self,
                  base_latency: float = 0.003,
                  peak_hours_multiplier: float = 2.0,
@@ -118,12 +177,25 @@ class TimeOfDayLatency(LatencyModel):
             peak_start_hour: Start of peak period (hour)
             peak_end_hour: End of peak period (hour)
         """
+        self._hour_lat: Optional[np.ndarray] = None
+        self._hour_values: Optional[List[float]] = None  # _hour_lat as Python floats
         self.base_latency = base_latency
         self.peak_multiplier = peak_hours_multiplier
         self.peak_start = peak_start_hour
         self.peak_end = peak_end_hour
         self.current_time = None
     
+    def _discard_hour_table(self) -> None:
+        self._hour_values = None
+    
+    def _hour_table(self) -> List[float]:
+        """Build the latency per hour of day."""
+        hour_lat = np.full(24, self.base_latency, dtype=np.float64)
+        hour_lat[max(self.peak_start, 0):max(self.peak_end, 0)] = self.base_latency * self.peak_multiplier
+        self._hour_lat = hour_lat
+        self._hour_values = hour_lat.tolist()
+        return self._hour_values
+    
     def set_current_time(self, current_time: datetime):
         """Update current time for latency calculation."""
         self.current_time = current_time
@@ -135,13 +207,43 @@ class TimeOfDayLatency(LatencyModel):
         Returns:
             Latency in seconds
         """
-        if self.current_time is None:
+        current_time = self.current_time
+        if current_time is None:
             return self.base_latency
+        table = self._hour_values
+        if table is None:
+            table = self._hour_table()
+        return table[current_time.hour]
+    
+    def get_latency_for_hours(self, hours: np.ndarray) -> np.ndarray:
+        """
+        Look up latencies for an array of hours of day (0-23).
         
-        hour = self.current_time.hour
+        Args:
+            hours: Integer hours
+            
+        Returns:
+            Latency in seconds per hour
+        """
+        if self._hour_values is None:
+            self._hour_table()
+        return self._hour_lat[hours]
+    
+    def get_latency_series(self, index) -> np.ndarray:
+        """
+        Latency for each timestamp of a pandas DatetimeIndex.
         
-        # Check if in peak hours
-        if self.peak_start <= hour < self.peak_end:
-            return self.base_latency * self.peak_multiplier
+        Replaces calling set_current_time and get_latency per bar when the
+        bar times are known up front.
         
-        return self.base_latency
+        Args:
+            index: DatetimeIndex of the bars
+            
+        Returns:
+            Latency in seconds per bar, in index order
+        """
+        return self.get_latency_for_hours(np.asarray(index.hour))
+    
+    def get_latency_batch(self, n: int) -> np.ndarray:
+        """Return ``n`` latencies at the current time of day."""
+        return np.full(n, self.get_latency(), dtype=np.float64)
@@ -1,9 +1,105 @@
 """Support for parallel backtest execution."""
 import concurrent.futures
-from typing import List, Dict, Any, Callable
+import functools
+import logging
+import multiprocessing
+import os
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Dict, Any, Callable, Literal, Tuple
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
+# Data published to this worker by ParallelBacktestRunner: data_file -> frame
+_SHARED_DATA: Dict[str, pd.DataFrame] = {}
+# Attached blocks, kept open for as long as the frames above reference them
+_SHARED_BLOCKS: List[SharedMemory] = []
+
+# NumPy dtype kinds that can be placed in shared memory as flat arrays
+_SHAREABLE_KINDS = 'biufcmM'
+
+# Workers start from a fork server where the platform has one: forking the
+# parent directly can deadlock once it runs threads (e.g. Numba's parallel
+# kernels), while a fork server never starts any.
+_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None
+
+
+def get_shared_data(data_file: str) -> pd.DataFrame:
+    """
+    Load the data for a backtest configuration.
+    
+    In workers of a runner created with ``share_data=True`` this returns the
+    frame loaded once by the parent for every config using the file. Process
+    workers see numeric and datetime columns as read-only views of shared
+    memory; thread workers get the parent's frame itself. Elsewhere the file
+    is read from disk with ``pd.read_csv``.
+    
+    Args:
+        data_file: Data file of a BacktestConfig
+        
+    Returns:
+        DataFrame of the file's data
+    """
+    data = _SHARED_DATA.get(data_file)
+    if data is None:
+        data = pd.read_csv(data_file)
+    return data
+
+
+def _share(values, blocks: List[SharedMemory]) -> Tuple:
+    """Describe one column (or index) for the workers.
+    
+    Plain NumPy columns are copied into a new shared memory block; other
+    columns (strings, categoricals, tz-aware datetimes) are sent as-is and
+    copied into each worker.
+    """
+    dtype = values.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in _SHAREABLE_KINDS:
+        return ('copy', values.array if isinstance(values, pd.Series) else values)
+    array = values.to_numpy()
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(shm)
+    np.ndarray(array.shape, dtype=dtype, buffer=shm.buf)[:] = array
+    return ('shm', shm.name, dtype.str, len(array))
+
+
+def _attach(spec: Tuple):
+    """Rebuild a column described by _share inside a worker."""
+    if spec[0] == 'copy':
+        return spec[1]
+    _, shm_name, dtype, length = spec
+    shm = SharedMemory(name=shm_name)
+    _SHARED_BLOCKS.append(shm)
+    array = np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf)
+    array.flags.writeable = False
+    return array
+
+
+def _publish(df: pd.DataFrame) -> Tuple[Dict[str, Any], List[SharedMemory]]:
+    """Place a frame's columns in shared memory and describe how to rebuild it."""
+    blocks: List[SharedMemory] = []
+    if isinstance(df.index, pd.RangeIndex):
+        index = ('copy', df.index)
+    else:
+        index = _share(df.index, blocks)
+    spec = {
+        'columns': [(name, _share(df[name], blocks)) for name in df.columns],
+        'index': index,
+        'index_name': df.index.name,
+    }
+    return spec, blocks
+
+
+def _init_worker(specs: Dict[str, Dict[str, Any]]):
+    """Process pool initializer: attach the published data files."""
+    for data_file, spec in specs.items():
+        arrays = {name: _attach(column) for name, column in spec['columns']}
+        index = pd.Index(_attach(spec['index']), name=spec['index_name'])
+        _SHARED_DATA[data_file] = pd.DataFrame(arrays, index=index, columns=list(arrays),
+                                               copy=False)
+
 
 @dataclass
 class BacktestConfig:
@@ -15,6 +111,25 @@ class BacktestConfig:
     slippage: float = 0.0005
     
 
+def _run_one(config: BacktestConfig, backtest_fn: Callable) -> Dict[str, Any]:
+    """Run one backtest (see ParallelBacktestRunner.run_single_backtest).
+    
+    Module-level so workers receive only the function and config, not the
+    runner and its previous results.
+    """
+    try:
+        result = backtest_fn(config)
+        result['success'] = True
+    except Exception as e:
+        result = {
+            'success': False,
+            'error': str(e)
+        }
+    result['_params'] = dict(config.strategy_params)
+    result['_data_file'] = config.data_file
+    return result
+
+
 class ParallelBacktestRunner:
     """
     Runner for executing multiple backtests in parallel.
@@ -23,14 +138,31 @@ class ParallelBacktestRunner:
     by running multiple backtest configurations concurrently.
     """
     
-    def __init__(self, max_workers: int = None):
+    def __init__(self, max_workers: int = None, share_data: bool = False,
+                 data_loader: Callable[[str], pd.DataFrame] = pd.read_csv,
+                 executor_type: Literal['process', 'thread'] = 'process'):
         """
         Initialize parallel backtest runner.
         
         Args:
             max_workers: Maximum number of parallel workers (default: CPU count)
+            share_data: Load each distinct data file once in the parent and
+                publish it to workers through shared memory; backtest
+                functions fetch it with get_shared_data(config.data_file)
+            data_loader: Function reading a data file when share_data is set
+            executor_type: 'process' runs each backtest in a worker process;
+                'thread' runs them on threads of this process, with no
+                pickling of configs, results or shared data. Threads only run
+                in parallel while the GIL is released, so the backtest's hot
+                loop should be a Numba function compiled with
+                ``@njit(nogil=True)`` working on NumPy arrays.
         """
+        if executor_type not in ('process', 'thread'):
+            raise ValueError(f"Unknown executor type: {executor_type}")
         self.max_workers = max_workers
+        self.executor_type = executor_type
+        self.share_data = share_data
+        self.data_loader = data_loader
         self.results = []
     
     def run_single_backtest(self, config: BacktestConfig, 
@@ -38,6 +170,10 @@ class ParallelBacktestRunner:
         """
         Run a single backtest with given configuration.
         
+        The result carries the config's strategy parameters (``_params``)
+        and data file (``_data_file``) rather than the config itself, which
+        would otherwise be pickled back from every worker.
+        
         Args:
             config: Backtest configuration
             backtest_fn: Function that runs the backtest
@@ -45,17 +181,7 @@ class ParallelBacktestRunner:
         Returns:
             Dictionary of results
         """
-        try:
-            result = backtest_fn(config)
-            result['config'] = config
-            result['success'] = True
-            return result
-        except Exception as e:
-            return {
-                'config': config,
-                'success': False,
-                'error': str(e)
-            }
+        return _run_one(config, backtest_fn)
     
     def run_parallel(self, configs: List[BacktestConfig],
                     backtest_fn: Callable) -> List[Dict[str, Any]]:
@@ -67,19 +193,51 @@ class ParallelBacktestRunner:
             backtest_fn: Function that runs a backtest
             
         Returns:
-            List of results dictionaries
+            List of results dictionaries, in the order of configs
         """
-        with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(self.run_single_backtest, config, backtest_fn)
-                      for config in configs]
+        specs, blocks, shared = {}, [], []
+        try:
+            if self.share_data:
+                for data_file in dict.fromkeys(config.data_file for config in configs):
+                    data = self.data_loader(data_file)
+                    if self.executor_type == 'thread':
+                        _SHARED_DATA[data_file] = data
+                        shared.append(data_file)
+                    else:
+                        specs[data_file], file_blocks = _publish(data)
+                        blocks.extend(file_blocks)
             
-            results = []
-            for future in concurrent.futures.as_completed(futures):
+            if self.executor_type == 'thread':
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+            else:
+                executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(_START_METHOD),
+                    initializer=_init_worker if specs else None,
+                    initargs=(specs,) if specs else ())
+            with executor:
+                # Batch configs per dispatch so small backtests are not
+                # dominated by per-task IPC (ignored by thread pools)
+                workers = self.max_workers or os.cpu_count() or 1
+                chunksize = max(1, len(configs) // (workers * 4))
+                
+                results = []
                 try:
-                    result = future.result()
-                    results.append(result)
+                    for result in executor.map(functools.partial(_run_one, backtest_fn=backtest_fn),
+                                               configs, chunksize=chunksize):
+                        results.append(result)
                 except Exception as e:
-                    results.append({'success': False, 'error': str(e)})
+                    # Worker or pickling failure: the remaining configs have no result
+                    results.extend({'success': False, 'error': str(e),
+                                    '_params': dict(config.strategy_params),
+                                    '_data_file': config.data_file}
+                                   for config in configs[len(results):])
+        finally:
+            for data_file in shared:
+                _SHARED_DATA.pop(data_file, None)
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
         
         self.results = results
         return results
@@ -116,12 +274,10 @@ class ParallelBacktestRunner:
         data = []
         for result in self.results:
             if result.get('success', False):
-                row = {**result}
-                # Flatten config
-                if 'config' in row:
-                    config = row.pop('config')
-                    for k, v in config.strategy_params.items():
-                        row[f'param_{k}'] = v
+                row = {k: v for k, v in result.items() if k not in ('_params', '_data_file')}
+                # Flatten strategy parameters
+                for k, v in result.get('_params', {}).items():
+                    row[f'param_{k}'] = v
                 data.append(row)
         
         return pd.DataFrame(data)
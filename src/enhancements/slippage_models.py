@@ -1,8 +1,60 @@
 """Advanced slippage models for realistic order execution simulation."""
 from abc import ABC, abstractmethod
+import math
 import numpy as np
 from typing import Optional
 
+from src.utils.jit import njit, prange
+from src.utils.params import param_property
+
+
+# Batch kernels only: a compiled call costs more than the scalar formulas
+# themselves, so calculate_slippage stays plain Python. The kernels take the
+# contiguous float64 arrays made by _batch_args; their signatures are given
+# so they are compiled (or loaded from the cache) at import rather than on
+# the first batch of a run.
+@njit('float64[::1](float64[::1], float64[::1], float64[::1], float64, float64)',
+      cache=True, parallel=True)
+def _volume_slip_batch(prices, quantities, volumes, base_slippage, impact_coefficient):
+    """Volume-based slippage per order; a zero volume means no volume data."""
+    out = np.empty(prices.shape[0])
+    for i in prange(prices.shape[0]):
+        out[i] = prices[i] * base_slippage
+        if volumes[i] != 0.0:
+            out[i] += prices[i] * impact_coefficient * abs(quantities[i]) / volumes[i]
+    return out
+
+
+@njit('float64[::1](float64[::1], float64[::1], float64[::1], float64, float64, float64, float64)',
+      cache=True, parallel=True)
+def _sqrt_slip_batch(prices, quantities, volumes, volatility, participation_rate,
+                     permanent_impact, temporary_impact):
+    """Square-root impact slippage per order; a zero volume means no volume data."""
+    total_impact = permanent_impact + temporary_impact
+    out = np.empty(prices.shape[0])
+    for i in prange(prices.shape[0]):
+        participation = participation_rate
+        if volumes[i] != 0.0:
+            participation = abs(quantities[i]) / volumes[i]
+        out[i] = abs(prices[i] * volatility * np.sqrt(participation) * total_impact)
+    return out
+
+
+def _no_slippage(price: float, quantity: int, volume: Optional[float] = None) -> float:
+    """calculate_slippage of a FixedSlippage with a zero rate."""
+    return 0.0
+
+
+def _batch_args(prices, quantities, volumes):
+    """Coerce batch inputs to float64 arrays; missing volumes become zeros."""
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    quantities = np.ascontiguousarray(quantities, dtype=np.float64)
+    if volumes is None:
+        volumes = np.zeros_like(prices)
+    else:
+        volumes = np.nan_to_num(np.ascontiguousarray(volumes, dtype=np.float64))
+    return prices, quantities, volumes
+
 
 class SlippageModel(ABC):
     """
@@ -27,6 +79,33 @@ class SlippageModel(ABC):
             Slippage amount (absolute value)
         """
         pass
+    
+    def calculate_slippage_batch(self, prices: np.ndarray, quantities: np.ndarray,
+                                 volumes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calculate slippage for many orders at once.
+        
+        The default calls calculate_slippage per order; the built-in models
+        override it with vectorized versions.
+        
+        Args:
+            prices: Expected execution prices
+            quantities: Order quantities
+            volumes: Market volumes; None or NaN means no volume data
+            
+        Returns:
+            Slippage amount per order
+        """
+        prices = np.asarray(prices, dtype=np.float64).tolist()
+        quantities = np.asarray(quantities).tolist()
+        if volumes is None:
+            volumes = [None] * len(prices)
+        else:
+            volumes = [None if v != v else v  # NaN
+                       for v in np.asarray(volumes, dtype=np.float64).tolist()]
+        return np.fromiter((self.calculate_slippage(p, q, v)
+                            for p, q, v in zip(prices, quantities, volumes)),
+                           dtype=np.float64, count=len(prices))
 
 
 class FixedSlippage(SlippageModel):
@@ -34,9 +113,13 @@ class FixedSlippage(SlippageModel):
     Fixed slippage model - constant percentage slip.
     
     Simple model where slippage is a fixed percentage of the order price.
-    Suitable for liquid markets with consistent execution costs.
+    Suitable for liquid markets with consistent execution costs. With a
+    zero rate, calculate_slippage is replaced by a function returning 0.0,
+    unless a subclass overrides calculate_slippage.
     """
     
+    slippage_pct = param_property('slippage_pct', '_select_calculate_slippage')
+    
     def __init__(self, slippage_pct: float = 0.0005):
         """
         Initialize fixed slippage model.
@@ -46,10 +129,22 @@ class FixedSlippage(SlippageModel):
         """
         self.slippage_pct = slippage_pct
     
+    def _select_calculate_slippage(self) -> None:
+        if self.slippage_pct == 0.0 and \
+                type(self).calculate_slippage is FixedSlippage.calculate_slippage:
+            self.calculate_slippage = _no_slippage
+        else:
+            self.__dict__.pop('calculate_slippage', None)
+    
     def calculate_slippage(self, price: float, quantity: int, 
                           volume: Optional[float] = None) -> float:
         """Calculate fixed slippage."""
         return price * self.slippage_pct
+    
+    def calculate_slippage_batch(self, prices: np.ndarray, quantities: np.ndarray,
+                                 volumes: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate fixed slippage for many orders at once."""
+        return np.asarray(prices, dtype=np.float64) * self.slippage_pct
 
 
 class VolumeBasedSlippage(SlippageModel):
@@ -90,6 +185,12 @@ class VolumeBasedSlippage(SlippageModel):
         impact = price * self.impact_coefficient * volume_ratio
         
         return base + impact
+    
+    def calculate_slippage_batch(self, prices: np.ndarray, quantities: np.ndarray,
+                                 volumes: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate volume-based slippage for many orders at once."""
+        return _volume_slip_batch(*_batch_args(prices, quantities, volumes),
+                                  self.base_slippage, self.impact_coefficient)
 
 
 class SquareRootSlippage(SlippageModel):
@@ -134,8 +235,8 @@ class SquareRootSlippage(SlippageModel):
         else:
             participation = abs(quantity) / volume
         
-        # Square root impact
-        impact_factor = np.sqrt(participation)
+        # Square root impact (math.sqrt avoids NumPy dispatch on a scalar)
+        impact_factor = math.sqrt(participation)
         
         # Total impact (permanent + temporary)
         total_impact = (self.permanent_impact + self.temporary_impact)
@@ -144,6 +245,13 @@ class SquareRootSlippage(SlippageModel):
         slippage = price * self.volatility * impact_factor * total_impact
         
         return abs(slippage)
+    
+    def calculate_slippage_batch(self, prices: np.ndarray, quantities: np.ndarray,
+                                 volumes: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate square-root model slippage for many orders at once."""
+        return _sqrt_slip_batch(*_batch_args(prices, quantities, volumes),
+                                self.volatility, self.participation_rate,
+                                self.permanent_impact, self.temporary_impact)
 
 
 class AdaptiveSlippage(SlippageModel):
@@ -195,3 +303,17 @@ class AdaptiveSlippage(SlippageModel):
             slippage += vol_adjustment
         
         return abs(slippage)
+    
+    def calculate_slippage_batch(self, prices: np.ndarray, quantities: np.ndarray,
+                                 volumes: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate adaptive slippage for many orders at once."""
+        prices, quantities, volumes = _batch_args(prices, quantities, volumes)
+        rate = np.full_like(prices, self.base_slippage)
+        
+        traded = volumes > 0
+        rate[traded] += self.volume_sensitivity * np.abs(quantities[traded]) / volumes[traded]
+        
+        if self.recent_volatility is not None:
+            rate += self.volatility_sensitivity * self.recent_volatility
+        
+        return np.abs(prices * rate)
@@ -4,6 +4,8 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 import warnings
 
+from src.utils.jit import njit
+
 try:
     import matplotlib.pyplot as plt
     import matplotlib.dates as mdates
@@ -14,24 +16,168 @@ except ImportError:
     warnings.warn("Matplotlib not available. Install with: pip install matplotlib")
 
 
+@njit(cache=True, error_model='numpy')
+def _drawdown(values):
+    """Percent drawdown from the running maximum, in one pass.
+    
+    NaN values give NaN and are skipped by the running maximum, like
+    pandas' cummax.
+    """
+    out = np.empty(values.shape[0])
+    running_max = -np.inf
+    for i in range(values.shape[0]):
+        value = values[i]
+        if value != value:
+            out[i] = np.nan
+            continue
+        if value > running_max:
+            running_max = value
+        out[i] = (value - running_max) / running_max * 100.0
+    return out
+
+
+@njit(cache=True, error_model='numpy')
+def _rolling_sharpe_vol(returns, window, periods_per_year):
+    """Rolling annualized Sharpe ratio and volatility (%) in one pass.
+    
+    Keeps running sums of the returns and their squares over the window,
+    so each step is O(1). Matches pandas' rolling(window) mean/std (sample
+    standard deviation): NaN until the window is full or while it holds a
+    NaN.
+    """
+    n = returns.shape[0]
+    sharpe = np.full(n, np.nan)
+    vol = np.full(n, np.nan)
+    ann = np.sqrt(periods_per_year)
+    total = 0.0
+    total_sq = 0.0
+    nans = 0
+    for i in range(n):
+        value = returns[i]
+        if value != value:
+            nans += 1
+        else:
+            total += value
+            total_sq += value * value
+        if i >= window:
+            old = returns[i - window]
+            if old != old:
+                nans -= 1
+            else:
+                total -= old
+                total_sq -= old * old
+        if i >= window - 1 and nans == 0:
+            mean = total / window
+            var = max((total_sq - total * mean) / (window - 1), 0.0)
+            std = np.sqrt(var)
+            sharpe[i] = mean / std * ann
+            vol[i] = std * ann * 100.0
+    return sharpe, vol
+
+
+@njit(cache=True)
+def _lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of a curve sorted by x.
+    
+    Keeps the first and last points and, from each of ``n_out - 2`` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket.
+    
+    Returns:
+        Indices of the kept points, increasing
+    """
+    n = x.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= avg_end - avg_start
+        avg_y /= avg_end - avg_start
+        
+        best = int(i * every) + 1
+        max_area = -1.0
+        for j in range(best, int((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                best = j
+        out[i + 1] = best
+        a = best
+    return out
+
+
+def _downsample(ax, x, y: np.ndarray, max_points: Optional[int]) -> np.ndarray:
+    """Indices of the points of a curve to draw on ``ax``, at most ``max_points``."""
+    if max_points is None or len(y) <= max_points:
+        return np.arange(len(y))
+    x_num = np.asarray(ax.convert_xunits(x), dtype=np.float64)
+    return _lttb(x_num, y, max_points)
+
+
+def _plot_line(ax, x, y, max_points: Optional[int], **kwargs):
+    """Plot a curve downsampled with LTTB to ``max_points``.
+    
+    The full-resolution data stays attached to the axes: when the x range
+    changes (zoom, pan), the visible part is downsampled again.
+    
+    Returns:
+        (line, indices of the initially drawn points)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    keep = _downsample(ax, x, y, max_points)
+    line, = ax.plot(x[keep], y[keep], **kwargs)
+    if len(keep) == len(y):
+        return line, keep
+    
+    x_num = np.asarray(ax.convert_xunits(x), dtype=np.float64)
+    
+    def on_xlim_changed(changed_ax):
+        low, high = changed_ax.get_xlim()
+        start = max(int(np.searchsorted(x_num, low)) - 1, 0)
+        stop = min(int(np.searchsorted(x_num, high)) + 1, len(x_num))
+        visible = start + _lttb(x_num[start:stop], y[start:stop], max_points)
+        line.set_data(x[visible], y[visible])
+    
+    ax.callbacks.connect('xlim_changed', on_xlim_changed)
+    return line, keep
+
+
 class EquityCurveVisualizer:
     """
     Visualizer for equity curves and portfolio performance.
     
     Creates professional-looking charts for analyzing backtest results.
+    Long curves are downsampled with LTTB before drawing; lines are
+    downsampled again from the full data when zoomed.
     """
     
-    def __init__(self, figsize: Tuple[int, int] = (12, 8)):
+    def __init__(self, figsize: Tuple[int, int] = (12, 8),
+                 max_points: Optional[int] = 2000):
         """
         Initialize equity curve visualizer.
         
         Args:
             figsize: Figure size (width, height) in inches
+            max_points: Maximum points drawn per curve (None draws every point)
         """
         if not MATPLOTLIB_AVAILABLE:
             raise ImportError("Matplotlib is required for visualization")
         
         self.figsize = figsize
+        self.max_points = max_points
         self.fig = None
         self.axes = None
     
@@ -57,9 +203,11 @@ class EquityCurveVisualizer:
             self.fig, ax_equity = plt.subplots(figsize=self.figsize)
         
         # Plot equity curve
-        ax_equity.plot(equity_data.index, equity_data.values, 
-                      linewidth=2, color='#2E86AB', label='Portfolio Value')
-        ax_equity.fill_between(equity_data.index, equity_data.values, 
+        dates = equity_data.index.to_numpy()
+        values = equity_data.to_numpy(dtype=np.float64)
+        _, keep = _plot_line(ax_equity, dates, values, self.max_points,
+                             linewidth=2, color='#2E86AB', label='Portfolio Value')
+        ax_equity.fill_between(dates[keep], values[keep],
                               alpha=0.3, color='#2E86AB')
         
         # Add horizontal line at initial value
@@ -75,10 +223,10 @@ class EquityCurveVisualizer:
         
         # Plot drawdown if requested
         if show_drawdown:
-            running_max = equity_data.cummax()
-            drawdown = (equity_data - running_max) / running_max * 100
+            drawdown = _drawdown(values)
+            keep = _downsample(ax_dd, dates, drawdown, self.max_points)
             
-            ax_dd.fill_between(drawdown.index, drawdown.values, 0,
+            ax_dd.fill_between(dates[keep], drawdown[keep], 0,
                               color='#A23B72', alpha=0.5)
             ax_dd.set_ylabel('Drawdown (%)', fontsize=12)
             ax_dd.set_xlabel('Date', fontsize=12)
@@ -107,8 +255,8 @@ class EquityCurveVisualizer:
         for (name, equity), color in zip(equity_curves.items(), colors):
             # Normalize to percentage returns
             normalized = (equity / equity.iloc[0] - 1) * 100
-            ax.plot(normalized.index, normalized.values, 
-                   label=name, linewidth=2, color=color)
+            _plot_line(ax, normalized.index, normalized.values, self.max_points,
+                       label=name, linewidth=2, color=color)
         
         ax.set_title(title, fontsize=14, fontweight='bold')
         ax.set_ylabel('Return (%)', fontsize=12)
@@ -143,17 +291,21 @@ class PerformanceVisualizer:
     Visualizer for performance metrics and statistics.
     """
     
-    def __init__(self, figsize: Tuple[int, int] = (12, 8)):
+    def __init__(self, figsize: Tuple[int, int] = (12, 8),
+                 max_points: Optional[int] = 2000):
         """
         Initialize performance visualizer.
         
         Args:
             figsize: Figure size (width, height) in inches
+            max_points: Maximum points drawn per rolling-metric curve (None
+                draws every point)
         """
         if not MATPLOTLIB_AVAILABLE:
             raise ImportError("Matplotlib is required for visualization")
         
         self.figsize = figsize
+        self.max_points = max_points
         self.fig = None
     
     def plot_returns_distribution(self, returns: pd.Series,
@@ -208,18 +360,15 @@ class PerformanceVisualizer:
         # Calculate returns
         returns = equity_data.pct_change()
         
-        # Rolling Sharpe (annualized)
-        rolling_sharpe = (returns.rolling(window).mean() / 
-                         returns.rolling(window).std() * np.sqrt(252))
-        
-        # Rolling volatility (annualized)
-        rolling_vol = returns.rolling(window).std() * np.sqrt(252) * 100
+        # Rolling Sharpe and volatility (annualized), from one pass
+        rolling_sharpe, rolling_vol = _rolling_sharpe_vol(
+            returns.to_numpy(dtype=np.float64), window, 252.0)
         
         self.fig, (ax1, ax2) = plt.subplots(2, 1, figsize=self.figsize)
         
         # Sharpe ratio
-        ax1.plot(rolling_sharpe.index, rolling_sharpe.values,
-                color='#2E86AB', linewidth=2)
+        _plot_line(ax1, returns.index, rolling_sharpe, self.max_points,
+                   color='#2E86AB', linewidth=2)
         ax1.axhline(y=1.0, color='green', linestyle='--', alpha=0.5, label='Sharpe=1')
         ax1.set_ylabel('Sharpe Ratio', fontsize=12)
         ax1.set_title(f'{window}-Day Rolling Sharpe Ratio', fontsize=12, fontweight='bold')
@@ -227,8 +376,8 @@ class PerformanceVisualizer:
         ax1.grid(True, alpha=0.3)
         
         # Volatility
-        ax2.plot(rolling_vol.index, rolling_vol.values,
-                color='#A23B72', linewidth=2)
+        _plot_line(ax2, returns.index, rolling_vol, self.max_points,
+                   color='#A23B72', linewidth=2)
         ax2.set_ylabel('Volatility (%)', fontsize=12)
         ax2.set_xlabel('Date', fontsize=12)
         ax2.set_title(f'{window}-Day Rolling Volatility', fontsize=12, fontweight='bold')
@@ -250,20 +399,19 @@ class PerformanceVisualizer:
         Returns:
             Matplotlib figure
         """
-        # Resample to monthly returns
-        monthly_returns = (1 + returns).resample('M').prod() - 1
-        
-        # Create pivot table
-        monthly_returns_pivot = monthly_returns.to_frame('returns')
-        monthly_returns_pivot['Year'] = monthly_returns_pivot.index.year
-        monthly_returns_pivot['Month'] = monthly_returns_pivot.index.month
-        pivot = monthly_returns_pivot.pivot(index='Year', columns='Month', values='returns')
-        pivot = pivot * 100  # Convert to percentage
+        # Compound returns per calendar month, one row per year. Grouping
+        # by year and month directly works on every supported pandas (the
+        # month-end resample alias changed from 'M' to 'ME' in 2.2).
+        index = returns.index
+        monthly_returns = (1 + returns).groupby([index.year, index.month]).prod() - 1
+        pivot = monthly_returns.unstack().reindex(columns=range(1, 13))
+        pivot.index.name, pivot.columns.name = 'Year', 'Month'
+        values = pivot.to_numpy(dtype=np.float64) * 100  # Convert to percentage
+        limit = np.nanmax(np.abs(values))
         
         # Plot heatmap
         self.fig, ax = plt.subplots(figsize=self.figsize)
-        im = ax.imshow(pivot.values, cmap='RdYlGn', aspect='auto',
-                      vmin=-pivot.abs().max().max(), vmax=pivot.abs().max().max())
+        im = ax.imshow(values, cmap='RdYlGn', aspect='auto', vmin=-limit, vmax=limit)
         
         # Set ticks
         ax.set_xticks(np.arange(12))
@@ -276,13 +424,10 @@ class PerformanceVisualizer:
         cbar = plt.colorbar(im, ax=ax)
         cbar.set_label('Return (%)', fontsize=12)
         
-        # Add text annotations
-        for i in range(len(pivot.index)):
-            for j in range(12):
-                if not np.isnan(pivot.iloc[i, j]):
-                    text = ax.text(j, i, f'{pivot.iloc[i, j]:.1f}',
-                                 ha="center", va="center", color="black",
-                                 fontsize=8)
+        # Add text annotations for the months with data
+        for i, j in zip(*np.nonzero(~np.isnan(values))):
+            ax.text(j, i, f'{values[i, j]:.1f}',
+                    ha="center", va="center", color="black", fontsize=8)
         
         ax.set_title(title, fontsize=14, fontweight='bold')
         plt.tight_layout()
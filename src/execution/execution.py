@@ -1,51 +1,70 @@
+import operator
 from queue import Queue
 from datetime import datetime
 from typing import Optional
 
 from ..utils.events import FillEvent, OrderEvent
+from ..utils.params import param_property
 from ..market_data.data_handler import DataHandler
 
 
 class ExecutionHandler:
     """Simulates order execution with slippage and costs."""
     
+    slippage_bps = param_property('slippage_bps', '_refresh_slippage')
+    commission_pct = param_property('commission_pct', '_refresh_commission')
+    
     def __init__(self, events: Queue, data: DataHandler, slippage_bps: float = 10.0, commission_pct: float = 0.1):
         self.events = events
         self.data = data
         self.slippage_bps = slippage_bps  # basis points (1 bp = 0.01%)
         self.commission_pct = commission_pct  # percentage (e.g., 0.1 = 0.1%)
+        self._get_close = operator.itemgetter('close')
+    
+    def _refresh_slippage(self) -> None:
+        """Recompute the per-fill price multipliers."""
+        slippage_factor = self.slippage_bps / 10000.0  # convert bp to decimal
+        self._buy_factor = 1.0 + slippage_factor
+        self._sell_factor = 1.0 - slippage_factor
     
-    def execute_order(self, event: OrderEvent) -> None:
+    def _refresh_commission(self) -> None:
+        """Recompute the commission rate."""
+        self._commission_rate = self.commission_pct / 100.0
+    
+    def execute_order(self, event: OrderEvent, timestamp: Optional[datetime] = None) -> None:
         """Process order events and generate fill events."""
         if event.type.value == 'order':
-            fill_event = self._create_fill(event)
+            fill_event = self._create_fill(event, timestamp)
             self.events.put(fill_event)
     
-    def _create_fill(self, order: OrderEvent) -> FillEvent:
-        """Simulate order fills with slippage and commission."""
+    def _create_fill(self, order: OrderEvent, timestamp: Optional[datetime] = None) -> FillEvent:
+        """Simulate order fills with slippage and commission.
+        
+        The fill is stamped with ``timestamp`` when given, otherwise with the
+        order's own (simulated) timestamp.
+        """
         # Get current market price
         bar = self.data.get_latest_bar(order.symbol)
         if bar is not None:
-            fill_price = bar['close']
+            fill_price = self._get_close(bar)
         else:
             fill_price = order.price if order.price is not None else 0.0
         
         # Apply slippage model (basis points)
-        slippage_factor = self.slippage_bps / 10000.0  # convert bp to decimal
         if order.direction == 'BUY':
-            fill_price *= (1 + slippage_factor)
+            fill_price *= self._buy_factor
         else:  # SELL
-            fill_price *= (1 - slippage_factor)
+            fill_price *= self._sell_factor
         
         # Calculate fill cost
         fill_cost = fill_price * order.quantity
         
         # Calculate commission (percentage of trade value)
-        commission = fill_cost * (self.commission_pct / 100.0)
+        commission = fill_cost * self._commission_rate
         
         # Create fill event
         fill = FillEvent(
-            timestamp=datetime.now(),
+            timestamp=order.timestamp if timestamp is None else timestamp,
             symbol=order.symbol,
             exchange='SIMULATED',
             quantity=order.quantity,
@@ -1,53 +1,119 @@
 """Realistic execution simulator with latency models."""
 
-import random
 import uuid
-from typing import Dict, Any
-from src.interfaces.execution_interface import IExecutionSimulator, ExecutionResult, LatencyModel
-from src.interfaces.strategy_interface import Signal
+from typing import Dict, Any, List, Optional
+import numpy as np
+from src.interfaces.execution_interface import (IExecutionSimulator, ExecutionResult,
+                                                ExecutionBatchResult, LatencyModel)
+from src.interfaces.strategy_interface import Signal, SignalType
+from src.utils.params import param_property
+
+# Signal types that sell: they fill below the market price
+_SELL_SIGNALS = frozenset((SignalType.SELL, SignalType.CLOSE_LONG))
 
 class RealisticExecutionSimulator(IExecutionSimulator):
-    """Execution simulator with configurable latency and slippage."""
+    """Execution simulator with configurable latency and slippage.
+    
+    Single orders take their latency and slippage draws from buffers filled
+    ``BUFFER_SIZE`` at a time by one vectorized call, so execute_order costs
+    list reads rather than NumPy calls. Changing the latency model discards
+    latencies drawn under the old one.
+    """
+    
+    BUFFER_SIZE = 4096
+    latency_model = param_property('latency_model', '_discard_latencies')
+    latency_params = param_property('latency_params', '_discard_latencies')
     
     def __init__(self, latency_model: LatencyModel = LatencyModel.CONSTANT,
                  latency_params: Dict[str, float] = None,
-                 slippage_bps: float = 2.0):
+                 slippage_bps: float = 2.0, seed: Optional[int] = None):
+        self._rng = np.random.default_rng(seed)
+        # Pre-drawn latencies (ms) and slippage factors, as Python floats
+        self._latency_buf: List[float] = []
+        self._latency_idx = 0
+        self._slip_buf: List[float] = []
+        self._slip_idx = 0
+        self._next_order_seq = 0
         self.latency_model = latency_model
         self.latency_params = latency_params or {'constant_ms': 5.0}
         self.slippage_bps = slippage_bps
     
+    def _discard_latencies(self) -> None:
+        self._latency_buf = []
+    
     def execute_order(self, signal: Signal, market_price: float, timestamp: float) -> ExecutionResult:
-        latency_ms = self._calculate_latency()
-        slippage = self._calculate_slippage(market_price)
+        idx = self._latency_idx
+        if idx >= len(self._latency_buf):
+            self._latency_buf = self._calculate_latency_batch(self.BUFFER_SIZE).tolist()
+            idx = 0
+        self._latency_idx = idx + 1
+        latency_ms = self._latency_buf[idx]
+        
+        idx = self._slip_idx
+        if idx >= len(self._slip_buf):
+            self._slip_buf = self._rng.uniform(0.5, 1.5, size=self.BUFFER_SIZE).tolist()
+            idx = 0
+        self._slip_idx = idx + 1
+        slippage = market_price * (self.slippage_bps / 10000.0) * self._slip_buf[idx]
+        if signal.signal_type in _SELL_SIGNALS:
+            slippage = -slippage
+        
         filled_price = market_price + slippage
+        quantity = float(signal.quantity)
         return ExecutionResult(
             order_id=str(uuid.uuid4()),
             filled_price=filled_price,
-            filled_quantity=signal.quantity,
-            execution_time=timestamp + (latency_ms / 1000.0),
+            filled_quantity=quantity,
+            execution_time=timestamp + latency_ms / 1000.0,
+            latency_ms=latency_ms,
+            slippage=slippage,
+            commission=quantity * filled_price * 0.0001
+        )
+    
+    def execute_batch(self, quantities: np.ndarray, market_prices: np.ndarray,
+                      timestamps: np.ndarray, sides: Optional[np.ndarray] = None,
+                      sequential_ids: bool = False) -> ExecutionBatchResult:
+        """Simulate a batch of orders, drawing all latencies and slippage at once.
+        
+        Slippage moves the fill against the order: buys fill above the
+        market price and sells below it. With ``sequential_ids`` the order
+        ids are an int64 array numbered on from the previous batch instead
+        of one UUID string per order, which dominates the cost of large
+        backtest replays.
+        """
+        n = len(quantities)
+        if sequential_ids:
+            order_ids = np.arange(self._next_order_seq, self._next_order_seq + n, dtype=np.int64)
+            self._next_order_seq += n
+        else:
+            order_ids = [str(uuid.uuid4()) for _ in range(n)]
+        market_prices = np.asarray(market_prices, dtype=np.float64)
+        latency_ms = self._calculate_latency_batch(n)
+        slippage = market_prices * (self.slippage_bps / 10000.0) * self._rng.uniform(0.5, 1.5, size=n)
+        if sides is not None:
+            slippage *= sides
+        filled_prices = market_prices + slippage
+        filled_quantities = np.asarray(quantities, dtype=np.float64)
+        return ExecutionBatchResult(
+            order_ids=order_ids,
+            filled_prices=filled_prices,
+            filled_quantities=filled_quantities,
+            execution_times=np.asarray(timestamps, dtype=np.float64) + latency_ms / 1000.0,
             latency_ms=latency_ms,
             slippage=slippage,
-            commission=self._calculate_commission(signal.quantity, filled_price)
+            commission=filled_quantities * filled_prices * 0.0001
         )
     
-    def _calculate_latency(self) -> float:
-        if self.latency_model == LatencyModel.ZERO:
-            return 0.0
-        elif self.latency_model == LatencyModel.CONSTANT:
-            return self.latency_params.get('constant_ms', 5.0)
+    def _calculate_latency_batch(self, n: int) -> np.ndarray:
+        if self.latency_model == LatencyModel.CONSTANT:
+            return np.full(n, self.latency_params.get('constant_ms', 5.0), dtype=np.float64)
         elif self.latency_model == LatencyModel.NORMAL:
             mean = self.latency_params.get('mean_ms', 5.0)
             std = self.latency_params.get('std_ms', 1.0)
-            return max(0, random.gauss(mean, std))
+            return np.maximum(0.0, self._rng.normal(mean, std, size=n))
         elif self.latency_model == LatencyModel.REALISTIC_HFT:
-            return max(0.1, random.lognormvariate(1.0, 0.5))
-        return 0.0
-    
-    def _calculate_slippage(self, price: float) -> float:
-        return price * (self.slippage_bps / 10000.0) * random.uniform(0.5, 1.5)
-    
-    def _calculate_commission(self, quantity: float, price: float) -> float:
-        return quantity * price * 0.0001
+            return np.maximum(0.1, self._rng.lognormal(1.0, 0.5, size=n))
+        return np.zeros(n, dtype=np.float64)
     
     def set_latency_model(self, model: LatencyModel, params: Dict[str, float]) -> None:
         self.latency_model = model
@@ -1,13 +1,14 @@
 """Clean interfaces for modular execution model."""
 
-from .strategy_interface import IStrategy, Signal, SignalType
+from .strategy_interface import IStrategy, Signal, SignalBatch, SignalType, StrategyInterface
 from .risk_interface import IRiskManager, RiskCheckResult
-from .execution_interface import IExecutionSimulator, ExecutionResult, LatencyModel
-from .market_data_interface import IMarketDataHandler, MarketDataSnapshot
+from .execution_interface import (IExecutionSimulator, ExecutionResult,
+                                  ExecutionBatchResult, LatencyModel)
+from .market_data_interface import IMarketDataHandler, MarketDataBatch, MarketDataSnapshot
 
 __all__ = [
-    'IStrategy', 'Signal', 'SignalType',
+    'IStrategy', 'Signal', 'SignalBatch', 'SignalType', 'StrategyInterface',
     'IRiskManager', 'RiskCheckResult',
-    'IExecutionSimulator', 'ExecutionResult', 'LatencyModel',
-    'IMarketDataHandler', 'MarketDataSnapshot'
+    'IExecutionSimulator', 'ExecutionResult', 'ExecutionBatchResult', 'LatencyModel',
+    'IMarketDataHandler', 'MarketDataBatch', 'MarketDataSnapshot'
 ]
@@ -1,17 +1,23 @@
 """Execution simulator interface with latency models."""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Union
 from enum import Enum
 import random
 
+import numpy as np
+
+from ..utils.slots import slotted
+from .strategy_interface import Signal, SignalType
+
 class LatencyModel(Enum):
     ZERO = "ZERO"
     CONSTANT = "CONSTANT"
     NORMAL = "NORMAL"
     REALISTIC_HFT = "REALISTIC_HFT"
 
+@slotted
 @dataclass
 class ExecutionResult:
     order_id: str
@@ -21,7 +27,33 @@ class ExecutionResult:
     latency_ms: float
     slippage: float = 0.0
     commission: float = 0.0
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class ExecutionBatchResult:
+    """Columnar fill details for a batch of executed orders."""
+    order_ids: Union[List[str], np.ndarray]  # UUID strings or int64 sequence numbers
+    filled_prices: np.ndarray  # float64
+    filled_quantities: np.ndarray  # float64
+    execution_times: np.ndarray  # float64
+    latency_ms: np.ndarray  # float64
+    slippage: np.ndarray  # float64
+    commission: np.ndarray  # float64
+    
+    def __len__(self) -> int:
+        return len(self.order_ids)
+    
+    def row(self, i: int) -> ExecutionResult:
+        """Return fill i as an ExecutionResult."""
+        return ExecutionResult(
+            order_id=str(self.order_ids[i]),
+            filled_price=float(self.filled_prices[i]),
+            filled_quantity=float(self.filled_quantities[i]),
+            execution_time=float(self.execution_times[i]),
+            latency_ms=float(self.latency_ms[i]),
+            slippage=float(self.slippage[i]),
+            commission=float(self.commission[i])
+        )
 
 class IExecutionSimulator(ABC):
     """Execution simulator with realistic latency and slippage models."""
@@ -40,6 +72,40 @@ class IExecutionSimulator(ABC):
         """
         pass
     
+    def execute_batch(self, quantities: np.ndarray, market_prices: np.ndarray,
+                      timestamps: np.ndarray, sides: Optional[np.ndarray] = None) -> ExecutionBatchResult:
+        """Simulate execution of a batch of orders.
+        
+        The default implementation calls execute_order per order;
+        simulators override it with a vectorized version.
+        
+        Args:
+            quantities: Order quantities
+            market_prices: Market price at each order
+            timestamps: Order timestamps
+            sides: +1 for buys, -1 for sells (all buys if omitted)
+            
+        Returns:
+            ExecutionBatchResult aligned with the inputs
+        """
+        if sides is None:
+            sides = np.ones(len(quantities), dtype=np.int8)
+        results = [
+            self.execute_order(Signal(symbol='', signal_type=SignalType.BUY if s > 0 else SignalType.SELL,
+                                      quantity=float(q), timestamp=float(t)),
+                               float(p), float(t))
+            for q, p, t, s in zip(quantities, market_prices, timestamps, sides)
+        ]
+        return ExecutionBatchResult(
+            order_ids=[r.order_id for r in results],
+            filled_prices=np.array([r.filled_price for r in results], dtype=np.float64),
+            filled_quantities=np.array([r.filled_quantity for r in results], dtype=np.float64),
+            execution_times=np.array([r.execution_time for r in results], dtype=np.float64),
+            latency_ms=np.array([r.latency_ms for r in results], dtype=np.float64),
+            slippage=np.array([r.slippage for r in results], dtype=np.float64),
+            commission=np.array([r.commission for r in results], dtype=np.float64)
+        )
+    
     @abstractmethod
     def set_latency_model(self, model: LatencyModel, params: Dict[str, float]) -> None:
         """Configure latency model."""
@@ -1,9 +1,14 @@
 """Market data handler interface."""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
 
+import numpy as np
+
+from ..utils.slots import slotted
+
+@slotted
 @dataclass
 class MarketDataSnapshot:
     symbol: str
@@ -14,7 +19,45 @@ class MarketDataSnapshot:
     volume: float
     bid_size: Optional[float] = None
     ask_size: Optional[float] = None
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class MarketDataBatch:
+    """Columnar batch of market data updates, one row per tick."""
+    symbols: np.ndarray  # int32 indices into symbol_table
+    prices: np.ndarray  # float64
+    timestamps: np.ndarray  # float64 epoch seconds
+    volumes: np.ndarray  # float64
+    symbol_table: List[str]
+    
+    def __len__(self) -> int:
+        return len(self.prices)
+    
+    def row(self, i: int) -> Dict[str, Any]:
+        """Return tick ``i`` in the dict form used by the scalar APIs."""
+        return {
+            'symbol': self.symbol_table[self.symbols[i]],
+            'price': float(self.prices[i]),
+            'timestamp': float(self.timestamps[i]),
+            'volume': float(self.volumes[i])
+        }
+    
+    @classmethod
+    def from_dicts(cls, market_data: List[Dict[str, Any]]) -> 'MarketDataBatch':
+        """Build a batch from market data dicts with symbol/price/timestamp/volume."""
+        symbol_table: List[str] = []
+        codes: Dict[str, int] = {}
+        for md in market_data:
+            if md['symbol'] not in codes:
+                codes[md['symbol']] = len(symbol_table)
+                symbol_table.append(md['symbol'])
+        return cls(
+            symbols=np.array([codes[md['symbol']] for md in market_data], dtype=np.int32),
+            prices=np.array([md['price'] for md in market_data], dtype=np.float64),
+            timestamps=np.array([md['timestamp'] for md in market_data], dtype=np.float64),
+            volumes=np.array([md.get('volume', 0.0) for md in market_data], dtype=np.float64),
+            symbol_table=symbol_table
+        )
 
 class IMarketDataHandler(ABC):
     """Market data handler interface."""
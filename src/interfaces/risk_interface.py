@@ -1,25 +1,28 @@
 """Risk management interface."""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from enum import Enum
 
+import numpy as np
+
+from ..utils.slots import slotted
+from .market_data_interface import MarketDataBatch
+from .strategy_interface import Signal, SignalBatch, SignalType
+
 class RiskStatus(Enum):
     APPROVED = "APPROVED"
     REJECTED = "REJECTED"
     WARNING = "WARNING"
 
+@slotted
 @dataclass
 class RiskCheckResult:
     status: RiskStatus
     reason: str = ""
     max_allowed_quantity: Optional[float] = None
-    metadata: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 class IRiskManager(ABC):
     """Risk Manager interface for pre-trade risk checks."""
@@ -37,6 +40,40 @@ class IRiskManager(ABC):
         """
         pass
     
+    def check_batch(self, signals: SignalBatch, market_data: MarketDataBatch,
+                    current_position: Dict[str, float]) -> np.ndarray:
+        """Check a batch of signals in time order.
+        
+        Approved orders are assumed to fill in full, so each check sees the
+        positions left by the orders accepted before it. ``current_position``
+        itself is not modified.
+        
+        Args:
+            signals: SignalBatch aligned with market_data
+            market_data: Market data the signals were generated from
+            current_position: Portfolio positions before the batch
+            
+        Returns:
+            Boolean mask of signals that may be executed
+        """
+        positions = dict(current_position)
+        accepted = np.zeros(len(signals), dtype=bool)
+        for i in np.flatnonzero(signals.mask).tolist():
+            row = market_data.row(i)
+            signal = Signal(
+                symbol=row['symbol'],
+                signal_type=SignalType.BUY if signals.sides[i] > 0 else SignalType.SELL,
+                quantity=float(signals.quantities[i]),
+                timestamp=row['timestamp'],
+                price=row['price']
+            )
+            if self.check_order(signal, positions).status == RiskStatus.REJECTED:
+                continue
+            accepted[i] = True
+            positions[signal.symbol] = (positions.get(signal.symbol, 0.0)
+                                        + float(signals.signed_quantities[i]))
+        return accepted
+    
     @abstractmethod
     def update_limits(self, limits: Dict[str, Any]) -> None:
         """Update risk limits dynamically."""
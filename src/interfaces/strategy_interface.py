@@ -2,8 +2,15 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, TYPE_CHECKING
+
+import numpy as np
+
+from ..utils.slots import slotted
+
+if TYPE_CHECKING:
+    from .market_data_interface import MarketDataBatch
 
 
 class SignalType(Enum):
@@ -15,6 +22,7 @@ class SignalType(Enum):
     CLOSE_SHORT = "CLOSE_SHORT"
 
 
+@slotted
 @dataclass
 class Signal:
     """Trading signal with metadata."""
@@ -24,11 +32,28 @@ class Signal:
     timestamp: float
     price: Optional[float] = None
     confidence: float = 1.0
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SignalBatch:
+    """Columnar trading signals aligned row-for-row with a MarketDataBatch."""
+    sides: np.ndarray  # int8: +1 BUY, -1 SELL, 0 no signal
+    quantities: np.ndarray  # float64
+    confidence: Optional[np.ndarray] = None  # float64
+    
+    def __len__(self) -> int:
+        return len(self.sides)
     
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    @property
+    def mask(self) -> np.ndarray:
+        """Boolean mask of rows carrying a signal."""
+        return self.sides != 0
+    
+    @property
+    def signed_quantities(self) -> np.ndarray:
+        """Quantities signed by side (positive buys, negative sells)."""
+        return self.sides * self.quantities
 
 
 class IStrategy(ABC):
@@ -50,6 +75,31 @@ class IStrategy(ABC):
         """
         pass
     
+    def on_market_data_batch(self, market_data: 'MarketDataBatch') -> SignalBatch:
+        """Process a columnar batch of market data.
+        
+        The default implementation feeds each row to on_market_data;
+        strategies override it with a vectorized version.
+        
+        Args:
+            market_data: MarketDataBatch of ticks in time order
+            
+        Returns:
+            SignalBatch aligned with the input rows
+        """
+        n = len(market_data)
+        sides = np.zeros(n, dtype=np.int8)
+        quantities = np.zeros(n, dtype=np.float64)
+        confidence = np.zeros(n, dtype=np.float64)
+        for i in range(n):
+            signal = self.on_market_data(market_data.row(i))
+            if signal is None or signal.signal_type not in (SignalType.BUY, SignalType.SELL):
+                continue
+            sides[i] = 1 if signal.signal_type == SignalType.BUY else -1
+            quantities[i] = signal.quantity
+            confidence[i] = signal.confidence
+        return SignalBatch(sides=sides, quantities=quantities, confidence=confidence)
+    
     @abstractmethod
     def on_fill(self, fill_event: Dict[str, Any]) -> None:
         """Handle order fill notification.
@@ -69,3 +119,37 @@ class IStrategy(ABC):
     def name(self) -> str:
         """Strategy name for identification."""
         pass
+
+
+class StrategyInterface(ABC):
+    """Interface for the order-generating strategy templates in src.strategies.
+    
+    Unlike IStrategy, these strategies return order dicts directly and
+    expose their internal state for monitoring.
+    """
+    
+    @abstractmethod
+    def on_market_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Process a market data update.
+        
+        Args:
+            data: Quote with symbol, bid, ask and timestamp (and optionally volume)
+            
+        Returns:
+            Order dict if strategy generates an order, None otherwise
+        """
+        pass
+    
+    @abstractmethod
+    def on_fill(self, fill: Dict[str, Any]) -> None:
+        """Handle order fill notification.
+        
+        Args:
+            fill: Fill event with execution details
+        """
+        pass
+    
+    @abstractmethod
+    def get_state(self) -> Dict[str, Any]:
+        """Return strategy state for monitoring."""
+        pass
@@ -1,9 +1,23 @@
 """CSV feed parser with configurable schema."""
 
+import numpy as np
 import pandas as pd
-from typing import Iterator, Dict, Optional, Callable
+from typing import Iterator, Dict, List, Optional, Callable, Tuple
 from datetime import datetime
-from .tick_events import TickEvent, EventType, Side
+from .tick_events import (TickEvent, TickEventBatch, EventType, Side,
+                          SIDE_CODES, EVENT_TYPE_CODES, intern)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Multipliers converting integer timestamps of a given unit to nanoseconds
+_NS_PER_UNIT = {'s': 1_000_000_000, 'ms': 1_000_000, 'us': 1_000, 'ns': 1}
 
 
 class CSVFeedConfig:
@@ -22,7 +36,8 @@ class CSVFeedConfig:
                  quantity_scale: float = 1.0,
                  side_map: Optional[Dict[str, Side]] = None,
                  event_type_map: Optional[Dict[str, EventType]] = None,
-                 venue: str = 'CSV'):
+                 venue: str = 'CSV',
+                 csv_backend: str = 'auto'):
         """Initialize CSV feed configuration.
         
         Args:
@@ -39,6 +54,9 @@ class CSVFeedConfig:
             side_map: Dict mapping string values to Side enum
             event_type_map: Dict mapping string values to EventType enum
             venue: Venue name
+            csv_backend: CSV reader to use ('auto', 'pyarrow' or 'pandas').
+                'auto' picks the multithreaded pyarrow reader when installed
+                and falls back to pandas otherwise.
         """
         self.timestamp_col = timestamp_col
         self.symbol_col = symbol_col
@@ -52,6 +70,10 @@ class CSVFeedConfig:
         self.quantity_scale = quantity_scale
         self.venue = venue
         
+        if csv_backend not in ('auto', 'pyarrow', 'pandas'):
+            raise ValueError(f"Unknown csv_backend: {csv_backend}")
+        self.csv_backend = csv_backend
+        
         # Default side mapping
         if side_map is None:
             self.side_map = {
@@ -88,6 +110,7 @@ class CSVFeed:
         """
         self.file_path = file_path
         self.config = config
+        self._converter = ArrowTickConverter(config)
         
     def parse(self, chunk_size: int = 10000, 
               filter_symbol: Optional[str] = None) -> Iterator[TickEvent]:
@@ -100,63 +123,373 @@ class CSVFeed:
         Yields:
             TickEvent objects
         """
+        for batch in self.parse_batched(chunk_size, filter_symbol):
+            yield from batch.to_events()
+
+    def parse_batched(self, chunk_size: int = 10000,
+                      filter_symbol: Optional[str] = None) -> Iterator[TickEventBatch]:
+        """Parse CSV file into columnar TickEventBatches.
+        
+        Args:
+            chunk_size: Maximum number of rows per batch
+            filter_symbol: Only return events for this symbol (optional)
+            
+        Yields:
+            TickEventBatch objects sharing this feed's symbol/venue tables
+        """
+        if self._use_pyarrow():
+            yield from self._parse_pyarrow(chunk_size, filter_symbol)
+            return
+
         for chunk in pd.read_csv(self.file_path, chunksize=chunk_size):
             # Filter by symbol if specified
             if filter_symbol:
                 chunk = chunk[chunk[self.config.symbol_col] == filter_symbol]
             
-            for _, row in chunk.iterrows():
+            batch = self._convert_chunk(chunk)
+            if len(batch):
+                yield batch
+
+    @property
+    def symbols(self) -> List[Optional[str]]:
+        """Instrument table indexed by TickEventBatch.instrument_id_idx."""
+        return self._converter.symbols
+
+    @property
+    def venues(self) -> List[Optional[str]]:
+        """Venue table indexed by TickEventBatch.venue_idx."""
+        return self._converter.venues
+
+    def symbol(self, idx: int) -> Optional[str]:
+        """Return the symbol for an instrument_id_idx code."""
+        return self._converter.symbols[idx]
+
+    def intern(self, symbol: str) -> int:
+        """Return the instrument_id_idx code for ``symbol``, adding it if unseen."""
+        return self._converter.intern_symbol(symbol)
+
+    def _use_pyarrow(self) -> bool:
+        """Resolve the configured CSV backend."""
+        backend = self.config.csv_backend
+        if backend == 'pyarrow' and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for csv_backend='pyarrow'")
+        return backend == 'pyarrow' or (backend == 'auto' and PYARROW_AVAILABLE)
+
+    def _parse_pyarrow(self, chunk_size: int,
+                       filter_symbol: Optional[str]) -> Iterator[TickEventBatch]:
+        """Parse the CSV with pyarrow's streaming reader.
+
+        The file is tokenized by Arrow's multithreaded C++ reader (GIL
+        released) and only the mapped columns are decoded into batches.
+        """
+        cfg = self.config
+        columns = [cfg.timestamp_col, cfg.symbol_col, cfg.price_col,
+                   cfg.quantity_col, cfg.side_col]
+        if cfg.event_type_col:
+            columns.append(cfg.event_type_col)
+
+        # Every mapped column is read as text: categorical columns so the
+        # side/event maps see the same text pandas would have produced, and
+        # numeric ones so a malformed value later in the file cannot abort
+        # the reader's type inference. The converter parses them per batch
+        # and drops rows that do not parse, like the pandas path.
+        column_types = {column: pa.string() for column in columns}
+        # Symbol, side and event type repeat a handful of values: the reader
+        # dictionary-encodes them while parsing, so each distinct string is
+        # stored and mapped once per batch
+        categorical = pa.dictionary(pa.int32(), pa.string())
+        for column in (cfg.symbol_col, cfg.side_col, cfg.event_type_col):
+            if column:
+                column_types[column] = categorical
+
+        reader = pa_csv.open_csv(
+            self.file_path,
+            read_options=pa_csv.ReadOptions(use_threads=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types,
+                include_columns=columns,
+                include_missing_columns=True
+            )
+        )
+
+        for batch in reader:
+            # Rows without a timestamp cannot be placed on the timeline
+            batch = batch.filter(pc.is_valid(batch.column(cfg.timestamp_col)))
+            if filter_symbol:
+                batch = batch.filter(pc.equal(batch.column(cfg.symbol_col), filter_symbol))
+
+            for offset in range(0, batch.num_rows, chunk_size):
+                converted = self._converter.convert(batch.slice(offset, chunk_size))
+                if len(converted):
+                    yield converted
+
+    def _convert_chunk(self, chunk: pd.DataFrame) -> TickEventBatch:
+        """Convert a pandas CSV chunk column by column.
+        
+        Rows whose timestamp, price or quantity cannot be parsed are
+        dropped; missing prices and quantities become NaN.
+        """
+        cfg = self.config
+        timestamps, bad = self._timestamps_from_series(chunk[cfg.timestamp_col])
+        prices, bad_prices = _series_to_float64(chunk[cfg.price_col])
+        quantities, bad_quantities = _series_to_float64(chunk[cfg.quantity_col])
+        keep = ~(bad | bad_prices | bad_quantities)
+        if not keep.all():
+            chunk = chunk[keep]
+            timestamps, prices, quantities = timestamps[keep], prices[keep], quantities[keep]
+        
+        num_rows = len(chunk)
+        prices *= cfg.price_scale
+        quantities *= cfg.quantity_scale
+        
+        sides = _map_series(chunk[cfg.side_col], cfg.side_map, Side.BUY, SIDE_CODES)
+        if cfg.event_type_col and cfg.event_type_col in chunk.columns:
+            event_types = _map_series(chunk[cfg.event_type_col], cfg.event_type_map,
+                                      EventType.TRADE, EVENT_TYPE_CODES)
+        else:
+            event_types = np.full(num_rows, EVENT_TYPE_CODES[EventType.TRADE], dtype=np.int8)
+        
+        converter = self._converter
+        codes, uniques = pd.factorize(chunk[cfg.symbol_col], use_na_sentinel=False)
+        lookup = [converter.intern_symbol(str(value)) for value in uniques]
+        venue = intern(cfg.venue, converter.venue_index, converter.venues)
+        
+        return TickEventBatch(
+            timestamp_ns=timestamps,
+            price=prices,
+            quantity=quantities,
+            side=sides,
+            event_type=event_types,
+            instrument_id_idx=np.asarray(lookup, dtype=np.int32)[codes],
+            venue_idx=np.full(num_rows, venue, dtype=np.int32),
+            symbols=converter.symbols,
+            venues=converter.venues
+        )
+    
+    def _timestamps_from_series(self, column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert a pandas timestamp column to int64 nanoseconds.
+        
+        Returns:
+            (timestamps, invalid) where ``invalid`` flags rows whose
+            timestamp is missing or unparseable
+        """
+        num_rows = len(column)
+        if self.config.timestamp_format and not pd.api.types.is_numeric_dtype(column.dtype):
+            fmt = self.config.timestamp_format
+            out = np.zeros(num_rows, dtype=np.int64)
+            invalid = np.zeros(num_rows, dtype=bool)
+            for i, value in enumerate(column.tolist()):
                 try:
-                    yield self._row_to_tick_event(row)
-                except Exception as e:
-                    # Skip malformed rows
-                    continue
+                    out[i] = int(datetime.strptime(value, fmt).timestamp() * 1e9)
+                except (TypeError, ValueError):
+                    invalid[i] = True
+            return out, invalid
+        
+        factor = _NS_PER_UNIT.get(self.config.timestamp_unit, 1)
+        if pd.api.types.is_integer_dtype(column.dtype):
+            return column.to_numpy(dtype=np.int64) * factor, np.zeros(num_rows, dtype=bool)
+        
+        values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64)
+        invalid = np.isnan(values)
+        return (np.where(invalid, 0.0, values) * float(factor)).astype(np.int64), invalid
+
+
+class ArrowTickConverter:
+    """Convert Arrow record batches laid out per a CSVFeedConfig into TickEventBatches.
     
-    def _row_to_tick_event(self, row: pd.Series) -> TickEvent:
-        """Convert CSV row to TickEvent."""
-        # Parse timestamp
-        timestamp_ns = self._parse_timestamp(row[self.config.timestamp_col])
-        
-        # Parse price and quantity with scaling
-        price = float(row[self.config.price_col]) * self.config.price_scale
-        quantity = float(row[self.config.quantity_col]) * self.config.quantity_scale
-        
-        # Parse side
-        side_value = str(row[self.config.side_col])
-        side = self.config.side_map.get(side_value, Side.BUY)
-        
-        # Parse event type if available
-        if self.config.event_type_col and self.config.event_type_col in row.index:
-            event_type_value = str(row[self.config.event_type_col])
-            event_type = self.config.event_type_map.get(event_type_value, EventType.TRADE)
+    Symbols and venues are interned into tables shared by every batch the
+    converter produces, so a feed's batches can be compared by index.
+    """
+    
+    def __init__(self, config: CSVFeedConfig, timestamp_unit: Optional[str] = None):
+        """Initialize converter.
+        
+        Args:
+            config: Column mapping and scaling configuration
+            timestamp_unit: Override for config.timestamp_unit
+        """
+        self.config = config
+        self.timestamp_unit = timestamp_unit or config.timestamp_unit
+        self.symbols: List[Optional[str]] = []
+        self.venues: List[Optional[str]] = []
+        self.symbol_index: Dict[Optional[str], int] = {}
+        self.venue_index: Dict[Optional[str], int] = {}
+    
+    def intern_symbol(self, symbol: Optional[str]) -> int:
+        """Return the code of ``symbol`` in the shared symbol table."""
+        return intern(symbol, self.symbol_index, self.symbols)
+    
+    def convert(self, batch: 'pa.RecordBatch',
+                venue_col: Optional[str] = None) -> TickEventBatch:
+        """Convert one record batch.
+        
+        Rows whose timestamp, price or quantity cannot be parsed are
+        dropped, matching the row-by-row parsers which skip malformed rows.
+        Missing prices and quantities become NaN; missing timestamps are
+        dropped.
+        
+        Args:
+            batch: Record batch containing the configured columns
+            venue_col: Optional column holding per-row venues
+            
+        Returns:
+            TickEventBatch with one row per well-formed record
+        """
+        cfg = self.config
+        
+        timestamps, bad = self._timestamps_to_ns(batch.column(cfg.timestamp_col))
+        prices, bad_prices = _to_float64(batch.column(cfg.price_col))
+        quantities, bad_quantities = _to_float64(batch.column(cfg.quantity_col))
+        for mask in (bad_prices, bad_quantities):
+            if mask is not None:
+                bad = mask if bad is None else bad | mask
+        if bad is not None and bad.any():
+            keep = ~bad
+            batch = batch.filter(pa.array(keep))
+            timestamps, prices, quantities = timestamps[keep], prices[keep], quantities[keep]
+        
+        num_rows = batch.num_rows
+        prices *= cfg.price_scale
+        quantities *= cfg.quantity_scale
+        
+        sides = _map_column(batch.column(cfg.side_col), cfg.side_map, Side.BUY, SIDE_CODES)
+        if cfg.event_type_col and cfg.event_type_col in batch.schema.names:
+            event_types = _map_column(batch.column(cfg.event_type_col), cfg.event_type_map,
+                                      EventType.TRADE, EVENT_TYPE_CODES)
+        else:
+            event_types = np.full(num_rows, EVENT_TYPE_CODES[EventType.TRADE], dtype=np.int8)
+        
+        if venue_col and venue_col in batch.schema.names:
+            venue_idx = self._encode(batch.column(venue_col), self.venue_index,
+                                     self.venues, cfg.venue)
         else:
-            event_type = EventType.TRADE  # Default to TRADE
-        
-        return TickEvent(
-            timestamp_ns=timestamp_ns,
-            instrument_id=str(row[self.config.symbol_col]),
-            event_type=event_type,
-            price=price,
-            quantity=quantity,
-            side=side,
-            venue=self.config.venue
+            venue_idx = np.full(num_rows, intern(cfg.venue, self.venue_index, self.venues),
+                                dtype=np.int32)
+        
+        return TickEventBatch(
+            timestamp_ns=timestamps,
+            price=prices,
+            quantity=quantities,
+            side=sides,
+            event_type=event_types,
+            instrument_id_idx=self._encode(batch.column(cfg.symbol_col),
+                                           self.symbol_index, self.symbols, None),
+            venue_idx=venue_idx,
+            symbols=self.symbols,
+            venues=self.venues
         )
     
-    def _parse_timestamp(self, timestamp_value) -> int:
-        """Parse timestamp to nanoseconds."""
-        if isinstance(timestamp_value, str) and self.config.timestamp_format:
-            # Parse string timestamp
-            dt = datetime.strptime(timestamp_value, self.config.timestamp_format)
-            return int(dt.timestamp() * 1e9)
-        else:
-            # Numeric timestamp - convert to nanoseconds
-            ts_float = float(timestamp_value)
-            
-            if self.config.timestamp_unit == 's':
-                return int(ts_float * 1e9)
-            elif self.config.timestamp_unit == 'ms':
-                return int(ts_float * 1e6)
-            elif self.config.timestamp_unit == 'us':
-                return int(ts_float * 1e3)
-            else:  # 'ns'
-                return int(ts_float)
+    def _timestamps_to_ns(self, column: 'pa.Array') -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Convert a timestamp column to int64 nanoseconds.
+        
+        Returns:
+            (timestamps, invalid) where ``invalid`` flags rows whose
+            timestamp is missing or unparseable (None if every row parsed)
+        """
+        num_rows = len(column)
+        if self.config.timestamp_format:
+            fmt = self.config.timestamp_format
+            out = np.zeros(num_rows, dtype=np.int64)
+            invalid = np.zeros(num_rows, dtype=bool)
+            for i, value in enumerate(column.to_pylist()):
+                try:
+                    out[i] = int(datetime.strptime(value, fmt).timestamp() * 1e9)
+                except (TypeError, ValueError):
+                    invalid[i] = True
+            return out, invalid
+        
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            # Text read from CSV: integers exactly, then any other numeric
+            # text. Datetime strings need timestamp_format, as on the pandas
+            # path, and are flagged unparseable below.
+            try:
+                column = pc.cast(column, pa.int64())
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+        
+        invalid = column.is_null().to_numpy(zero_copy_only=False) if column.null_count else None
+        if pa.types.is_timestamp(column.type):
+            return column.cast(pa.timestamp('ns')).cast(pa.int64()).fill_null(0).to_numpy(), invalid
+        
+        factor = _NS_PER_UNIT.get(self.timestamp_unit, 1)
+        if pa.types.is_integer(column.type):
+            return column.fill_null(0).to_numpy().astype(np.int64) * factor, invalid
+        
+        values, invalid = _to_float64(column)
+        missing = np.isnan(values)
+        if missing.any():
+            invalid = missing
+            values = np.where(missing, 0.0, values)
+        return (values * float(factor)).astype(np.int64), invalid
+    
+    @staticmethod
+    def _encode(column: 'pa.Array', index: Dict, table: List,
+                null_value: Optional[str]) -> np.ndarray:
+        """Dictionary-encode a string column against a shared table.
+        
+        Columns that are already Arrow dictionaries (e.g. read from Parquet
+        dictionary pages) are used as-is; only their distinct values are
+        interned.
+        """
+        encoded = column.dictionary_encode()
+        lookup = [intern(value if value is not None else null_value, index, table)
+                  for value in encoded.dictionary.to_pylist()]
+        indices = encoded.indices
+        if indices.null_count:
+            lookup.append(intern(null_value, index, table))
+            indices = indices.fill_null(len(lookup) - 1)
+        return np.asarray(lookup, dtype=np.int32)[indices.to_numpy()]
+
+
+def _to_float64(column: 'pa.Array') -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Convert a numeric or text column to float64, NaN where missing.
+    
+    Returns:
+        (values, invalid) where ``invalid`` flags non-missing text that is
+        not a number (None if there is none)
+    """
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        try:
+            column = pc.cast(column, pa.float64())
+        except pa.ArrowInvalid:
+            values = pd.to_numeric(column.to_numpy(zero_copy_only=False), errors='coerce')
+            values = np.asarray(values, dtype=np.float64)
+            # Blank text counts as missing (NaN), like pandas' CSV reader
+            present = pc.fill_null(pc.not_equal(pc.utf8_trim_whitespace(column), ''), False)
+            return values, np.isnan(values) & present.to_numpy(zero_copy_only=False)
+    return column.cast(pa.float64()).to_numpy(zero_copy_only=False).astype(np.float64), None
+
+
+def _map_column(column: 'pa.Array', mapping: Dict, default, codes: Dict) -> np.ndarray:
+    """Map a string column through ``mapping`` to int8 enum codes.
+
+    The column is dictionary-encoded so the mapping is looked up only for
+    the handful of distinct values (e.g. BUY/SELL) rather than per row.
+    """
+    encoded = column.dictionary_encode()
+    lookup = [codes[mapping.get(value, default)] for value in encoded.dictionary.to_pylist()]
+    lookup.append(codes[default])  # Null entries
+    indices = encoded.indices.fill_null(len(lookup) - 1).to_numpy()
+    return np.asarray(lookup, dtype=np.int8)[indices]
+
+
+def _series_to_float64(column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert a pandas column to float64, NaN where missing.
+    
+    Returns:
+        (values, invalid) where ``invalid`` flags present values that are
+        not numbers
+    """
+    values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64, copy=True)
+    return values, np.isnan(values) & column.notna().to_numpy()
+
+
+def _map_series(column: pd.Series, mapping: Dict, default, codes: Dict) -> np.ndarray:
+    """Map a pandas column through ``mapping`` to int8 enum codes.
+
+    Like _map_column, the mapping is looked up once per distinct value
+    (as text, so missing values map like the string 'nan').
+    """
+    indices, uniques = pd.factorize(column, use_na_sentinel=False)
+    lookup = [codes[mapping.get(str(value), default)] for value in uniques]
+    return np.asarray(lookup, dtype=np.int8)[indices]
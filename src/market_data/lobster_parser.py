@@ -1,9 +1,24 @@
 """LOBSTER format parser for order book data."""
 
-import pandas as pd
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
 import numpy as np
-from typing import Iterator, Optional, Tuple
-from .tick_events import TickEvent, EventType, Side
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from .tick_events import (TickEvent, TickEventBatch, EventType, Side,
+                          SIDE_CODES, EVENT_TYPE_CODES)
+
+
+def _lookup_table(mapping: Dict[int, int], default: int) -> np.ndarray:
+    """Build a 256-entry int8 table mapping raw int8 field values to codes."""
+    table = np.full(256, default, dtype=np.int8)
+    for value, code in mapping.items():
+        table[np.uint8(np.int8(value))] = code
+    return table
 
 
 class LobsterMessageParser:
@@ -26,17 +41,43 @@ class LobsterMessageParser:
         5: EventType.TRADE
     }
     
-    def __init__(self, message_file: str, symbol: str, date_str: str = None):
+    # Column names and dtypes of the message file
+    COLUMNS = ['time', 'event_type', 'order_id', 'size', 'price', 'direction']
+    COLUMN_TYPES = {
+        'time': pa.float64(),
+        'event_type': pa.int8(),
+        'order_id': pa.int64(),
+        'size': pa.int32(),
+        'price': pa.int64(),
+        'direction': pa.int8()
+    }
+    
+    # Bytes mapped and parsed per round; bounds resident memory on large files
+    BLOCK_SIZE = 64 * 1024 * 1024
+    
+    # Code tables indexed by the raw int8 field viewed as uint8, so decoding
+    # a chunk is one gather per column (unknown event types read as limits)
+    EVENT_TYPE_LOOKUP = _lookup_table({code: EVENT_TYPE_CODES[event_type]
+                                       for code, event_type in EVENT_TYPE_MAP.items()},
+                                      EVENT_TYPE_CODES[EventType.NEW_LIMIT])
+    DIRECTION_LOOKUP = _lookup_table({1: SIDE_CODES[Side.BUY]}, SIDE_CODES[Side.SELL])
+    
+    def __init__(self, message_file: str, symbol: str, date_str: str = None,
+                 num_workers: Optional[int] = None):
         """Initialize LOBSTER message parser.
         
         Args:
             message_file: Path to LOBSTER message file
             symbol: Instrument symbol
             date_str: Date string in format YYYY-MM-DD (used for timestamp calculation)
+            num_workers: Number of parser threads (defaults to os.cpu_count())
         """
         self.message_file = message_file
         self.symbol = symbol
         self.date_str = date_str
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self._symbols = [symbol]
+        self._venues = ['LOBSTER']
         
     def parse(self, chunk_size: int = 10000) -> Iterator[TickEvent]:
         """Parse LOBSTER messages into TickEvents.
@@ -47,39 +88,107 @@ class LobsterMessageParser:
         Yields:
             TickEvent objects
         """
-        # Column names for LOBSTER message file
-        columns = ['time', 'event_type', 'order_id', 'size', 'price', 'direction']
+        for batch in self.parse_batched(chunk_size):
+            yield from batch.to_events()
+    
+    def parse_batched(self, chunk_size: int = 10000) -> Iterator[TickEventBatch]:
+        """Parse LOBSTER messages into columnar TickEventBatches.
         
-        for chunk in pd.read_csv(self.message_file, names=columns, chunksize=chunk_size):
-            for _, row in chunk.iterrows():
-                yield self._row_to_tick_event(row)
+        Args:
+            chunk_size: Maximum number of rows per batch
+            
+        Yields:
+            TickEventBatch objects with external_order_id populated
+        """
+        for columns in self.iter_columns():
+            batch = self._columns_to_batch(columns)
+            for offset in range(0, len(batch), chunk_size):
+                yield batch.slice(offset, offset + chunk_size)
     
-    def _row_to_tick_event(self, row: pd.Series) -> TickEvent:
-        """Convert LOBSTER message row to TickEvent."""
-        # Convert seconds from midnight to nanoseconds
-        timestamp_ns = int(row['time'] * 1e9)
+    def symbol(self, idx: int) -> str:
+        """Return the symbol for an instrument_id_idx code."""
+        return self._symbols[idx]
+    
+    def iter_columns(self) -> Iterator[Dict[str, np.ndarray]]:
+        """Parse the message file into typed numpy columns.
         
-        # Map event type
-        event_type = self.EVENT_TYPE_MAP.get(row['event_type'], EventType.NEW_LIMIT)
+        The file is memory-mapped and split into newline-aligned chunks which
+        are parsed concurrently by Arrow's CSV reader (the GIL is released
+        while parsing). Chunks are yielded in file order, one dict of six
+        arrays per chunk.
         
-        # Convert price from dollars * 10000 to dollars
-        price = row['price'] / 10000.0
+        Yields:
+            Dict mapping column name to np.ndarray (time float64, event_type
+            int8, order_id int64, size int32, price int64, direction int8)
+        """
+        if os.path.getsize(self.message_file) == 0:
+            return
         
-        # Map direction to side
-        side = Side.BUY if row['direction'] == 1 else Side.SELL
+        with open(self.message_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            block_start = 0
+            while block_start < len(mm):
+                block_end = _next_line_start(mm, block_start + self.BLOCK_SIZE)
+                ranges = _split_lines(mm, block_start, block_end, self.num_workers)
+                for columns in executor.map(lambda r: self._parse_range(mm, *r), ranges):
+                    if len(columns['time']):
+                        yield columns
+                block_start = block_end
+    
+    def _parse_range(self, mm: mmap.mmap, start: int, end: int) -> Dict[str, np.ndarray]:
+        """Parse the byte range [start, end) of the mapped file."""
+        view = memoryview(mm)[start:end]
+        try:
+            table = pa_csv.read_csv(
+                pa.BufferReader(pa.py_buffer(view)),
+                read_options=pa_csv.ReadOptions(column_names=self.COLUMNS,
+                                                use_threads=False),
+                convert_options=pa_csv.ConvertOptions(column_types=self.COLUMN_TYPES)
+            )
+        finally:
+            view.release()
+        return {name: table.column(name).to_numpy() for name in self.COLUMNS}
+    
+    def _columns_to_batch(self, columns: Dict[str, np.ndarray]) -> TickEventBatch:
+        """Build a TickEventBatch from a chunk of parsed columns."""
+        num_rows = len(columns['time'])
         
-        return TickEvent(
-            timestamp_ns=timestamp_ns,
-            instrument_id=self.symbol,
-            event_type=event_type,
-            price=price,
-            quantity=float(row['size']),
-            side=side,
-            external_order_id=str(int(row['order_id'])),
-            venue='LOBSTER'
+        return TickEventBatch(
+            # Convert seconds from midnight to nanoseconds
+            timestamp_ns=(columns['time'] * 1e9).astype(np.int64),
+            # Convert price from dollars * 10000 to dollars
+            price=columns['price'] / 10000.0,
+            quantity=columns['size'].astype(np.float64),
+            side=self.DIRECTION_LOOKUP[columns['direction'].view(np.uint8)],
+            event_type=self.EVENT_TYPE_LOOKUP[columns['event_type'].view(np.uint8)],
+            instrument_id_idx=np.zeros(num_rows, dtype=np.int32),
+            venue_idx=np.zeros(num_rows, dtype=np.int32),
+            symbols=self._symbols,
+            venues=self._venues,
+            external_order_id=columns['order_id']
         )
 
 
+def _next_line_start(mm: mmap.mmap, pos: int) -> int:
+    """Return the offset just past the first newline at or after ``pos``."""
+    if pos >= len(mm):
+        return len(mm)
+    newline = mm.find(b'\n', pos)
+    return len(mm) if newline == -1 else newline + 1
+
+
+def _split_lines(mm: mmap.mmap, start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    """Split [start, end) into up to ``parts`` ranges aligned to line starts."""
+    step = max((end - start) // parts, 1)
+    ranges = []
+    while start < end:
+        stop = min(_next_line_start(mm, start + step), end)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
 class LobsterOrderbookParser:
     """Parse LOBSTER orderbook snapshot files.
     
@@ -2,10 +2,12 @@
 
 import pyarrow.parquet as pq
 import pyarrow as pa
+import pyarrow.dataset as ds
 import pandas as pd
+from functools import cached_property
 from typing import Iterator, Optional, List
-from .tick_events import TickEvent, EventType, Side
-from .csv_feed import CSVFeedConfig
+from .tick_events import TickEvent, TickEventBatch
+from .csv_feed import ArrowTickConverter, CSVFeedConfig
 
 
 class ParquetFeed:
@@ -30,7 +32,15 @@ class ParquetFeed:
         """
         self.file_path = file_path
         self.config = config or CSVFeedConfig()  # Use default if not provided
-        self.parquet_file = pq.ParquetFile(file_path)
+        # String columns are read as Arrow dictionaries straight from the
+        # Parquet dictionary pages, so their values are never decoded per row
+        dictionary_columns = [self.config.symbol_col, self.config.side_col, 'venue']
+        if self.config.event_type_col:
+            dictionary_columns.append(self.config.event_type_col)
+        self.dataset = ds.dataset(file_path, format=ds.ParquetFileFormat(
+            read_options=ds.ParquetReadOptions(dictionary_columns=dictionary_columns)))
+        # Timestamps are stored in nanoseconds already
+        self._converter = ArrowTickConverter(self.config, timestamp_unit='ns')
         
     def parse(self,
               batch_size: int = 10000,
@@ -48,70 +58,83 @@ class ParquetFeed:
         Yields:
             TickEvent objects
         """
-        # Build filter expression for predicate pushdown
-        filters = []
-        
-        if filter_symbol:
-            filters.append((self.config.symbol_col, '=', filter_symbol))
-        
-        if start_time_ns is not None:
-            filters.append((self.config.timestamp_col, '>=', start_time_ns))
-        
-        if end_time_ns is not None:
-            filters.append((self.config.timestamp_col, '<', end_time_ns))
+        for batch in self.parse_batched(batch_size, filter_symbol,
+                                        start_time_ns, end_time_ns):
+            yield from batch.to_events()
+    
+    def parse_batched(self,
+                      batch_size: int = 10000,
+                      filter_symbol: Optional[str] = None,
+                      start_time_ns: Optional[int] = None,
+                      end_time_ns: Optional[int] = None) -> Iterator[TickEventBatch]:
+        """Parse Parquet file into columnar TickEventBatches.
         
-        # Read in batches
-        for batch in self.parquet_file.iter_batches(batch_size=batch_size):
-            df = batch.to_pandas()
-            
-            # Apply filters if predicate pushdown not supported
-            if filter_symbol and self.config.symbol_col in df.columns:
-                df = df[df[self.config.symbol_col] == filter_symbol]
-            
-            if start_time_ns is not None and self.config.timestamp_col in df.columns:
-                df = df[df[self.config.timestamp_col] >= start_time_ns]
-            
-            if end_time_ns is not None and self.config.timestamp_col in df.columns:
-                df = df[df[self.config.timestamp_col] < end_time_ns]
+        Args:
+            batch_size: Number of rows to read per batch
+            filter_symbol: Only return events for this symbol
+            start_time_ns: Start timestamp in nanoseconds (inclusive)
+            end_time_ns: End timestamp in nanoseconds (exclusive)
             
-            for _, row in df.iterrows():
-                try:
-                    yield self._row_to_tick_event(row)
-                except Exception as e:
-                    continue
-    
-    def _row_to_tick_event(self, row: pd.Series) -> TickEvent:
-        """Convert Parquet row to TickEvent."""
-        # Get timestamp (already in nanoseconds)
-        timestamp_ns = int(row[self.config.timestamp_col])
+        Yields:
+            TickEventBatch objects sharing this feed's symbol/venue tables
+        """
+        names = self.dataset.schema.names
+        symbol_col = self.config.symbol_col
+        timestamp_col = self.config.timestamp_col
         
-        # Parse price and quantity
-        price = float(row[self.config.price_col]) * self.config.price_scale
-        quantity = float(row[self.config.quantity_col]) * self.config.quantity_scale
+        # Filters are pushed down to the scanner, which skips row groups whose
+        # min/max statistics cannot match before decompressing them
+        conditions = []
+        if filter_symbol and symbol_col in names:
+            conditions.append(ds.field(symbol_col) == filter_symbol)
+        if start_time_ns is not None and timestamp_col in names:
+            conditions.append(ds.field(timestamp_col) >= start_time_ns)
+        if end_time_ns is not None and timestamp_col in names:
+            conditions.append(ds.field(timestamp_col) < end_time_ns)
         
-        # Parse side
-        side_value = str(row[self.config.side_col])
-        side = self.config.side_map.get(side_value, Side.BUY)
+        expr = None
+        for condition in conditions:
+            expr = condition if expr is None else expr & condition
         
-        # Parse event type if available
-        if self.config.event_type_col and self.config.event_type_col in row.index:
-            event_type_value = str(row[self.config.event_type_col])
-            event_type = self.config.event_type_map.get(event_type_value, EventType.TRADE)
-        else:
-            event_type = EventType.TRADE
+        # Only decode the columns that end up in a TickEventBatch
+        wanted = [self.config.timestamp_col, symbol_col, self.config.side_col,
+                  self.config.price_col, self.config.quantity_col,
+                  self.config.event_type_col, 'venue']
+        columns = [name for name in dict.fromkeys(wanted) if name in names]
         
-        # Get venue if available
-        venue = row.get('venue', self.config.venue) if 'venue' in row.index else self.config.venue
+        scanner = self.dataset.scanner(columns=columns, filter=expr, batch_size=batch_size)
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                converted = self._converter.convert(batch, venue_col='venue')
+                if len(converted):  # Every row may have been malformed
+                    yield converted
+    
+    @cached_property
+    def parquet_file(self) -> pq.ParquetFile:
+        """Low-level file handle (metadata, row groups), opened on first access.
         
-        return TickEvent(
-            timestamp_ns=timestamp_ns,
-            instrument_id=str(row[self.config.symbol_col]),
-            event_type=event_type,
-            price=price,
-            quantity=quantity,
-            side=side,
-            venue=venue
-        )
+        Reads go through ``self.dataset``; this is kept for callers that
+        inspect the file directly.
+        """
+        return pq.ParquetFile(self.file_path)
+    
+    @property
+    def symbols(self) -> List[Optional[str]]:
+        """Instrument table indexed by TickEventBatch.instrument_id_idx."""
+        return self._converter.symbols
+    
+    @property
+    def venues(self) -> List[Optional[str]]:
+        """Venue table indexed by TickEventBatch.venue_idx."""
+        return self._converter.venues
+    
+    def symbol(self, idx: int) -> Optional[str]:
+        """Return the symbol for an instrument_id_idx code."""
+        return self._converter.symbols[idx]
+    
+    def intern(self, symbol: str) -> int:
+        """Return the instrument_id_idx code for ``symbol``, adding it if unseen."""
+        return self._converter.intern_symbol(symbol)
     
     @staticmethod
     def write_parquet(df: pd.DataFrame, output_path: str,
@@ -123,7 +146,9 @@ class ParquetFeed:
             df: DataFrame with tick data
             output_path: Output file path
             compression: Compression codec ('snappy', 'gzip', 'brotli', 'lz4', 'zstd')
-            row_group_size: Number of rows per row group
+            row_group_size: Number of rows per row group. Row groups carry the
+                min/max statistics used to skip data in filtered reads, so
+                keep them small enough to be selective (~100K rows)
         """
         table = pa.Table.from_pandas(df)
         pq.write_table(
@@ -131,5 +156,6 @@ class ParquetFeed:
             output_path,
             compression=compression,
             row_group_size=row_group_size,
-            use_dictionary=True
+            use_dictionary=True,
+            write_statistics=True
         )
@@ -1,8 +1,19 @@
 """Tick event classes for normalized market data representation."""
 
+import json
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ..utils.slots import slotted
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class EventType(Enum):
@@ -23,6 +34,14 @@ class Side(Enum):
     ASK = "ASK"
 
 
+# Integer codes used by the side/event_type columns of TickEventBatch
+SIDES = tuple(Side)
+EVENT_TYPES = tuple(EventType)
+SIDE_CODES = {side: code for code, side in enumerate(SIDES)}
+EVENT_TYPE_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+
+
+@slotted
 @dataclass
 class TickEvent:
     """Normalized tick event for the backtesting engine."""
@@ -47,3 +66,148 @@ class TickEvent:
             'external_order_id': self.external_order_id,
             'venue': self.venue
         }
+
+
+@slotted
+@dataclass
+class TickEventBatch:
+    """Columnar (structure-of-arrays) block of tick events.
+    
+    Every field is a parallel array so downstream aggregations can run as
+    numpy operations. String columns are dictionary-encoded: the index
+    columns point into ``symbols``/``venues`` tables shared by all batches
+    of one feed, and side/event_type hold codes into SIDES/EVENT_TYPES.
+    """
+    timestamp_ns: np.ndarray  # int64 nanosecond timestamps
+    price: np.ndarray  # float64
+    quantity: np.ndarray  # float64
+    side: np.ndarray  # int8 codes into SIDES
+    event_type: np.ndarray  # int8 codes into EVENT_TYPES
+    instrument_id_idx: np.ndarray  # int32 indices into symbols
+    venue_idx: np.ndarray  # int32 indices into venues
+    symbols: List[Optional[str]]  # Instrument table
+    venues: List[Optional[str]]  # Venue table
+    external_order_id: Optional[np.ndarray] = None  # int64 order IDs (if applicable)
+    
+    def __len__(self) -> int:
+        return len(self.timestamp_ns)
+    
+    def as_event(self, i: int) -> TickEvent:
+        """Materialize row ``i`` as a TickEvent."""
+        return TickEvent(
+            timestamp_ns=int(self.timestamp_ns[i]),
+            instrument_id=self.symbols[self.instrument_id_idx[i]],
+            event_type=EVENT_TYPES[self.event_type[i]],
+            price=float(self.price[i]),
+            quantity=float(self.quantity[i]),
+            side=SIDES[self.side[i]],
+            external_order_id=(str(self.external_order_id[i])
+                               if self.external_order_id is not None else None),
+            venue=self.venues[self.venue_idx[i]]
+        )
+    
+    def __iter__(self) -> Iterator[TickEvent]:
+        return self.to_events()
+    
+    def to_events(self) -> Iterator[TickEvent]:
+        """Lazily materialize every row as a TickEvent."""
+        symbols, venues = self.symbols, self.venues
+        if self.external_order_id is not None:
+            order_ids = [str(order_id) for order_id in self.external_order_id.tolist()]
+        else:
+            order_ids = [None] * len(self)
+        
+        for ts, symbol_idx, event_code, price, quantity, side_code, order_id, venue_idx in zip(
+                self.timestamp_ns.tolist(), self.instrument_id_idx.tolist(),
+                self.event_type.tolist(), self.price.tolist(), self.quantity.tolist(),
+                self.side.tolist(), order_ids, self.venue_idx.tolist()):
+            yield TickEvent(
+                timestamp_ns=ts,
+                instrument_id=symbols[symbol_idx],
+                event_type=EVENT_TYPES[event_code],
+                price=price,
+                quantity=quantity,
+                side=SIDES[side_code],
+                external_order_id=order_id,
+                venue=venues[venue_idx]
+            )
+    
+    def slice(self, start: int, stop: int) -> 'TickEventBatch':
+        """Return rows [start, stop) as a batch sharing the same tables."""
+        return TickEventBatch(
+            timestamp_ns=self.timestamp_ns[start:stop],
+            price=self.price[start:stop],
+            quantity=self.quantity[start:stop],
+            side=self.side[start:stop],
+            event_type=self.event_type[start:stop],
+            instrument_id_idx=self.instrument_id_idx[start:stop],
+            venue_idx=self.venue_idx[start:stop],
+            symbols=self.symbols,
+            venues=self.venues,
+            external_order_id=(self.external_order_id[start:stop]
+                               if self.external_order_id is not None else None)
+        )
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize the batch as one JSON object of columns.
+        
+        Columns are written as arrays alongside the symbol, venue, side and
+        event type tables their codes index into, without building a dict
+        per tick.
+        """
+        columns = {
+            'timestamp_ns': self.timestamp_ns,
+            'price': self.price,
+            'quantity': self.quantity,
+            'side': self.side,
+            'event_type': self.event_type,
+            'instrument_id_idx': self.instrument_id_idx,
+            'venue_idx': self.venue_idx,
+            'external_order_id': self.external_order_id,
+            'symbols': self.symbols,
+            'venues': self.venues,
+            'sides': [side.value for side in SIDES],
+            'event_types': [event_type.value for event_type in EVENT_TYPES]
+        }
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(columns, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps({k: v.tolist() if isinstance(v, np.ndarray) else v
+                           for k, v in columns.items()}).encode()
+    
+    @classmethod
+    def from_events(cls, events: List[TickEvent], symbols: List[Optional[str]],
+                    venues: List[Optional[str]],
+                    symbol_index: Optional[Dict[Optional[str], int]] = None,
+                    venue_index: Optional[Dict[Optional[str], int]] = None) -> 'TickEventBatch':
+        """Build a batch from TickEvents, interning strings into the given tables.
+        
+        Pass the tables' reverse indexes when available to avoid rebuilding
+        them for every batch.
+        """
+        if symbol_index is None:
+            symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        if venue_index is None:
+            venue_index = {venue: i for i, venue in enumerate(venues)}
+        return cls(
+            timestamp_ns=np.array([e.timestamp_ns for e in events], dtype=np.int64),
+            price=np.array([e.price for e in events], dtype=np.float64),
+            quantity=np.array([e.quantity for e in events], dtype=np.float64),
+            side=np.array([SIDE_CODES[e.side] for e in events], dtype=np.int8),
+            event_type=np.array([EVENT_TYPE_CODES[e.event_type] for e in events], dtype=np.int8),
+            instrument_id_idx=np.array([intern(e.instrument_id, symbol_index, symbols)
+                                        for e in events], dtype=np.int32),
+            venue_idx=np.array([intern(e.venue, venue_index, venues) for e in events],
+                               dtype=np.int32),
+            symbols=symbols,
+            venues=venues
+        )
+
+
+def intern(value: Optional[str], index: Dict[Optional[str], int],
+           table: List[Optional[str]]) -> int:
+    """Return the code of ``value`` in ``table``, appending it on first sight."""
+    code = index.get(value)
+    if code is None:
+        code = index[value] = len(table)
+        table.append(value)
+    return code
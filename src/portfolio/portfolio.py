@@ -36,6 +36,13 @@ class Portfolio:
             'datetime': event.timestamp
         })
     
+    def update_timeindex_batch(self, timestamps: List[datetime]) -> None:
+        """Record positions and holdings for several timestamps with no fills between them."""
+        positions = self.current_positions
+        holdings = self.current_holdings
+        self.all_positions.extend({**positions, 'datetime': ts} for ts in timestamps)
+        self.all_holdings.extend({**holdings, 'datetime': ts} for ts in timestamps)
+    
     def update_positions_from_fill(self, fill: FillEvent) -> None:
         """Adjust positions based on fill event."""
         fill_dir = 1 if fill.direction == 'BUY' else -1
@@ -1,6 +1,7 @@
 """Real-time trading engine for live strategy execution."""
 import asyncio
 import logging
+from collections import deque
 from typing import Optional, Dict, Any
 from datetime import datetime
 from queue import Queue, Empty
@@ -32,7 +33,17 @@ class RealtimeEngine:
         self.execution_handler = execution_handler
         self.portfolio = portfolio
         
+        # Only market ticks cross threads (feed -> event thread) through the
+        # locking queue; events derived from them are produced and consumed on
+        # the event thread, so they go through a plain deque
         self.event_queue = Queue()
+        self._local_events = deque()
+        self._handlers = {
+            'MARKET': self._handle_market_event,
+            'SIGNAL': self._handle_signal_event,
+            'ORDER': self._handle_order_event,
+            'FILL': self._handle_fill_event
+        }
         self.running = False
         self.event_thread: Optional[Thread] = None
         
@@ -84,19 +95,17 @@ class RealtimeEngine:
         """Process events from the queue (runs in separate thread)."""
         logger.info("Event processing thread started")
         
+        handlers, local_events = self._handlers, self._local_events
         while self.running:
             try:
                 # Get event from queue with timeout
                 event = self.event_queue.get(timeout=1.0)
+                handlers[event['type']](event['data'])
                 
-                if event['type'] == 'MARKET':
-                    self._handle_market_event(event['data'])
-                elif event['type'] == 'SIGNAL':
-                    self._handle_signal_event(event['data'])
-                elif event['type'] == 'ORDER':
-                    self._handle_order_event(event['data'])
-                elif event['type'] == 'FILL':
-                    self._handle_fill_event(event['data'])
+                # Drain the signals, orders and fills this tick produced
+                while local_events:
+                    event = local_events.popleft()
+                    handlers[event['type']](event['data'])
                     
             except Empty:
                 continue
@@ -120,7 +129,7 @@ class RealtimeEngine:
             
             if signals:
                 for signal in signals:
-                    self.event_queue.put({
+                    self._local_events.append({
                         'type': 'SIGNAL',
                         'data': signal
                     })
@@ -138,7 +147,7 @@ class RealtimeEngine:
             order = self._create_order_from_signal(signal)
             
             if order:
-                self.event_queue.put({
+                self._local_events.append({
                     'type': 'ORDER',
                     'data': order
                 })
@@ -157,7 +166,7 @@ class RealtimeEngine:
             fill = self.execution_handler.execute_order(order)
             
             if fill:
-                self.event_queue.put({
+                self._local_events.append({
                     'type': 'FILL',
                     'data': fill
                 })
@@ -239,5 +248,5 @@ class RealtimeEngine:
             'orders_generated': self.orders_generated,
             'ticks_per_second': self.ticks_processed / runtime if runtime > 0 else 0,
             'portfolio_value': self.portfolio.current_holdings['total'],
-            'queue_size': self.event_queue.qsize()
+            'queue_size': self.event_queue.qsize() + len(self._local_events)
         }
@@ -1,8 +1,38 @@
 """Position-based risk management implementation."""
 
 from typing import Dict, Any
+import numpy as np
+from src.interfaces.market_data_interface import MarketDataBatch
 from src.interfaces.risk_interface import IRiskManager, RiskCheckResult, RiskStatus
-from src.interfaces.strategy_interface import Signal, SignalType
+from src.interfaces.strategy_interface import Signal, SignalBatch, SignalType
+from src.utils.jit import njit
+
+
+@njit(cache=True)
+def _check_position_limits(symbols, signed_quantities, prices, positions,
+                           max_position_size, max_portfolio_exposure):
+    """Sequentially apply position-size and exposure limits to a batch.
+    
+    ``positions`` is updated in place as orders are accepted, and gross
+    exposure is tracked incrementally, so each row costs O(1).
+    """
+    accepted = np.zeros(symbols.shape[0], dtype=np.bool_)
+    gross_position = np.abs(positions).sum()
+    for i in range(symbols.shape[0]):
+        quantity = signed_quantities[i]
+        if quantity == 0.0:
+            continue
+        symbol = symbols[i]
+        current = positions[symbol]
+        new_position = current + quantity
+        if abs(new_position) > max_position_size:
+            continue
+        if gross_position * prices[i] > max_portfolio_exposure:
+            continue
+        accepted[i] = True
+        gross_position += abs(new_position) - abs(current)
+        positions[symbol] = new_position
+    return accepted
 
 
 class PositionRiskManager(IRiskManager):
@@ -47,6 +77,25 @@ class PositionRiskManager(IRiskManager):
         
         return RiskCheckResult(status=RiskStatus.APPROVED, reason="All checks passed")
     
+    def check_batch(self, signals: SignalBatch, market_data: MarketDataBatch,
+                    current_position: Dict[str, float]) -> np.ndarray:
+        """Check a batch of signals against position and exposure limits.
+        
+        Applies the same rejections as check_order (concentration only
+        warns, so it never rejects) in one compiled pass over the batch.
+        """
+        symbol_table = market_data.symbol_table
+        positions = np.zeros(len(symbol_table), dtype=np.float64)
+        for code, symbol in enumerate(symbol_table):
+            positions[code] = current_position.get(symbol, 0.0)
+        
+        # Symbols outside the batch still count towards portfolio exposure
+        others = sum(abs(p) for s, p in current_position.items() if s not in symbol_table)
+        return _check_position_limits(
+            market_data.symbols, signals.signed_quantities.astype(np.float64),
+            market_data.prices, np.append(positions, others),
+            self.max_position_size, self.max_portfolio_exposure)
+    
     def _calculate_new_position(self, signal: Signal, current_position: float) -> float:
         """Calculate new position after signal execution."""
         if signal.signal_type == SignalType.BUY:
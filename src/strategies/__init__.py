@@ -2,12 +2,19 @@
 Strategy Library
 
 Collection of real-world trading strategies for backtesting.
+
+Strategies are imported on first access, so using one does not load the
+Numba kernels of the others.
 """
 
-from .vwap_strategy import VWAPStrategy
-from .twap_strategy import TWAPStrategy
-from .mean_reversion_strategy import MeanReversionStrategy
-from .statistical_arbitrage_strategy import StatisticalArbitrageStrategy
+import importlib
+
+_STRATEGY_MODULES = {
+    'VWAPStrategy': '.vwap_strategy',
+    'TWAPStrategy': '.twap_strategy',
+    'MeanReversionStrategy': '.mean_reversion_strategy',
+    'StatisticalArbitrageStrategy': '.statistical_arbitrage_strategy'
+}
 
 __all__ = [
     'VWAPStrategy',
@@ -15,3 +22,15 @@ __all__ = [
     'MeanReversionStrategy',
     'StatisticalArbitrageStrategy'
 ]
+
+
+def __getattr__(name):
+    if name in _STRATEGY_MODULES:
+        value = getattr(importlib.import_module(_STRATEGY_MODULES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
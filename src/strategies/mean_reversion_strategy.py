@@ -9,6 +9,61 @@ from typing import Dict, Optional, List
 from collections import deque
 import numpy as np
 from src.interfaces.strategy_interface import StrategyInterface
+from src.utils.jit import njit
+
+
+@njit(cache=True)
+def _bollinger_signals(prices, start, window, num_std, position, position_size):
+    """Run the band/position state machine over a price series.
+    
+    Each window's mean and variance are recomputed in two passes, as
+    on_market_data does with np.mean/np.std. Running sums of x and x^2
+    would lose the variance to cancellation at real price levels and flip
+    band crossings. Bars before ``start`` only warm up the window.
+    
+    Returns:
+        (sides, quantities, entry_idx, position): per-bar side (+1 buy,
+        -1 sell, 0 none) and quantity for bars from ``start``, the index of
+        the last entry (-1 if none) and the final position
+    """
+    n = prices.shape[0]
+    sides = np.zeros(n - start, dtype=np.int8)
+    quantities = np.zeros(n - start, dtype=np.int64)
+    entry_idx = -1
+    for i in range(max(start, window - 1), n):
+        price = prices[i]
+        total = 0.0
+        for k in range(i - window + 1, i + 1):
+            total += prices[k]
+        sma = total / window
+        ssd = 0.0
+        for k in range(i - window + 1, i + 1):
+            dev = prices[k] - sma
+            ssd += dev * dev
+        std = np.sqrt(ssd / window)
+        upper_band = sma + num_std * std
+        lower_band = sma - num_std * std
+        
+        j = i - start
+        if price < lower_band and position == 0:
+            sides[j] = 1
+            quantities[j] = position_size
+            position = position_size
+            entry_idx = i
+        elif price > upper_band and position == 0:
+            sides[j] = -1
+            quantities[j] = position_size
+            position = -position_size
+            entry_idx = i
+        elif position > 0 and price > sma:
+            sides[j] = -1
+            quantities[j] = position
+            position = 0
+        elif position < 0 and price < sma:
+            sides[j] = 1
+            quantities[j] = -position
+            position = 0
+    return sides, quantities, entry_idx, position
 
 
 class MeanReversionStrategy(StrategyInterface):
@@ -109,6 +164,50 @@ class MeanReversionStrategy(StrategyInterface):
             
         return order
     
+    def on_batch(self, prices: np.ndarray, timestamps: np.ndarray,
+                 symbol: Optional[str] = None) -> np.ndarray:
+        """
+        Generate signals for a whole series of mid prices in one pass.
+        
+        Equivalent to feeding each price to on_market_data, but the bands
+        are evaluated by a compiled kernel. Strategy state carries over, so
+        batches and single updates can be mixed.
+        
+        Args:
+            prices: Mid prices in time order
+            timestamps: Timestamp of each price
+            symbol: Symbol to put on generated orders
+            
+        Returns:
+            Object array aligned with prices holding an order dict or None
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        history = np.array(self.price_history, dtype=np.float64)
+        series = np.concatenate((history, prices))
+        
+        sides, quantities, entry_idx, self.position = _bollinger_signals(
+            series, len(history), self.window, self.num_std,
+            self.position, self.position_size)
+        
+        if self.position == 0:
+            self.entry_price = None
+        elif entry_idx >= 0:
+            self.entry_price = float(series[entry_idx])
+        self.price_history.extend(prices[-self.window:].tolist())
+        
+        orders = np.full(len(prices), None, dtype=object)
+        for i in np.flatnonzero(sides).tolist():
+            orders[i] = {
+                'symbol': symbol,
+                'side': 'BUY' if sides[i] > 0 else 'SELL',
+                'quantity': int(quantities[i]),
+                'price': float(prices[i]),
+                'order_type': 'MARKET',
+                'strategy': 'MeanReversion',
+                'timestamp': timestamps[i]
+            }
+        return orders
+    
     def on_fill(self, fill: Dict) -> None:
         """Handle fill notification."""
         pass
@@ -9,6 +9,51 @@ from typing import Dict, Optional, Tuple
 from collections import deque
 import numpy as np
 from src.interfaces.strategy_interface import StrategyInterface
+from src.utils.jit import njit
+
+
+@njit(cache=True)
+def _pairs_signals(a_prices, b_prices, hedge_ratios, start, window,
+                   entry_threshold, exit_threshold, direction):
+    """Compute spread z-scores and entry/exit actions over paired price series.
+    
+    The spread window's mean and variance are recomputed in two passes per
+    bar, as on_market_data does, so large spreads do not lose the variance
+    to cancellation. Bars before ``start`` only warm up the window.
+    
+    Returns:
+        (actions, direction): per-bar action for bars from ``start``
+        (+1 long spread, -1 short spread, 2 exit, 0 none) and the final
+        spread direction
+    """
+    n = a_prices.shape[0]
+    spreads = a_prices - hedge_ratios * b_prices
+    actions = np.zeros(n - start, dtype=np.int8)
+    for i in range(max(start, window - 1), n):
+        spread = spreads[i]
+        total = 0.0
+        for k in range(i - window + 1, i + 1):
+            total += spreads[k]
+        mean_spread = total / window
+        ssd = 0.0
+        for k in range(i - window + 1, i + 1):
+            dev = spreads[k] - mean_spread
+            ssd += dev * dev
+        if ssd == 0.0:
+            continue
+        z_score = (spread - mean_spread) / np.sqrt(ssd / window)
+        
+        j = i - start
+        if z_score > entry_threshold and direction == 0:
+            actions[j] = -1
+            direction = -1
+        elif z_score < -entry_threshold and direction == 0:
+            actions[j] = 1
+            direction = 1
+        elif abs(z_score) < exit_threshold and direction != 0:
+            actions[j] = 2
+            direction = 0
+    return actions, direction
 
 
 class StatisticalArbitrageStrategy(StrategyInterface):
@@ -182,6 +227,71 @@ class StatisticalArbitrageStrategy(StrategyInterface):
                 
         return order
     
+    def on_batch(self, a_prices: np.ndarray, b_prices: np.ndarray,
+                 timestamps: np.ndarray,
+                 hedge_ratios: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Generate pairs signals for aligned bars of both legs in one pass.
+        
+        Each bar updates both legs at once, and z-scores are evaluated by a
+        compiled kernel. Strategy state carries over between batches.
+        
+        Args:
+            a_prices: Mid prices of symbol A
+            b_prices: Mid prices of symbol B, aligned with a_prices
+            timestamps: Timestamp of each bar
+            hedge_ratios: Per-bar hedge ratio (defaults to self.hedge_ratio)
+            
+        Returns:
+            Object array aligned with the bars holding a list of leg order
+            dicts or None
+        """
+        a_prices = np.asarray(a_prices, dtype=np.float64)
+        b_prices = np.asarray(b_prices, dtype=np.float64)
+        if hedge_ratios is None:
+            hedge_ratios = np.full(len(a_prices), self.hedge_ratio)
+        hedge_ratios = np.asarray(hedge_ratios, dtype=np.float64)
+        
+        # Past spreads seed the window as (spread, 0) pairs with unit ratio
+        history = np.array(self.spread_history, dtype=np.float64)
+        zeros = np.zeros(len(history))
+        actions, direction = _pairs_signals(
+            np.concatenate((history, a_prices)),
+            np.concatenate((zeros, b_prices)),
+            np.concatenate((np.ones(len(history)), hedge_ratios)),
+            len(history), self.window, self.entry_threshold,
+            self.exit_threshold, int(np.sign(self.position_a)))
+        
+        spreads = a_prices - hedge_ratios * b_prices
+        self.spread_history.extend(spreads[-self.window:].tolist())
+        self.price_a_history.extend(a_prices[-self.window:].tolist())
+        self.price_b_history.extend(b_prices[-self.window:].tolist())
+        if len(a_prices):
+            self.latest_price_a = float(a_prices[-1])
+            self.latest_price_b = float(b_prices[-1])
+        
+        orders = np.full(len(a_prices), None, dtype=object)
+        for i in np.flatnonzero(actions).tolist():
+            if actions[i] == 2:
+                new_a, new_b = 0, 0
+            else:
+                new_a = int(actions[i]) * self.position_size
+                new_b = -int(actions[i]) * int(self.position_size * hedge_ratios[i])
+            trades = [(self.symbol_a, new_a - self.position_a, a_prices[i]),
+                      (self.symbol_b, new_b - self.position_b, b_prices[i])]
+            self.position_a, self.position_b = new_a, new_b
+            
+            orders[i] = [{
+                'symbol': symbol,
+                'side': 'BUY' if change > 0 else 'SELL',
+                'quantity': abs(change),
+                'price': float(price),
+                'order_type': 'MARKET',
+                'strategy': 'StatArb',
+                'timestamp': timestamps[i]
+            } for symbol, change, price in trades if change != 0]
+        return orders
+    
     def on_fill(self, fill: Dict) -> None:
         """Handle fill notification."""
         pass
@@ -6,8 +6,10 @@ Simpler alternative to VWAP.
 """
 
 from typing import Dict, Optional
-from datetime import datetime, timedelta
 from src.interfaces.strategy_interface import StrategyInterface
+from src.utils.timestamps import to_ns
+
+NS_PER_MINUTE = 60_000_000_000
 
 
 class TWAPStrategy(StrategyInterface):
@@ -28,32 +30,33 @@ class TWAPStrategy(StrategyInterface):
         self.slice_size = abs(target_quantity) // num_slices
         self.executed_quantity = 0
         self.slice_interval = total_duration_minutes / num_slices
-        self.start_time = None
-        self.last_slice_time = None
+        self.step_ns = total_duration_minutes * NS_PER_MINUTE // num_slices
+        self.start_time = None  # int64 nanoseconds
+        self.next_slice_time = None  # int64 nanoseconds
         self.slices_executed = 0
         
     def on_market_data(self, data: Dict) -> Optional[Dict]:
         """
         Generate orders based on TWAP algorithm.
         
+        Timestamps may be int64 nanoseconds or datetime-like; slice
+        times are tracked in integer nanoseconds.
+        
         Returns:
             Order dict if should trade, None otherwise
         """
-        current_time = data.get('timestamp')
+        current_time = to_ns(data['timestamp'])
         
         if self.start_time is None:
             self.start_time = current_time
-            self.last_slice_time = current_time
+            self.next_slice_time = current_time + self.step_ns
             
         # Check if we've completed all slices
         if self.slices_executed >= self.num_slices:
             return None
             
-        # Calculate time since last slice
-        elapsed_since_slice = (current_time - self.last_slice_time).total_seconds() / 60
-        
         # Time to execute next slice?
-        if elapsed_since_slice >= self.slice_interval:
+        if current_time >= self.next_slice_time:
             # Handle final slice (may be different size due to rounding)
             if self.slices_executed == self.num_slices - 1:
                 remaining = abs(self.target_quantity) - self.executed_quantity
@@ -74,7 +77,7 @@ class TWAPStrategy(StrategyInterface):
             
             self.executed_quantity += slice_qty
             self.slices_executed += 1
-            self.last_slice_time = current_time
+            self.next_slice_time = current_time + self.step_ns
             
             return order
             
@@ -8,6 +8,9 @@ Used for large institutional orders.
 from typing import Dict, Optional
 import numpy as np
 from src.interfaces.strategy_interface import StrategyInterface
+from src.utils.timestamps import to_ns
+
+NS_PER_MINUTE = 60_000_000_000
 
 
 class VWAPStrategy(StrategyInterface):
@@ -23,31 +26,36 @@ class VWAPStrategy(StrategyInterface):
         """
         self.target_quantity = target_quantity
         self.total_duration = total_duration_minutes
+        self.duration_ns = total_duration_minutes * NS_PER_MINUTE
         self.executed_quantity = 0
         self.volume_profile = []  # Historical volume distribution
-        self.start_time = None
+        self.start_time = None  # int64 nanoseconds
         
     def on_market_data(self, data: Dict) -> Optional[Dict]:
         """
         Generate orders based on VWAP algorithm.
         
+        Timestamps may be int64 nanoseconds or datetime-like; elapsed
+        time is tracked in integer nanoseconds.
+        
         Returns:
             Order dict if should trade, None otherwise
         """
+        timestamp_ns = to_ns(data['timestamp'])
         if self.start_time is None:
-            self.start_time = data.get('timestamp')
+            self.start_time = timestamp_ns
             
         # Calculate time elapsed
-        elapsed = (data['timestamp'] - self.start_time).total_seconds() / 60
+        elapsed_ns = timestamp_ns - self.start_time
         
-        if elapsed >= self.total_duration:
+        if elapsed_ns >= self.duration_ns:
             return None  # Execution complete
             
         # Get current volume
         current_volume = data.get('volume', 0)
         
         # Calculate target cumulative volume participation
-        target_participation = elapsed / self.total_duration
+        target_participation = elapsed_ns / self.duration_ns
         target_cumulative_qty = int(self.target_quantity * target_participation)
         
         # Calculate slice size
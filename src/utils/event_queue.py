@@ -0,0 +1,145 @@
+"""Typed priority queue for backtest events."""
+
+from queue import Empty
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from .events import Event, EventType
+from .jit import njit
+from .timestamps import to_ns
+
+
+# Integer codes stored in the heap for each event type
+EVENT_TYPES = tuple(EventType)
+EVENT_TYPE_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+
+# Heap rows are (timestamp_ns, sequence, type_code, payload_slot)
+@njit(cache=True)
+def _less(heap, i, j):
+    """Order rows by timestamp, then by insertion sequence (FIFO on ties)."""
+    if heap[i, 0] != heap[j, 0]:
+        return heap[i, 0] < heap[j, 0]
+    return heap[i, 1] < heap[j, 1]
+
+
+@njit(cache=True)
+def _swap(heap, i, j):
+    for k in range(heap.shape[1]):
+        tmp = heap[i, k]
+        heap[i, k] = heap[j, k]
+        heap[j, k] = tmp
+
+
+@njit(cache=True)
+def _heap_push(heap, n, timestamp_ns, sequence, type_code, slot):
+    """Insert a row at position n and sift it up; returns the new size."""
+    heap[n, 0] = timestamp_ns
+    heap[n, 1] = sequence
+    heap[n, 2] = type_code
+    heap[n, 3] = slot
+    i = n
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not _less(heap, i, parent):
+            break
+        _swap(heap, i, parent)
+        i = parent
+    return n + 1
+
+
+@njit(cache=True)
+def _heap_pop(heap, n):
+    """Remove the smallest row; returns (type_code, slot, new size)."""
+    type_code = heap[0, 2]
+    slot = heap[0, 3]
+    n -= 1
+    if n > 0:
+        _swap(heap, 0, n)
+        i = 0
+        while True:
+            left = 2 * i + 1
+            if left >= n:
+                break
+            child = left
+            if left + 1 < n and _less(heap, left + 1, left):
+                child = left + 1
+            if not _less(heap, child, i):
+                break
+            _swap(heap, i, child)
+            i = child
+    return type_code, slot, n
+
+
+class EventQueue:
+    """Priority queue of events keyed on int64 nanosecond timestamps.
+
+    Heap entries are rows of a typed int64 array (timestamp, sequence,
+    type code, payload slot) sifted by compiled kernels, and events
+    themselves sit in a slot table. Events come out in timestamp order,
+    first-in-first-out among equal timestamps.
+
+    Offers the put/get/empty/qsize subset of queue.Queue used by the
+    engine components, so it can be passed wherever they expect a Queue.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """Initialize event queue.
+
+        Args:
+            capacity: Initial heap capacity (grows automatically)
+        """
+        self._heap = np.empty((capacity, 4), dtype=np.int64)
+        self._n = 0
+        self._sequence = 0
+        self._payloads: List[Any] = []
+        self._free_slots: List[int] = []
+
+    def put(self, event: Event, block: bool = True, timeout: float = None) -> None:
+        """Add an event (block/timeout accepted for queue.Queue compatibility)."""
+        if self._n == len(self._heap):
+            self._heap = np.concatenate((self._heap, np.empty_like(self._heap)))
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._payloads[slot] = event
+        else:
+            slot = len(self._payloads)
+            self._payloads.append(event)
+
+        self._n = _heap_push(self._heap, self._n, to_ns(event.timestamp), self._sequence,
+                             EVENT_TYPE_CODES[event.type], slot)
+        self._sequence += 1
+
+    def pop(self) -> Tuple[int, Event]:
+        """Remove the earliest event.
+
+        Returns:
+            (type_code, event) where type_code indexes EVENT_TYPES
+
+        Raises:
+            queue.Empty: If the queue is empty
+        """
+        if self._n == 0:
+            raise Empty
+        type_code, slot, self._n = _heap_pop(self._heap, self._n)
+        event = self._payloads[slot]
+        self._payloads[slot] = None
+        self._free_slots.append(slot)
+        return type_code, event
+
+    def get(self, block: bool = True, timeout: float = None) -> Event:
+        """Remove and return the earliest event (never blocks)."""
+        return self.pop()[1]
+
+    def get_nowait(self) -> Event:
+        return self.get(False)
+
+    def empty(self) -> bool:
+        return self._n == 0
+
+    def qsize(self) -> int:
+        return self._n
+
+    def __len__(self) -> int:
+        return self._n
@@ -0,0 +1,28 @@
+"""Optional Numba JIT compilation for numeric hot loops.
+
+Compiled kernels are cached on disk (``cache=True``). Unless NUMBA_CACHE_DIR
+is already set, the cache lives under ~/.cache/backtest_engine/numba rather
+than next to the sources, which may not be writable once installed.
+"""
+import os
+import sys
+import warnings
+
+if 'numba' not in sys.modules:
+    os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join(
+        os.path.expanduser('~'), '.cache', 'backtest_engine', 'numba'))
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    warnings.warn("Numba not available, hot loops run as plain Python. Install with: pip install numba")
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit supporting both decorator forms."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
@@ -0,0 +1,24 @@
+"""Properties for parameters that cached state is derived from."""
+
+
+def param_property(name: str, refresh: str) -> property:
+    """Return a property for parameter ``name`` that keeps derived state in step.
+
+    The value is stored as ``'_' + name``, and every assignment calls the
+    owner's ``refresh`` method afterwards. Reads and writes to other
+    attributes cost nothing extra.
+
+    Args:
+        name: Public attribute name
+        refresh: Name of the method recomputing or discarding derived state
+    """
+    private = '_' + name
+
+    def fget(self):
+        return getattr(self, private)
+
+    def fset(self, value):
+        setattr(self, private, value)
+        getattr(self, refresh)()
+
+    return property(fget, fset, doc=f"{name} (assigning it calls {refresh}())")
@@ -0,0 +1,25 @@
+"""``__slots__`` for dataclasses on every supported Python version.
+
+``dataclass(slots=True)`` only exists from Python 3.10; ``slotted`` does the
+same rebuild for older interpreters so per-event records carry no
+``__dict__``.
+"""
+
+from dataclasses import fields
+
+
+def slotted(cls):
+    """Return a copy of dataclass ``cls`` whose fields are stored in ``__slots__``.
+
+    Apply it on top of ``@dataclass``. Field defaults live in the generated
+    ``__init__``, so the class attributes that would clash with the slots are
+    dropped. Methods relying on the zero-argument ``super()`` form are not
+    supported, as they stay bound to the original class.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
@@ -0,0 +1,23 @@
+"""Timestamp conversion shared by the event queue and the strategies."""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_ns(timestamp: Any) -> int:
+    """Convert a datetime-like or integer timestamp to int64 nanoseconds.
+
+    Integers and naive datetimes are converted directly; pandas is imported
+    only for other inputs (pandas/NumPy datetimes, tz-aware values, strings).
+    """
+    if isinstance(timestamp, int):
+        return timestamp
+    if type(timestamp) is datetime and timestamp.tzinfo is None:
+        return (timestamp - _EPOCH) // _MICROSECOND * 1000
+    if hasattr(timestamp, '__index__'):
+        return int(timestamp)  # NumPy integers
+    import pandas as pd
+    return pd.Timestamp(timestamp).value
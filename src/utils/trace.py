@@ -0,0 +1,90 @@
+"""Fixed-size in-memory trace of engine events."""
+
+import json
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class TraceBuffer:
+    """Ring buffer of numeric trace records stored as parallel arrays.
+
+    Recording writes four numbers into pre-allocated columns, so tracing
+    costs no string formatting or allocation on the hot path. Once full,
+    the oldest records are overwritten.
+    """
+
+    SIGNAL = 0
+    REJECTED = 1
+    FILL = 2
+    EVENT_NAMES = ('SIGNAL', 'REJECTED', 'FILL')
+
+    def __init__(self, capacity: int = 1_000_000):
+        """Initialize trace buffer.
+
+        Args:
+            capacity: Maximum number of records kept
+        """
+        self.capacity = capacity
+        self.event_code = np.empty(capacity, dtype=np.int8)
+        self.timestamp = np.empty(capacity, dtype=np.float64)
+        self.quantity = np.empty(capacity, dtype=np.float64)
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.total_records = 0
+
+    def record(self, event_code: int, timestamp: float, quantity: float, price: float) -> None:
+        """Append one record, overwriting the oldest when full."""
+        i = self.total_records % self.capacity
+        self.event_code[i] = event_code
+        self.timestamp[i] = timestamp
+        self.quantity[i] = quantity
+        self.price[i] = price
+        self.total_records += 1
+
+    def __len__(self) -> int:
+        return min(self.total_records, self.capacity)
+
+    def _order(self) -> np.ndarray:
+        """Indices of the retained records, oldest first."""
+        n = len(self)
+        start = self.total_records % self.capacity if self.total_records > self.capacity else 0
+        return (start + np.arange(n)) % self.capacity
+
+    def to_dict(self) -> Dict[str, List]:
+        """Return the retained records as columns, oldest first."""
+        order = self._order()
+        return {
+            'event': [self.EVENT_NAMES[code] for code in self.event_code[order].tolist()],
+            'timestamp': self.timestamp[order].tolist(),
+            'quantity': self.quantity[order].tolist(),
+            'price': self.price[order].tolist(),
+            'dropped': max(self.total_records - self.capacity, 0)
+        }
+
+    def dump(self, output_file: str) -> None:
+        """Write the retained records to a JSON file."""
+        order = self._order()
+        columns = {
+            'event_code': self.event_code[order],
+            'event_names': list(self.EVENT_NAMES),
+            'timestamp': self.timestamp[order],
+            'quantity': self.quantity[order],
+            'price': self.price[order],
+            'dropped': max(self.total_records - self.capacity, 0)
+        }
+        if ORJSON_AVAILABLE:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(columns, option=orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump({k: v.tolist() if isinstance(v, np.ndarray) else v
+                           for k, v in columns.items()}, f)
+
+    def clear(self) -> None:
+        self.total_records = 0
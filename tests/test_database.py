@@ -0,0 +1,345 @@
+import numpy as np
+import pytest
+import sys
+import os
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event, inspect, text
+
+from src.database.migrations import (AddIndexMigration, CompositeIndexMigration, Migration,
+                                     MigrationManager, RenameTradesRunIndexMigration,
+                                     ReturnIndexMigration)
+from src.database.models import Base, BacktestRun, PerformanceMetric, Trade
+from src.database.query import BacktestQueryBuilder, TradeQueryBuilder, invalidate_query_cache
+from src.database.repository import BacktestRepository
+
+
+@pytest.fixture(autouse=True)
+def no_index_build_delay(monkeypatch):
+    monkeypatch.setattr(AddIndexMigration, 'BUILD_DELAY', 0.0)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repo = BacktestRepository(f"sqlite:///{tmp_path / 'backtests.db'}")
+    yield repo
+    repo.config.dispose()
+
+
+def test_repositories_share_engine_and_skip_create_all(tmp_path, monkeypatch):
+    """Test repositories on one URL share an engine and only the first creates tables."""
+    url = f"sqlite:///{tmp_path / 'backtests.db'}"
+    first = BacktestRepository(url)
+    calls = []
+    monkeypatch.setattr(Base.metadata, 'create_all', lambda engine: calls.append(engine))
+
+    second = BacktestRepository(url)
+
+    assert second.engine is first.engine
+    assert calls == []
+    first.config.dispose()
+
+
+def test_sqlite_connections_use_wal(repository):
+    """Test SQLite connections are configured for WAL with relaxed syncing."""
+    with repository.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == 'wal'
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+
+def make_run(name: str = 'run') -> BacktestRun:
+    return BacktestRun(name=name, strategy_name='MA', symbol='AAPL',
+                       start_date=datetime(2024, 1, 1), end_date=datetime(2024, 6, 30),
+                       initial_capital=100000.0, final_capital=105000.0)
+
+
+def test_repository_round_trip(repository):
+    """Test saved runs keep their generated fields after the session closes."""
+    run = repository.save_backtest_run(make_run())
+
+    assert run.id is not None
+    assert run.created_at is not None
+    assert repository.get_backtest_run(run.id).name == 'run'
+    assert [r.id for r in repository.list_backtest_runs()] == [run.id]
+
+
+def test_repository_delete_cascades(repository):
+    """Test deleting a run removes its trades."""
+    run = repository.save_backtest_run(make_run())
+    repository.save_trades([Trade.make_dict(run.id, datetime(2024, 1, 2), 'AAPL', 'BUY', 10, 150.0)])
+    with repository.session_scope() as session:
+        session.add(Trade(backtest_run_id=run.id, timestamp=datetime(2024, 1, 3),
+                          symbol='AAPL', direction='SELL', quantity=10, price=151.0))
+
+    repository.delete_backtest_run(run.id)
+
+    assert repository.get_backtest_run(run.id) is None
+    with repository.session_scope() as session:
+        assert session.query(Trade).count() == 0
+
+
+def test_session_scope_rolls_back_on_error(repository):
+    """Test a failing unit of work leaves nothing behind."""
+    with pytest.raises(RuntimeError):
+        with repository.session_scope() as session:
+            session.add(make_run())
+            session.flush()
+            raise RuntimeError("boom")
+
+    assert repository.list_backtest_runs() == []
+
+
+def test_bulk_save_chunks_and_defaults(repository):
+    """Test bulk saves span several INSERT chunks and keep column defaults."""
+    run = repository.save_backtest_run(make_run())
+    repository.INSERT_CHUNK_SIZE = 4
+    trades = [Trade(backtest_run_id=run.id, timestamp=datetime(2024, 1, 2), symbol='AAPL',
+                    direction='BUY', quantity=i + 1, price=150.0) for i in range(5)]
+    trades.append({'backtest_run_id': run.id, 'timestamp': datetime(2024, 1, 3), 'symbol': 'AAPL',
+                   'direction': 'SELL', 'quantity': 15, 'price': 151.0, 'commission': 1.0})
+    repository.save_trades(trades)
+    repository.save_metrics([PerformanceMetric(backtest_run_id=run.id, date=datetime(2024, 1, 2),
+                                               portfolio_value=100500.0)])
+
+    with repository.session_scope() as session:
+        saved = session.query(Trade).order_by(Trade.id).all()
+        assert [t.quantity for t in saved] == [1, 2, 3, 4, 5, 15]
+        assert [t.commission for t in saved] == [0.0] * 5 + [1.0]
+        assert session.query(PerformanceMetric).count() == 1
+
+
+def test_trade_aggregate_stats(repository):
+    """Test aggregate stats over a run's trades, including trades without pnl."""
+    run = repository.save_backtest_run(make_run())
+    repository.save_trades([{'backtest_run_id': run.id, 'timestamp': datetime(2024, 1, 2),
+                             'symbol': 'AAPL', 'direction': 'SELL', 'quantity': 10,
+                             'price': 150.0, 'pnl': pnl} for pnl in (30.0, 10.0, -20.0, None)])
+
+    with repository.session_scope() as session:
+        stats = TradeQueryBuilder(session).filter_by_backtest_run(run.id).aggregate_stats()
+        assert TradeQueryBuilder(session).filter_by_backtest_run(run.id + 1).aggregate_stats() == {}
+
+    assert stats == {'total_trades': 4, 'winning_trades': 2, 'losing_trades': 1, 'win_rate': 0.5,
+                     'total_pnl': 20.0, 'avg_win': 20.0, 'avg_loss': -20.0}
+    assert [r.id for r in repository.iter_backtest_runs(batch_size=1)] == [run.id]
+    with repository.session_scope() as session:
+        pnl = TradeQueryBuilder(session).filter_by_backtest_run(run.id).pnl_array()
+    np.testing.assert_array_equal(pnl, [30.0, 10.0, -20.0, np.nan])
+
+
+def test_migrations_apply_once(repository):
+    """Test migrate records versions and skips already applied migrations."""
+    manager = MigrationManager(repository.engine)
+    manager.register_migration(CompositeIndexMigration())
+    manager.register_migration(AddIndexMigration())
+
+    manager.migrate()
+    manager.migrate()
+
+    assert manager.get_current_version() == 2
+    assert MigrationManager(repository.engine).get_current_version() == 2
+    indexes = {i['name'] for i in inspect(repository.engine).get_indexes('trades')}
+    assert {'idx_trades_symbol', 'idx_trades_run_symbol_pnl'} <= indexes
+
+
+def test_return_index_reaches_databases_already_at_v1(repository):
+    """Test the return index ships as its own version on top of v1."""
+    manager = MigrationManager(repository.engine)
+    manager.register_migration(AddIndexMigration())
+    manager.migrate()
+    assert 'idx_backtest_runs_return' not in {
+        i['name'] for i in inspect(repository.engine).get_indexes('backtest_runs')}
+
+    manager.register_migration(ReturnIndexMigration())
+    manager.migrate()
+
+    assert manager.get_current_version() == 3
+    assert 'idx_backtest_runs_return' in {
+        i['name'] for i in inspect(repository.engine).get_indexes('backtest_runs')}
+
+
+def test_trades_run_index_renamed_in_its_own_version(repository):
+    """Test v4 drops v1's duplicate join index and rollback restores it."""
+    def trade_indexes():
+        return {i['name'] for i in inspect(repository.engine).get_indexes('trades')}
+
+    manager = MigrationManager(repository.engine)
+    manager.register_migration(AddIndexMigration())
+    manager.migrate()
+    assert {'idx_trades_backtest_run', 'ix_trades_backtest_run_id'} <= trade_indexes()
+
+    manager.register_migration(ReturnIndexMigration())
+    manager.register_migration(RenameTradesRunIndexMigration())
+    manager.migrate()
+    assert manager.get_current_version() == 4
+    assert 'ix_trades_backtest_run_id' in trade_indexes()
+    assert 'idx_trades_backtest_run' not in trade_indexes()
+
+    manager.rollback(3)
+    assert {'idx_trades_backtest_run', 'ix_trades_backtest_run_id'} <= trade_indexes()
+
+
+def test_index_migration_skips_existing_indexes(repository, monkeypatch):
+    """Test indexes that already exist are not rebuilt."""
+    migration = AddIndexMigration()
+    migration.upgrade(repository.engine)
+    monkeypatch.setattr(AddIndexMigration, '_connect', staticmethod(
+        lambda engine: pytest.fail("no index should be rebuilt")))
+
+    migration.upgrade(repository.engine)
+
+
+def test_migrate_defers_index_builds(repository):
+    """Test deferred index migrations only run at finalize_indexes()."""
+    manager = MigrationManager(repository.engine)
+    manager.register_migration(AddIndexMigration())
+
+    manager.migrate(defer_indexes=True)
+    assert manager.get_current_version() == 0
+
+    manager.finalize_indexes()
+    assert manager.get_current_version() == 1
+
+
+class CommissionBackfill(Migration):
+    """Paged data migration setting a flat commission on every trade."""
+
+    paginated = True
+    page_size = 2
+
+    def __init__(self, fail_at_offset=None):
+        super().__init__(version=2, name="Backfill commission")
+        self.fail_at_offset = fail_at_offset
+        self.offsets = []
+
+    def upgrade_page(self, session, offset, limit):
+        self.offsets.append(offset)
+        if offset == self.fail_at_offset:
+            raise RuntimeError("interrupted")
+        trades = session.query(Trade).order_by(Trade.id).offset(offset).limit(limit).all()
+        for trade in trades:
+            trade.commission = 1.5
+        return len(trades)
+
+
+def test_paged_migration_resumes_after_failure(repository):
+    """Test paged migrations commit per page and resume where they stopped."""
+    run = repository.save_backtest_run(make_run())
+    repository.save_trades([{'backtest_run_id': run.id, 'timestamp': datetime(2024, 1, 2),
+                             'symbol': 'AAPL', 'direction': 'BUY', 'quantity': i + 1,
+                             'price': 150.0} for i in range(5)])
+    manager = MigrationManager(repository.engine)
+    manager.register_migration(CommissionBackfill(fail_at_offset=2))
+
+    with pytest.raises(RuntimeError):
+        manager.migrate()
+    assert manager.get_current_version() == 0
+
+    resumed = CommissionBackfill()
+    manager.migrations = [resumed]
+    manager.migrate()
+
+    assert resumed.offsets == [2, 4]
+    assert manager.get_current_version() == 2
+    with repository.session_scope() as session:
+        assert {t.commission for t in session.query(Trade)} == {1.5}
+
+
+def test_query_builder_eager_loads_trades(repository):
+    """Test with_trades() loads trades that stay usable after the session closes."""
+    runs = [repository.save_backtest_run(make_run(f"run{i}")) for i in range(3)]
+    repository.save_trades([{'backtest_run_id': run.id, 'timestamp': datetime(2024, 1, 2),
+                             'symbol': 'AAPL', 'direction': 'BUY', 'quantity': 10,
+                             'price': 150.0} for run in runs for _ in range(2)])
+
+    with repository.session_scope() as session:
+        loaded = BacktestQueryBuilder(session).filter_by_symbol('AAPL').with_trades().execute()
+
+    assert sorted(len(run.trades) for run in loaded) == [2, 2, 2]
+
+
+def test_query_builder_cache_serves_repeats_until_write(repository):
+    """Test repeated queries skip the database and writes invalidate them."""
+    repository.save_backtest_run(make_run('first'))
+    statements = []
+    event.listen(repository.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    def names():
+        with repository.session_scope() as session:
+            builder = BacktestQueryBuilder(session).filter_by_strategy('MA').order_by_created()
+            return sorted(run.name for run in builder.execute()), builder.count()
+
+    assert names() == (['first'], 1)
+    executed = len(statements)
+    assert names() == (['first'], 1)
+    assert len(statements) == executed
+
+    repository.save_backtest_run(make_run('second'))
+    assert names() == (['first', 'second'], 2)
+    with repository.session_scope() as session:
+        assert BacktestQueryBuilder(session).filter_by_strategy('other').count() == 0
+
+
+def test_query_builder_cache_keys_on_inputs(repository):
+    """Test cache keys separate builder inputs and outside writes need an explicit invalidate."""
+    for i, ret in enumerate([5.0, 12.0, -3.0]):
+        run = make_run(f"run{i}")
+        run.total_return_pct = ret
+        repository.save_backtest_run(run)
+
+    def returns(count):
+        with repository.session_scope() as session:
+            return [run.total_return_pct for run in
+                    BacktestQueryBuilder(session).order_by_return().limit(count).execute()]
+
+    assert returns(1) == [12.0]
+    assert returns(2) == [12.0, 5.0]
+
+    with repository.engine.begin() as conn:
+        conn.execute(text("UPDATE backtest_runs SET total_return_pct = 20.0 WHERE name = 'run2'"))
+    assert returns(1) == [12.0]
+    invalidate_query_cache()
+    assert returns(1) == [20.0]
+
+
+def test_query_builder_orders_by_return(repository):
+    """Test top-N by return and trade side filtering build valid queries."""
+    for i, ret in enumerate([5.0, 12.0, -3.0]):
+        run = make_run(f"run{i}")
+        run.total_return_pct = ret
+        repository.save_backtest_run(run)
+
+    with repository.session_scope() as session:
+        top = BacktestQueryBuilder(session).order_by_return().limit(2).execute()
+        assert [run.total_return_pct for run in top] == [12.0, 5.0]
+        assert TradeQueryBuilder(session).filter_by_side('BUY').execute() == []
+        page, total = BacktestQueryBuilder(session).order_by_return().limit(2).execute_with_count()
+        assert [run.total_return_pct for run in page] == [12.0, 5.0]
+        assert total == 3
+
+
+def test_bulk_saves_render_multi_row_inserts(repository):
+    """Test a bulk save sends one multi-row INSERT per page, not one per row."""
+    run = repository.save_backtest_run(make_run())
+    inserts = []
+    event.listen(repository.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: inserts.append(statement)
+                 if statement.startswith('INSERT') else None)
+
+    repository.save_trades([Trade.make_dict(run.id, datetime(2024, 1, 2), 'AAPL', 'BUY', i + 1, 150.0)
+                            for i in range(50)])
+
+    assert len(inserts) == 1
+
+
+def test_save_trades_raw(repository):
+    """Test the Core trade insert path writes every chunk."""
+    run = repository.save_backtest_run(make_run())
+    repository.RAW_INSERT_CHUNK_SIZE = 3
+    repository.save_trades_raw([Trade.make_dict(run.id, datetime(2024, 1, 2), 'AAPL', 'BUY', i + 1, 150.0)
+                                for i in range(7)])
+
+    with repository.session_scope() as session:
+        assert TradeQueryBuilder(session).filter_by_backtest_run(run.id).aggregate_stats()['total_trades'] == 7
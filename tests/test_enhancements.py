@@ -0,0 +1,407 @@
+from datetime import datetime
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.enhancements.asset_classes import AssetClass, AssetSpecification, MultiAssetPortfolio
+from src.enhancements import parallel_backtest, visualization
+from src.enhancements.parallel_backtest import BacktestConfig, ParallelBacktestRunner, get_shared_data
+from src.enhancements.latency import FixedLatency, LatencyModel, TimeOfDayLatency, VariableLatency
+from src.enhancements.slippage_models import (AdaptiveSlippage, FixedSlippage, SlippageModel,
+                                              SquareRootSlippage, VolumeBasedSlippage)
+
+
+@pytest.mark.parametrize('distribution', ['normal', 'exponential', 'uniform'])
+def test_variable_latency_refills_within_bounds(distribution):
+    """Test buffered latency samples stay clamped across buffer refills."""
+    model = VariableLatency(distribution=distribution)
+    model.BUFFER_SIZE = 16
+    samples = np.array([model.get_latency() for _ in range(40)])
+
+    assert samples.min() >= model.min_latency
+    assert samples.max() <= model.max_latency
+    assert len(np.unique(samples)) > 16  # Refilled with fresh draws
+    assert isinstance(model.get_latency(), float)
+
+
+def test_variable_latency_keeps_global_random_state():
+    """Test sampling uses the model's own seeded generator."""
+    np.random.seed(0)
+    expected = np.random.normal()
+    np.random.seed(0)
+    model = VariableLatency(seed=7)
+    first = [model.get_latency() for _ in range(3)]
+
+    assert np.random.normal() == expected
+    assert VariableLatency(seed=7).get_latency_batch(3).tolist() == first
+
+
+def test_variable_latency_parameter_change_discards_buffer():
+    """Test new distribution parameters apply to the next sample."""
+    model = VariableLatency(distribution='uniform', seed=1)
+    model.get_latency()
+    model.min_latency = model.max_latency = 0.02
+
+    assert model.get_latency() == 0.02
+
+
+def test_variable_latency_unknown_distribution():
+    """Test unknown distributions are rejected when sampling."""
+    with pytest.raises(ValueError):
+        VariableLatency(distribution='pareto').get_latency()
+
+
+def test_latency_batches():
+    """Test batched latencies for each model, including the generic fallback."""
+    class StepLatency(LatencyModel):
+        def __init__(self):
+            self.calls = 0
+
+        def get_latency(self):
+            self.calls += 1
+            return self.calls * 0.001
+
+    variable = VariableLatency(distribution='uniform').get_latency_batch(1000)
+    peak = TimeOfDayLatency()
+    peak.set_current_time(datetime(2024, 1, 2, 9, 30))
+
+    assert FixedLatency(0.002).get_latency_batch(3).tolist() == [0.002] * 3
+    assert variable.shape == (1000,)
+    assert variable.min() >= 0.001 and variable.max() <= 0.050
+    assert peak.get_latency_batch(2).tolist() == [0.006, 0.006]
+    assert StepLatency().get_latency_batch(3) == pytest.approx([0.001, 0.002, 0.003])
+
+
+def test_time_of_day_latency_table_follows_parameters():
+    """Test the per-hour table matches the peak window and is rebuilt on change."""
+    model = TimeOfDayLatency(base_latency=0.001, peak_hours_multiplier=3.0,
+                             peak_start_hour=9, peak_end_hour=11)
+    assert model.get_latency() == 0.001
+    model.set_current_time(datetime(2024, 1, 2, 10, 59))
+    assert model.get_latency() == pytest.approx(0.003)
+    assert model.get_latency_for_hours(np.array([8, 9, 10, 11])) == pytest.approx(
+        [0.001, 0.003, 0.003, 0.001])
+
+    model.peak_end = 10
+    assert model.get_latency() == 0.001
+    bars = pd.date_range('2024-01-02 08:30', periods=4, freq='h')
+    assert model.get_latency_series(bars) == pytest.approx([0.001, 0.003, 0.001, 0.001])
+
+
+@pytest.fixture
+def portfolio():
+    """Portfolio holding a futures contract, a EUR equity and an unused symbol."""
+    portfolio = MultiAssetPortfolio(initial_capital=1_000_000.0)
+    portfolio.register_asset(AssetSpecification('ES', AssetClass.FUTURES, multiplier=50.0,
+                                                margin_requirement=0.1))
+    portfolio.register_asset(AssetSpecification('SAP', AssetClass.EQUITY, currency='EUR'))
+    portfolio.register_asset(AssetSpecification('SPY', AssetClass.EQUITY))
+    portfolio.update_fx_rate('EUR/USD', 1.1)
+    portfolio.execute_trade('ES', 2, 4000.0)
+    portfolio.execute_trade('SAP', 100, 120.0)
+    portfolio.execute_trade('SAP', 100, 130.0)
+    return portfolio
+
+
+def test_multi_asset_valuation(portfolio):
+    """Test valuation, P&L and exposure over the per-symbol arrays."""
+    prices = {'ES': 4100.0, 'SAP': 140.0}
+
+    assert portfolio.positions == {'ES': 2, 'SAP': 200, 'SPY': 0}
+    assert portfolio.entry_prices == {'ES': 4000.0, 'SAP': 125.0}
+    cash = 1_000_000.0 - 2 * 4000.0 * 50.0 - 200 * 125.0 * 1.1
+    assert portfolio.current_capital == pytest.approx(cash)
+    assert portfolio.get_portfolio_value(prices) == pytest.approx(
+        cash + 2 * 4100.0 * 50.0 + 200 * 140.0 * 1.1)
+    assert portfolio.get_pnl_by_asset(prices) == pytest.approx(
+        {'ES': 2 * 100.0 * 50.0, 'SAP': 200 * 15.0 * 1.1})
+    assert portfolio.get_pnl_by_asset({'ES': 4100.0}) == pytest.approx({'ES': 10_000.0})
+    exposure = portfolio.get_exposure_by_asset_class(prices)
+    assert exposure[AssetClass.FUTURES] == pytest.approx(410_000.0)
+    assert exposure[AssetClass.EQUITY] == pytest.approx(30_800.0)
+    assert exposure[AssetClass.FOREX] == 0.0
+    # Array prices are aligned with registration order
+    assert portfolio.get_portfolio_value(np.array([4100.0, 140.0, 0.0])) == pytest.approx(
+        portfolio.get_portfolio_value(prices))
+    with pytest.raises(ValueError):
+        portfolio.get_portfolio_value(np.array([4100.0, 140.0]))
+
+
+def test_multi_asset_state_is_read_only(portfolio):
+    """Test position and FX mappings reject writes that would be lost."""
+    with pytest.raises(TypeError):
+        portfolio.positions['ES'] = 5
+    with pytest.raises(TypeError):
+        portfolio.entry_prices['ES'] = 1.0
+    with pytest.raises(TypeError):
+        portfolio.fx_rates['EUR/USD'] = 2.0
+    assert portfolio.fx_rates == {'EUR/USD': 1.1}
+
+
+def test_multi_asset_grows_and_closes():
+    """Test registering past the initial capacity and closing a position."""
+    portfolio = MultiAssetPortfolio()
+    for i in range(MultiAssetPortfolio.INITIAL_CAPACITY + 5):
+        portfolio.register_asset(AssetSpecification(f'S{i}', AssetClass.CRYPTO))
+    portfolio.execute_trade('S66', 10, 5.0)
+    assert portfolio.get_portfolio_value({'S66': 6.0}) == pytest.approx(100000.0 + 10.0)
+    portfolio.execute_trade('S66', -10, 6.0)
+
+    assert portfolio.positions['S66'] == 0
+    assert portfolio.entry_prices == {}
+    assert portfolio.get_pnl_by_asset({'S66': 7.0}) == {}
+    assert portfolio.current_capital == pytest.approx(100010.0)
+    with pytest.raises(ValueError):
+        portfolio.execute_trade('XYZ', 1, 1.0)
+
+
+def test_trade_log_columns_grow_and_convert(monkeypatch):
+    """Test the columnar trade log past its initial capacity, as a frame and as dicts."""
+    monkeypatch.setattr(MultiAssetPortfolio, 'INITIAL_LOG_CAPACITY', 2)
+    portfolio = MultiAssetPortfolio()
+    assert len(portfolio._log_qty) == 2
+    portfolio.register_asset(AssetSpecification('AAPL', AssetClass.EQUITY))
+    portfolio.register_asset(AssetSpecification('BTC', AssetClass.CRYPTO))
+    portfolio.execute_trade('AAPL', 10, 100.0, commission=1.0, timestamp=datetime(2024, 1, 2))
+    portfolio.execute_trade('BTC', 1, 40.0)
+    portfolio.execute_trade('AAPL', -4, 101.0, timestamp=pd.Timestamp('2024-01-03'))
+    assert len(portfolio._log_qty) == 4
+
+    frame = portfolio.trade_log_df()
+    assert frame['symbol'].tolist() == ['AAPL', 'BTC', 'AAPL']
+    assert frame['position'].tolist() == [10, 1, 6]
+    assert frame['timestamp'].isna().tolist() == [False, True, False]
+    log = portfolio.trade_log
+    assert log[0] == {'timestamp': pd.Timestamp('2024-01-02'), 'symbol': 'AAPL', 'quantity': 10,
+                      'price': 100.0, 'commission': 1.0, 'position': 10}
+    assert log[1]['timestamp'] is None
+
+
+def test_fx_rates_resolve_direct_and_inverse_quotes(capsys, caplog):
+    """Test inverse quotes are inverted and direct quotes take precedence."""
+    portfolio = MultiAssetPortfolio()
+    portfolio.register_asset(AssetSpecification('7203', AssetClass.EQUITY, currency='JPY',
+                                                multiplier=100.0))
+    portfolio.update_fx_rate('USD/JPY', 150.0)
+
+    assert portfolio.convert_to_base_currency(1500.0, 'JPY') == pytest.approx(10.0)
+    assert portfolio._fx_vector() == pytest.approx([1 / 150.0])
+    portfolio.update_fx_rate('JPY/USD', 0.007)
+    portfolio.update_fx_rate('USD/JPY', 140.0)
+    assert portfolio.convert_to_base_currency(1000.0, 'JPY') == pytest.approx(7.0)
+    portfolio.execute_trade('7203', 1, 2000.0)
+    portfolio.update_fx_rate('JPY/USD', 0.006)
+    assert portfolio.get_portfolio_value({'7203': 2000.0}) == pytest.approx(
+        portfolio.current_capital + 2000.0 * 100.0 * 0.006)
+    assert capsys.readouterr().out == ''
+    with caplog.at_level('WARNING'):
+        assert portfolio.convert_to_base_currency(5.0, 'GBP') == 5.0
+        assert portfolio.convert_to_base_currency(6.0, 'GBP') == 6.0
+    assert [r.getMessage() for r in caplog.records] == ['No FX rate for GBP/USD, assuming 1:1']
+    portfolio.update_fx_rate('GBP/USD', 1.25)
+    assert portfolio.convert_to_base_currency(4.0, 'GBP') == pytest.approx(5.0)
+
+
+class HalfSpreadSlippage(SlippageModel):
+    """Model without its own batch method, for the base class default."""
+
+    def calculate_slippage(self, price, quantity, volume=None):
+        return price * (0.001 if volume is None else 0.002)
+
+
+def adaptive_slippage():
+    model = AdaptiveSlippage()
+    model.update_volatility(0.02)
+    return model
+
+
+@pytest.mark.parametrize('model', [FixedSlippage(), VolumeBasedSlippage(), SquareRootSlippage(),
+                                   AdaptiveSlippage(), adaptive_slippage(), HalfSpreadSlippage()])
+def test_slippage_batch_matches_scalar(model):
+    """Test batch slippage agrees with the per-order path."""
+    prices = np.array([100.0, 50.0, 20.0, 10.0])
+    quantities = np.array([100, -500, 10, 1000])
+    volumes = np.array([10_000.0, 0.0, np.nan, 2_000.0])
+
+    batch = model.calculate_slippage_batch(prices, quantities, volumes)
+    scalar = [model.calculate_slippage(p, q, None if np.isnan(v) else v)
+              for p, q, v in zip(prices, quantities, volumes)]
+
+    assert batch == pytest.approx(scalar)
+    assert model.calculate_slippage_batch(prices, quantities) == pytest.approx(
+        [model.calculate_slippage(p, q) for p, q in zip(prices, quantities)])
+
+
+def test_fixed_slippage_zero_rate_specialization():
+    """Test a zero rate short-circuits and changing the rate restores the formula."""
+    model = FixedSlippage(0.0)
+    assert model.calculate_slippage(100.0, 10) == 0.0
+    model.slippage_pct = 0.001
+    assert model.calculate_slippage(100.0, 10) == pytest.approx(0.1)
+    model.slippage_pct = 0.0
+    assert pickle.loads(pickle.dumps(model)).calculate_slippage(100.0, 10) == 0.0
+
+
+def test_fixed_slippage_zero_rate_keeps_subclass_override():
+    """Test the zero-rate shortcut does not shadow a subclass formula."""
+    class FloorSlippage(FixedSlippage):
+        def calculate_slippage(self, price, quantity, volume=None):
+            return max(price * self.slippage_pct, 0.01)
+
+    model = FloorSlippage(0.0)
+    assert model.calculate_slippage(100.0, 10) == 0.01
+    model.slippage_pct = 0.001
+    model.slippage_pct = 0.0
+    assert model.calculate_slippage(100.0, 10) == 0.01
+
+
+def test_slippage_formulas():
+    """Test scalar slippage against the closed-form models."""
+    assert VolumeBasedSlippage(0.001, 0.1).calculate_slippage(100.0, -500, 10_000) == \
+        pytest.approx(100.0 * 0.001 + 100.0 * 0.1 * 0.05)
+    assert SquareRootSlippage().calculate_slippage(100.0, 2_500, 10_000) == \
+        pytest.approx(100.0 * 0.02 * 0.5 * 0.11)
+    assert SquareRootSlippage().calculate_slippage(100.0, 2_500) == \
+        pytest.approx(100.0 * 0.02 * np.sqrt(0.1) * 0.11)
+
+
+def shared_data_backtest(config):
+    """Backtest stub reporting what the worker sees for its data file."""
+    data = get_shared_data(config.data_file)
+    return {
+        'shared': config.data_file in parallel_backtest._SHARED_DATA,
+        'writeable': data['close'].to_numpy().flags.writeable,
+        'columns': list(data.columns),
+        'total': float(data['close'].sum() * config.strategy_params['scale'])
+    }
+
+
+def test_parallel_runner_shares_data(tmp_path):
+    """Test workers read each data file from shared memory, not disk."""
+    path = str(tmp_path / 'prices.csv')
+    pd.DataFrame({'symbol': ['A', 'A', 'A'], 'volume': [10, 20, 30],
+                  'close': [1.0, 2.0, 3.0]}).to_csv(path, index=False)
+    configs = [BacktestConfig({'scale': scale}, path) for scale in (1, 2, 3)]
+
+    runner = ParallelBacktestRunner(max_workers=2, share_data=True)
+    results = runner.run_parallel(configs, shared_data_backtest)
+
+    assert all(r['success'] and r['shared'] and not r['writeable'] for r in results)
+    assert results[0]['columns'] == ['symbol', 'volume', 'close']
+    assert sorted(r['total'] for r in results) == [6.0, 12.0, 18.0]
+
+
+def scaled_backtest(config):
+    """Backtest stub failing for negative scales."""
+    if config.strategy_params['scale'] < 0:
+        raise ValueError('negative scale')
+    return {'sharpe_ratio': float(config.strategy_params['scale'])}
+
+
+def test_parallel_runner_keeps_config_order_and_errors():
+    """Test chunked dispatch returns results in config order with failures reported."""
+    scales = [3, -1, 2, 5, 1, 4, 0, 7, 6]
+    configs = [BacktestConfig({'scale': scale}, 'prices.csv') for scale in scales]
+    runner = ParallelBacktestRunner(max_workers=2)
+    results = runner.run_parallel(configs, scaled_backtest)
+
+    assert [r['_params']['scale'] for r in results] == scales
+    assert results[1] == {'success': False, 'error': 'negative scale',
+                          '_params': {'scale': -1}, '_data_file': 'prices.csv'}
+    assert runner.get_best_result()['sharpe_ratio'] == 7.0
+
+
+def test_parallel_runner_threads_share_frame(tmp_path):
+    """Test thread workers get the parent's frame itself and it is dropped afterwards."""
+    frame = pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+    seen = []
+
+    def backtest(config):
+        seen.append(get_shared_data(config.data_file))
+        return {'total': float(seen[-1]['close'].sum() * config.strategy_params['scale'])}
+
+    configs = [BacktestConfig({'scale': scale}, 'prices.csv') for scale in (1, 2)]
+    runner = ParallelBacktestRunner(max_workers=2, share_data=True,
+                                    data_loader=lambda path: frame, executor_type='thread')
+    results = runner.run_parallel(configs, backtest)
+
+    assert sorted(r['total'] for r in results) == [6.0, 12.0]
+    assert sorted(runner.results_to_dataframe()['param_scale']) == [1, 2]
+    assert 'config' not in results[0] and results[0]['_data_file'] == 'prices.csv'
+    assert all(data is frame for data in seen)
+    assert 'prices.csv' not in parallel_backtest._SHARED_DATA
+    with pytest.raises(ValueError):
+        ParallelBacktestRunner(executor_type='fiber')
+
+
+def test_publish_round_trips_frame():
+    """Test a published frame rebuilds identically, index and strings included."""
+    frame = pd.DataFrame({'symbol': ['A', None, 'B'], 'close': [1.0, 2.0, 3.0],
+                          'ts': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'])},
+                         index=pd.Index([10, 20, 30], name='bar'))
+    spec, blocks = parallel_backtest._publish(frame)
+    try:
+        parallel_backtest._init_worker({'prices.csv': spec})
+        rebuilt = get_shared_data('prices.csv')
+        pd.testing.assert_frame_equal(rebuilt, frame)
+        assert not rebuilt['close'].to_numpy().flags.writeable
+    finally:
+        parallel_backtest._SHARED_DATA.clear()
+        for shm in parallel_backtest._SHARED_BLOCKS + blocks:
+            shm.close()
+        parallel_backtest._SHARED_BLOCKS.clear()
+        for shm in blocks:
+            shm.unlink()
+
+
+def test_drawdown_kernel_matches_pandas():
+    """Test the one-pass drawdown against pandas' cummax formula, NaNs included."""
+    equity = pd.Series([np.nan, 100.0, 110.0, np.nan, 99.0, 120.0, 60.0])
+    running_max = equity.cummax()
+
+    expected = ((equity - running_max) / running_max * 100).to_numpy()
+    np.testing.assert_allclose(visualization._drawdown(equity.to_numpy()), expected)
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    """Test LTTB keeps the end points and a spike, and leaves short curves alone."""
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[500] = 10.0
+
+    keep = visualization._lttb(x, y, 50)
+
+    assert len(keep) == 50 and keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+    assert 500 in keep
+    assert visualization._lttb(x[:10], y[:10], 50).tolist() == list(range(10))
+
+
+def test_monthly_heatmap_annotates_months_with_data():
+    """Test partial years plot, with one annotation per month that has returns."""
+    pytest.importorskip('matplotlib')
+    returns = pd.Series(0.001, index=pd.bdate_range('2023-11-01', '2024-02-29'))
+
+    fig = visualization.PerformanceVisualizer().plot_monthly_returns_heatmap(returns)
+
+    texts = [text.get_text() for text in fig.axes[0].texts]
+    assert len(texts) == 4
+    assert texts[0] == f"{(1.001 ** 22 - 1) * 100:.1f}"  # Nov 2023: 22 business days
+    visualization.plt.close(fig)
+
+
+def test_rolling_sharpe_vol_matches_pandas():
+    """Test the fused rolling kernel against pandas rolling mean/std, NaNs included."""
+    returns = pd.Series(np.random.default_rng(7).normal(0.0005, 0.01, 400))
+    returns[[0, 150]] = np.nan
+    std = returns.rolling(20).std()
+
+    sharpe, vol = visualization._rolling_sharpe_vol(returns.to_numpy(), 20, 252.0)
+
+    np.testing.assert_allclose(sharpe, returns.rolling(20).mean() / std * np.sqrt(252))
+    np.testing.assert_allclose(vol, std * np.sqrt(252) * 100)
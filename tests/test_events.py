@@ -96,3 +96,39 @@ def test_fill_event_creation():
     assert event.direction == "BUY"
     assert event.fill_cost == 15000.0
     assert event.commission == 15.0
+
+
+def test_event_queue_orders_by_timestamp_then_fifo():
+    """Test EventQueue pops in timestamp order, FIFO among equal timestamps."""
+    from queue import Empty
+    from src.utils.event_queue import EventQueue
+
+    queue = EventQueue(capacity=2)
+    late = FillEvent(timestamp=datetime(2023, 1, 2), data=None, symbol="AAPL")
+    first = MarketEvent(timestamp=datetime(2023, 1, 1), data=None, symbol="AAPL")
+    second = SignalEvent(timestamp=datetime(2023, 1, 1), data=None, symbol="AAPL")
+    for event in (late, first, second):
+        queue.put(event)
+
+    assert queue.qsize() == 3
+    assert queue.get(False) is first
+    assert queue.get(False) is second
+    assert queue.get(False) is late
+    assert queue.empty()
+    with pytest.raises(Empty):
+        queue.get(False)
+
+
+def test_to_ns_conversions():
+    """Test to_ns agrees with pandas across the supported timestamp types."""
+    import numpy as np
+    import pandas as pd
+    from src.utils.timestamps import to_ns
+
+    naive = datetime(2023, 1, 2, 3, 4, 5, 678901)
+    expected = pd.Timestamp(naive).value
+    assert to_ns(naive) == expected
+    assert to_ns(pd.Timestamp(naive)) == expected
+    assert to_ns(np.datetime64(naive)) == expected
+    assert to_ns(np.int64(expected)) == expected
+    assert to_ns('2023-01-02 03:04:05.678901') == expected
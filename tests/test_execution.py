@@ -72,3 +72,24 @@ def test_slippage_applied():
     # Buy order should have price increased by slippage
     expected_min_cost = 150.0 * 100  # Without slippage
     assert fill.fill_cost > expected_min_cost
+
+
+def test_fill_uses_simulated_time_and_current_rates():
+    """Test fills carry the order's timestamp and follow rate changes."""
+    events = Queue()
+    data = CSVDataHandler(events, "examples/data", ["AAPL"])
+    handler = ExecutionHandler(events, data, slippage_bps=10.0, commission_pct=0.1)
+    order = OrderEvent(timestamp=datetime(2023, 1, 1), symbol="AAPL", order_type="MKT",
+                       quantity=100, direction="SELL", price=150.0, data=None)
+    
+    fill = handler._create_fill(order)
+    assert fill.timestamp == datetime(2023, 1, 1)
+    assert fill.fill_cost == pytest.approx(150.0 * 0.999 * 100)
+    assert fill.commission == pytest.approx(fill.fill_cost * 0.001)
+    
+    handler.slippage_bps = 0.0
+    handler.commission_pct = 0.5
+    fill = handler._create_fill(order, timestamp=datetime(2023, 1, 2))
+    assert fill.timestamp == datetime(2023, 1, 2)
+    assert fill.fill_cost == pytest.approx(15000.0)
+    assert fill.commission == pytest.approx(75.0)
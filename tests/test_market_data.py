@@ -0,0 +1,266 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.market_data.csv_feed import CSVFeed, CSVFeedConfig
+from src.market_data.lobster_parser import LobsterMessageParser
+from src.market_data.parquet_feed import ParquetFeed
+from src.market_data import tick_events
+from src.market_data.tick_events import EventType, Side, SIDES
+
+
+CSV_ROWS = [
+    "time,ticker,price,volume,side,type",
+    "1700000000000,AAPL,150.25,100,BUY,TRADE",
+    "1700000000001,MSFT,380.10,50,S,NEW",
+    "1700000000002,AAPL,150.30,200,-1,cancel",
+    ",AAPL,150.35,10,BUY,TRADE",
+    "1700000000004,AAPL,150.40,25,OFFER,UNKNOWN",
+]
+
+
+@pytest.fixture
+def tick_csv(tmp_path):
+    """Write a small tick CSV and return its path."""
+    path = tmp_path / "ticks.csv"
+    path.write_text("\n".join(CSV_ROWS) + "\n")
+    return str(path)
+
+
+def make_config(backend: str) -> CSVFeedConfig:
+    return CSVFeedConfig(
+        timestamp_col='time',
+        symbol_col='ticker',
+        price_col='price',
+        quantity_col='volume',
+        side_col='side',
+        event_type_col='type',
+        timestamp_unit='ms',
+        price_scale=1.0,
+        venue='NYSE',
+        csv_backend=backend
+    )
+
+
+def test_csv_backends_produce_identical_events(tmp_path):
+    """Test pyarrow and pandas CSV backends yield the same TickEvents."""
+    path = tmp_path / "ticks.csv"
+    # Without timestamp_format both backends reject datetime strings
+    path.write_text("\n".join(CSV_ROWS + ["2023-11-14T22:13:20,AAPL,150.45,5,BUY,TRADE"]) + "\n")
+    arrow_events = list(CSVFeed(str(path), make_config('pyarrow')).parse(chunk_size=2))
+    pandas_events = list(CSVFeed(str(path), make_config('pandas')).parse(chunk_size=2))
+
+    assert len(arrow_events) == 4  # Rows without a numeric timestamp are skipped
+    assert len(arrow_events) == len(pandas_events)
+    for arrow_event, pandas_event in zip(arrow_events, pandas_events):
+        arrow_dict, pandas_dict = arrow_event.to_dict(), pandas_event.to_dict()
+        # pandas routes integer timestamps through float64 and may round them
+        assert arrow_dict.pop('timestamp_ns') == pytest.approx(pandas_dict.pop('timestamp_ns'))
+        assert arrow_dict == pandas_dict
+
+    # Also when no row at all has a numeric timestamp
+    path.write_text("\n".join(CSV_ROWS[:1] + ["2023-11-14T22:13:20,AAPL,150.45,5,BUY,TRADE"] * 2))
+    for backend in ('pyarrow', 'pandas'):
+        assert list(CSVFeed(str(path), make_config(backend)).parse()) == []
+
+
+def test_csv_pyarrow_mapping_and_scaling(tick_csv):
+    """Test timestamp units, side and event type mapping on the pyarrow path."""
+    events = list(CSVFeed(tick_csv, make_config('pyarrow')).parse())
+
+    assert events[0].timestamp_ns == 1700000000000 * 1_000_000
+    assert events[0].side == Side.BUY
+    assert events[1].side == Side.SELL
+    assert events[1].event_type == EventType.NEW_LIMIT
+    assert events[2].side == Side.SELL
+    assert events[2].event_type == EventType.CANCEL
+    assert events[3].side == Side.ASK
+    assert events[3].event_type == EventType.TRADE  # Unknown defaults to TRADE
+    assert events[3].venue == 'NYSE'
+
+
+def test_csv_filter_symbol(tick_csv):
+    """Test symbol filtering on the pyarrow path."""
+    events = list(CSVFeed(tick_csv, make_config('pyarrow')).parse(filter_symbol='MSFT'))
+
+    assert len(events) == 1
+    assert events[0].instrument_id == 'MSFT'
+    assert events[0].price == 380.10
+
+
+def test_csv_skips_malformed_rows(tmp_path):
+    """Test both backends skip rows whose timestamp, price or quantity do not parse."""
+    path = tmp_path / "bad_ticks.csv"
+    path.write_text("\n".join(CSV_ROWS[:3] + [
+        "1700000000005,AAPL,abc,10,BUY,TRADE",
+        "1700000000006,AAPL,150.50,ten,BUY,TRADE",
+        "xyz,AAPL,150.55,10,BUY,TRADE",
+        "1700000000008,AAPL,150.60,,BUY,TRADE",
+    ]) + "\n")
+
+    for backend in ('pyarrow', 'pandas'):
+        events = list(CSVFeed(str(path), make_config(backend)).parse())
+        assert [e.price for e in events] == [150.25, 380.10, 150.60], backend
+        assert np.isnan(events[-1].quantity)  # Missing values are kept as NaN
+
+
+@pytest.mark.parametrize('backend', ['pyarrow', 'pandas'])
+def test_csv_skips_unparseable_formatted_timestamps(tmp_path, backend):
+    """Test a bad timestamp under timestamp_format drops only its row."""
+    path = tmp_path / "formatted.csv"
+    path.write_text("time,ticker,price,volume,side\n"
+                    "2024-01-02 09:30:00,AAPL,1.0,1,BUY\n"
+                    "not a time,AAPL,2.0,1,BUY\n"
+                    "2024-01-02 09:30:01,AAPL,3.0,1,BUY\n")
+    config = CSVFeedConfig(timestamp_col='time', symbol_col='ticker', quantity_col='volume',
+                           timestamp_format='%Y-%m-%d %H:%M:%S', csv_backend=backend)
+
+    events = list(CSVFeed(str(path), config).parse())
+
+    assert [e.price for e in events] == [1.0, 3.0]
+    assert events[1].timestamp_ns - events[0].timestamp_ns == 1_000_000_000
+
+
+def test_csv_invalid_backend():
+    """Test unknown CSV backends are rejected."""
+    with pytest.raises(ValueError):
+        CSVFeedConfig(csv_backend='simd')
+
+
+LOBSTER_ROWS = [
+    "34200.004241176,1,16113575,18,5853300,1",
+    "34200.025551909,1,16120456,18,5859500,-1",
+    "34200.201743937,3,16120456,18,5859500,-1",
+    "34200.201765980,4,16116348,100,5853700,1",
+    "34200.205509817,5,0,50,5856000,-1",
+]
+
+
+def test_lobster_parallel_chunks(tmp_path):
+    """Test LOBSTER parsing across many small newline-aligned chunks."""
+    path = tmp_path / "AAPL_message.csv"
+    path.write_text("\n".join(LOBSTER_ROWS * 40) + "\n")
+
+    parser = LobsterMessageParser(str(path), symbol='AAPL', num_workers=3)
+    parser.BLOCK_SIZE = 1000  # Force several mapped blocks
+    events = list(parser.parse(chunk_size=7))
+
+    assert len(events) == 200
+    first, cancel, trade = events[0], events[2], events[3]
+    assert first.timestamp_ns == int(34200.004241176 * 1e9)
+    assert first.event_type == EventType.NEW_LIMIT
+    assert first.price == 585.33
+    assert first.quantity == 18.0
+    assert first.side == Side.BUY
+    assert first.external_order_id == '16113575'
+    assert cancel.event_type == EventType.CANCEL
+    assert cancel.side == Side.SELL
+    assert trade.event_type == EventType.TRADE
+    assert [e.external_order_id for e in events[5:10]] == [e.external_order_id for e in events[:5]]
+
+
+def test_lobster_empty_file(tmp_path):
+    """Test an empty message file yields no events."""
+    path = tmp_path / "empty_message.csv"
+    path.write_text("")
+
+    assert list(LobsterMessageParser(str(path), symbol='AAPL').parse()) == []
+
+
+def test_csv_parse_batched_columns(tick_csv):
+    """Test CSV batches are typed columns with shared, interned symbol tables."""
+    feed = CSVFeed(tick_csv, make_config('pyarrow'))
+    batches = list(feed.parse_batched(chunk_size=3))
+
+    assert [len(b) for b in batches] == [3, 1]
+    batch = batches[0]
+    assert batch.timestamp_ns.dtype == np.int64
+    assert batch.side.dtype == np.int8
+    assert batch.instrument_id_idx.dtype == np.int32
+    assert batch.symbols is feed.symbols
+    assert feed.symbols == ['AAPL', 'MSFT']
+    assert list(batch.instrument_id_idx) == [0, 1, 0]
+    assert SIDES[batch.side[1]] == Side.SELL
+    assert batch.as_event(1) == list(batch.to_events())[1]
+    assert list(batch) == list(batch.to_events())
+    assert not hasattr(batch, '__dict__')
+
+
+def test_parquet_parse_batched_filters(tmp_path):
+    """Test Parquet batches honour symbol and time-range filters."""
+    path = str(tmp_path / "ticks.parquet")
+    ParquetFeed.write_parquet(pd.DataFrame({
+        'timestamp_ns': [100, 200, 300, 400],
+        'symbol': ['BTC-USD', 'ETH-USD', 'BTC-USD', 'BTC-USD'],
+        'side': ['BUY', 'SELL', 'SELL', 'BUY'],
+        'price': [100.0, 10.0, 101.0, 102.0],
+        'size': [1.0, 2.0, 3.0, 4.0],
+        'venue': ['CB', 'CB', None, 'CB'],
+    }), path, row_group_size=2)
+    config = CSVFeedConfig(timestamp_col='timestamp_ns', quantity_col='size', venue='Crypto')
+
+    events = list(ParquetFeed(path, config).parse(
+        filter_symbol='BTC-USD', start_time_ns=200, end_time_ns=400))
+
+    assert len(events) == 1
+    assert events[0].timestamp_ns == 300
+    assert events[0].side == Side.SELL
+    assert events[0].quantity == 3.0
+    assert events[0].venue == 'Crypto'  # Missing venue falls back to config
+
+
+def test_parquet_skips_rows_without_timestamp(tmp_path):
+    """Test Parquet rows with a null timestamp are dropped, not cast to garbage."""
+    path = str(tmp_path / "ticks.parquet")
+    ParquetFeed.write_parquet(pd.DataFrame({
+        'timestamp_ns': pd.array([1, None, 3], dtype='Int64'),
+        'symbol': ['BTC-USD'] * 3,
+        'side': ['BUY'] * 3,
+        'price': [1.0, 2.0, 3.0],
+        'size': [1.0, 1.0, 1.0],
+    }), path)
+    feed = ParquetFeed(path, CSVFeedConfig(timestamp_col='timestamp_ns', quantity_col='size'))
+
+    assert [(e.timestamp_ns, e.price) for e in feed.parse()] == [(1, 1.0), (3, 3.0)]
+
+
+def test_parquet_dictionary_codes(tmp_path):
+    """Test Parquet symbols stay dictionary-encoded and map to feed codes."""
+    path = str(tmp_path / "ticks.parquet")
+    ParquetFeed.write_parquet(pd.DataFrame({
+        'timestamp_ns': [1, 2, 3],
+        'symbol': ['ETH-USD', 'BTC-USD', 'ETH-USD'],
+        'side': ['BUY', 'SELL', 'BUY'],
+        'price': [10.0, 100.0, 11.0],
+        'size': [1.0, 2.0, 3.0],
+    }), path)
+    feed = ParquetFeed(path, CSVFeedConfig(timestamp_col='timestamp_ns', quantity_col='size'))
+
+    batch = next(feed.parse_batched())
+    eth = feed.intern('ETH-USD')
+
+    assert list(batch.instrument_id_idx == eth) == [True, False, True]
+    assert feed.symbol(batch.instrument_id_idx[1]) == 'BTC-USD'
+    assert feed.intern('SOL-USD') == len(feed.symbols) - 1
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_batch_to_json_bytes(tick_csv, monkeypatch, use_orjson):
+    """Test batches serialize to columns plus their code tables."""
+    if use_orjson and not tick_events.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(tick_events, 'ORJSON_AVAILABLE', use_orjson)
+    batch = next(CSVFeed(tick_csv, make_config('pyarrow')).parse_batched())
+
+    data = json.loads(batch.to_json_bytes())
+
+    assert data['timestamp_ns'] == batch.timestamp_ns.tolist()
+    assert data['price'] == batch.price.tolist()
+    assert data['external_order_id'] is None
+    assert data['symbols'][data['instrument_id_idx'][1]] == 'MSFT'
+    assert data['sides'][data['side'][1]] == 'SELL'
@@ -0,0 +1,137 @@
+import numpy as np
+import pickle
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.interfaces import (IRiskManager, LatencyModel, MarketDataBatch, RiskCheckResult, Signal,
+                            SignalBatch, SignalType)
+from src.risk.position_risk_manager import PositionRiskManager
+from src.execution_sim.realistic_execution_simulator import RealisticExecutionSimulator
+
+
+def make_batch(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    market_data = MarketDataBatch(
+        symbols=rng.integers(0, 3, n).astype(np.int32),
+        prices=rng.uniform(90, 110, n),
+        timestamps=np.arange(n, dtype=np.float64),
+        volumes=np.full(n, 1000.0),
+        symbol_table=['AAPL', 'MSFT', 'GOOGL']
+    )
+    signals = SignalBatch(
+        sides=rng.choice(np.array([-1, 0, 1], dtype=np.int8), n),
+        quantities=rng.choice([50.0, 100.0, 200.0], n)
+    )
+    return market_data, signals
+
+
+def test_interface_records_are_slotted():
+    """Test per-event records drop __dict__ but keep dataclass behaviour."""
+    signal = Signal(symbol='AAPL', signal_type=SignalType.BUY, quantity=1.0, timestamp=0.0)
+    other = Signal(symbol='AAPL', signal_type=SignalType.BUY, quantity=1.0, timestamp=0.0)
+
+    assert not hasattr(signal, '__dict__')
+    assert signal == other and signal.metadata == {} and signal.metadata is not other.metadata
+    assert pickle.loads(pickle.dumps(signal)) == signal
+    assert RiskCheckResult(status=None).metadata == {}
+    with pytest.raises(AttributeError):
+        signal.note = 'x'
+
+
+def test_position_check_batch_matches_sequential_checks():
+    """Test the compiled batch check agrees with per-order check_order."""
+    market_data, signals = make_batch(500)
+    risk_manager = PositionRiskManager(max_position_size=400.0,
+                                       max_portfolio_exposure=80000.0)
+    positions = {'AAPL': 100.0, 'TSLA': -50.0}
+
+    batch_mask = risk_manager.check_batch(signals, market_data, positions)
+    sequential_mask = IRiskManager.check_batch(risk_manager, signals, market_data, positions)
+
+    assert batch_mask.any() and not batch_mask.all()
+    np.testing.assert_array_equal(batch_mask, sequential_mask)
+    assert positions == {'AAPL': 100.0, 'TSLA': -50.0}
+
+
+def test_execute_batch_fills_every_order():
+    """Test vectorized execution applies latency and bounded slippage."""
+    simulator = RealisticExecutionSimulator(latency_model=LatencyModel.CONSTANT,
+                                            latency_params={'constant_ms': 4.0},
+                                            slippage_bps=2.0)
+    prices = np.array([100.0, 200.0, 300.0])
+    fills = simulator.execute_batch(np.array([10.0, 20.0, 30.0]), prices,
+                                    np.array([1.0, 2.0, 3.0]))
+
+    assert len(fills) == 3
+    assert len(set(fills.order_ids)) == 3
+    np.testing.assert_allclose(fills.execution_times, [1.004, 2.004, 3.004])
+    assert np.all(fills.slippage >= prices * 1e-4) and np.all(fills.slippage <= prices * 3e-4)
+    np.testing.assert_allclose(fills.commission,
+                               fills.filled_quantities * fills.filled_prices * 1e-4)
+
+
+def test_execute_batch_sequential_ids_continue_across_batches():
+    """Test sequential order ids number on from the previous batch."""
+    simulator = RealisticExecutionSimulator(seed=1)
+    first = simulator.execute_batch(np.ones(3), np.full(3, 100.0), np.zeros(3), sequential_ids=True)
+    second = simulator.execute_batch(np.ones(2), np.full(2, 100.0), np.zeros(2), sequential_ids=True)
+
+    np.testing.assert_array_equal(first.order_ids, [0, 1, 2])
+    np.testing.assert_array_equal(second.order_ids, [3, 4])
+    assert second.row(1).order_id == '4'
+
+
+def test_execute_batch_seeded_and_side_aware():
+    """Test seeded simulators repeat draws and sells slip below the market."""
+    def run(seed):
+        simulator = RealisticExecutionSimulator(latency_model=LatencyModel.NORMAL,
+                                                latency_params={'mean_ms': 5.0, 'std_ms': 1.0},
+                                                seed=seed)
+        return simulator.execute_batch(np.array([1.0, 1.0]), np.array([100.0, 100.0]),
+                                       np.zeros(2), np.array([1, -1], dtype=np.int8))
+
+    first, second = run(7), run(7)
+    np.testing.assert_array_equal(first.latency_ms, second.latency_ms)
+    np.testing.assert_array_equal(first.filled_prices, second.filled_prices)
+    assert first.filled_prices[0] > 100.0 > first.filled_prices[1]
+
+    simulator = RealisticExecutionSimulator(seed=7)
+    result = simulator.execute_order(Signal(symbol='AAPL', signal_type=SignalType.SELL,
+                                            quantity=5.0, price=100.0, timestamp=1.0), 100.0, 1.0)
+    assert result.filled_quantity == 5.0
+    assert result.filled_price < 100.0
+    assert result.execution_time == pytest.approx(1.005)
+
+
+def test_execute_order_buffers_draws_per_latency_model():
+    """Test single orders repeat under a seed and drop buffers on model change."""
+    def latencies(seed):
+        simulator = RealisticExecutionSimulator(latency_model=LatencyModel.NORMAL,
+                                                latency_params={'mean_ms': 5.0, 'std_ms': 1.0},
+                                                seed=seed)
+        signal = Signal(symbol='AAPL', signal_type=SignalType.BUY, quantity=1.0, timestamp=0.0)
+        return simulator, [simulator.execute_order(signal, 100.0, 0.0).latency_ms for _ in range(5)]
+
+    simulator, first = latencies(11)
+    assert first == latencies(11)[1]
+    assert len(set(first)) == 5 and min(first) >= 0.0
+
+    simulator.set_latency_model(LatencyModel.CONSTANT, {'constant_ms': 2.0})
+    result = simulator.execute_order(Signal(symbol='AAPL', signal_type=SignalType.BUY,
+                                            quantity=1.0, timestamp=0.0), 100.0, 0.0)
+    assert result.latency_ms == 2.0
+    assert 100.01 <= result.filled_price <= 100.03
+
+
+
+@pytest.mark.parametrize('signal_type, sells', [(SignalType.CLOSE_LONG, True),
+                                                (SignalType.CLOSE_SHORT, False),
+                                                (SignalType.BUY, False)])
+def test_simulator_slips_against_order_side(signal_type, sells):
+    """Test closing a long slips like a sell and closing a short like a buy."""
+    result = RealisticExecutionSimulator(seed=3).execute_order(
+        Signal(symbol='AAPL', signal_type=signal_type, quantity=1.0, timestamp=0.0), 100.0, 0.0)
+    assert (result.filled_price < 100.0) == sells
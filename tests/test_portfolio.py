@@ -66,3 +66,17 @@ def test_generate_order_from_signal():
     order = events.get()
     assert order.symbol == "AAPL"
     assert order.direction == "BUY"
+
+
+def test_update_timeindex_batch_matches_per_tick():
+    """Test batched timeindex updates record the same snapshots as per-tick ones."""
+    timestamps = [datetime(2023, 1, day) for day in range(2, 6)]
+    per_tick = Portfolio(Queue(), datetime(2023, 1, 1), 100000.0)
+    batched = Portfolio(Queue(), datetime(2023, 1, 1), 100000.0)
+    
+    for ts in timestamps:
+        per_tick.update_timeindex(SignalEvent(timestamp=ts, data=None))
+    batched.update_timeindex_batch(timestamps)
+    
+    assert batched.all_holdings == per_tick.all_holdings
+    assert batched.all_positions == per_tick.all_positions
@@ -0,0 +1,229 @@
+import gc
+from contextlib import nullcontext
+import psutil
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from performance_profiling.profilers import ResourceProfiler, TickProfiler
+from performance_profiling.profilers.resource_profiler import _ProcStatSampler
+from performance_profiling.benchmarks.run_scalability_test import isolated_measurement
+
+
+def test_tick_profiler_grows_past_capacity():
+    """Test TickProfiler keeps every tick once its buffer is full."""
+    profiler = TickProfiler(capacity=4)
+    for _ in range(10):
+        profiler.start_tick()
+        profiler.end_tick()
+
+    stats = profiler.get_stats()['tick_stats']
+    assert stats['total_ticks'] == 10
+    assert len(profiler.tick_times) == 10
+    assert stats['min_us'] <= stats['median_us'] <= stats['max_us']
+
+
+def test_tick_profiler_percentiles_and_reset():
+    """Test percentiles use nearest-rank positions and reset clears data."""
+    profiler = TickProfiler()
+    profiler._durations_ns[:100] = range(1000, 101000, 1000)  # 1..100 µs
+    profiler._n = 100
+
+    percentiles = profiler.get_percentiles([50, 99])
+    assert percentiles == {'p50_us': 51.0, 'p99_us': 100.0}
+    assert profiler.get_stats()['tick_stats']['mean_us'] == pytest.approx(50.5)
+
+    profiler.reset()
+    assert profiler.total_ticks == 0
+    assert profiler.get_stats() == {}
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_save_metrics_roundtrip(tmp_path, monkeypatch, use_orjson):
+    """Test metrics files are valid JSON with both serializers."""
+    import json
+    from performance_profiling.profilers import metrics_collector
+
+    if use_orjson and not metrics_collector.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(metrics_collector, 'ORJSON_AVAILABLE', use_orjson)
+
+    collector = metrics_collector.MetricsCollector()
+    for _ in range(3):
+        collector.tick_profiler.start_tick()
+        collector.tick_profiler.end_tick()
+    output_file = tmp_path / "metrics.json"
+    collector.save_metrics(str(output_file))
+
+    saved = json.loads(output_file.read_text())
+    assert saved['tick_performance']['tick_stats']['total_ticks'] == 3
+    assert set(saved['tick_percentiles']) == {'p50_us', 'p90_us', 'p95_us', 'p99_us'}
+
+
+def test_tick_profiler_batch_records_block_mean():
+    """Test batch() fills one slot per tick with the block's mean duration."""
+    profiler = TickProfiler(capacity=8)
+    with profiler.batch(10):
+        sum(range(1000))
+    with profiler.batch(0):
+        pass
+
+    durations = profiler._durations_ns[:profiler.total_ticks]
+    assert profiler.total_ticks == 10
+    assert len(set(durations.tolist())) == 1
+    assert profiler.get_stats()['tick_stats']['timing'] == 'block_mean'
+    profiler.start_tick()
+    profiler.end_tick()
+    assert profiler.get_stats()['tick_stats']['timing'] == 'mixed'
+    profiler.reset()
+    assert profiler.timing_mode == 'per_tick'
+    assert durations[0] > 0
+
+
+def test_isolated_measurement_restores_gc(monkeypatch):
+    """Test GC is off inside the measured region and restored afterwards."""
+    monkeypatch.setenv('PYTHONHASHSEED', '0')
+    assert gc.isenabled()
+    trace = sys.gettrace()
+    affinity = psutil.Process().cpu_affinity() if hasattr(psutil.Process, 'cpu_affinity') else None
+    with pytest.warns(UserWarning) if trace is not None else nullcontext():
+        with isolated_measurement():
+            assert not gc.isenabled()
+            assert sys.getprofile() is None
+            assert sys.gettrace() is None
+    assert gc.isenabled()
+    assert sys.gettrace() is trace  # e.g. coverage or a debugger stays attached
+    if affinity is not None:
+        assert psutil.Process().cpu_affinity() == affinity
+
+
+def test_isolated_measurement_warns_without_hash_seed(monkeypatch):
+    """Test an unfixed PYTHONHASHSEED is reported before measuring."""
+    monkeypatch.delenv('PYTHONHASHSEED', raising=False)
+    with pytest.warns(UserWarning, match='PYTHONHASHSEED'):
+        with isolated_measurement():
+            pass
+
+
+def test_isolated_measurement_restores_profile_hook():
+    """Test a profile hook detached for the measurement is reattached."""
+    def hook(frame, event, arg):
+        pass
+
+    previous = sys.getprofile()
+    sys.setprofile(hook)
+    try:
+        with pytest.warns(UserWarning):
+            with isolated_measurement():
+                assert sys.getprofile() is None
+        assert sys.getprofile() is hook
+    finally:
+        sys.setprofile(previous)
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/statm'), reason="requires /proc")
+def test_resource_profiler_stop_closes_sampler_with_long_interval():
+    """Test stop() returns promptly and releases /proc handles for slow sampling."""
+    profiler = ResourceProfiler(sample_interval=5.0)
+    profiler.start()
+    fds = (profiler._sampler._stat_fd, profiler._sampler._statm_fd)
+    started = time.perf_counter()
+    profiler.stop()
+
+    assert time.perf_counter() - started < 1.0
+    assert profiler._sampler is None
+    for fd in fds:
+        with pytest.raises(OSError):
+            os.fstat(fd)
+    assert len(profiler) == 1
+
+
+def test_resource_profiler_columns():
+    """Test ResourceProfiler grows its sample arrays and summarizes them."""
+    profiler = ResourceProfiler(capacity=2)
+    for i in range(5):
+        profiler.record(timestamp=float(i), cpu_percent=10.0 * i,
+                        memory_mb=100.0 + i, memory_percent=1.0)
+
+    stats = profiler.get_stats()
+    assert stats['num_samples'] == 5
+    assert stats['cpu_percent'] == {'mean': 20.0, 'max': 40.0, 'min': 0.0}
+    assert stats['memory_mb']['peak'] == 104.0
+    assert profiler[-1].memory_mb == 104.0
+    assert [s.timestamp for s in profiler.snapshots] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    profiler.reset()
+    assert profiler.get_stats() == {}
+
+
+def test_component_times_in_nanoseconds():
+    """Test component timings are reported consistently in us, ms and seconds."""
+    profiler = TickProfiler()
+    for _ in range(4):
+        profiler.start_component('strategy')
+        profiler.end_component('strategy')
+    profiler.start_tick()
+    profiler.end_tick()
+    component = profiler.get_stats()['component_stats']['strategy']
+    assert component['total_calls'] == 4
+    assert component['total_time_ms'] == pytest.approx(component['mean_us'] * 4 / 1e3)
+    assert sum(profiler.component_times['strategy']) == pytest.approx(component['total_time_ms'] / 1e3)
+
+
+
+def test_nested_components_time_independently():
+    """Test an outer component's timing covers nested inner components."""
+    profiler = TickProfiler()
+    profiler.start_component('outer')
+    profiler.start_component('inner')
+    time.sleep(0.001)
+    profiler.end_component('inner')
+    profiler.end_component('outer')
+    times = profiler.component_times
+    assert times['outer'][0] >= times['inner'][0] >= 0.001
+
+
+def test_recursive_component_timing():
+    """Test a component nested inside itself records both durations."""
+    profiler = TickProfiler()
+    profiler.start_component('strategy')
+    profiler.start_component('strategy')
+    profiler.end_component('strategy')
+    time.sleep(0.001)
+    profiler.end_component('strategy')
+    inner, outer = profiler.component_times['strategy']
+    assert outer >= 0.001 > inner
+
+
+def test_overlapping_components_rejected():
+    """Test ending a component that is not innermost leaves the stack intact."""
+    profiler = TickProfiler()
+    profiler.start_component('risk')
+    profiler.start_component('execution')
+    with pytest.raises(ValueError):
+        profiler.end_component('risk')
+    with pytest.raises(ValueError):
+        profiler.end_component('unknown')
+    profiler.end_component('execution')
+    profiler.end_component('risk')
+    assert {name: len(times) for name, times in profiler.component_times.items()} == \
+        {'risk': 1, 'execution': 1}
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/statm'), reason="requires /proc")
+def test_proc_sampler_matches_psutil():
+    """Test the /proc fast path reports the same memory as psutil."""
+    import psutil
+    sampler = _ProcStatSampler()
+    try:
+        cpu_percent, memory_mb, memory_percent = sampler.sample()
+    finally:
+        sampler.close()
+
+    rss_mb = psutil.Process().memory_info().rss / (1024 * 1024)
+    assert cpu_percent >= 0.0
+    assert memory_mb == pytest.approx(rss_mb, rel=0.05)
+    assert memory_percent == pytest.approx(psutil.Process().memory_percent(), rel=0.05)
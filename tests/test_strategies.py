@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from datetime import datetime, timedelta
+
+from src.strategies import (MeanReversionStrategy, StatisticalArbitrageStrategy,
+                            TWAPStrategy, VWAPStrategy)
+
+
+def random_walk(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 150.0 + np.cumsum(rng.normal(0, 0.5, n))
+
+
+def test_mean_reversion_batch_matches_ticks():
+    """Test on_batch emits the same orders as per-tick on_market_data."""
+    prices = random_walk(500)
+    tick_strategy = MeanReversionStrategy(window=20)
+    batch_strategy = MeanReversionStrategy(window=20)
+
+    tick_orders = [tick_strategy.on_market_data({'symbol': 'GOOGL', 'bid': p, 'ask': p})
+                   for p in prices]
+    # Split in two batches to exercise carried-over state
+    batch_orders = list(batch_strategy.on_batch(prices[:123], np.arange(123), 'GOOGL'))
+    batch_orders += list(batch_strategy.on_batch(prices[123:], np.arange(123, 500), 'GOOGL'))
+
+    assert any(order is not None for order in tick_orders)
+    for tick_order, batch_order in zip(tick_orders, batch_orders):
+        if tick_order is None:
+            assert batch_order is None
+        else:
+            assert (batch_order['side'], batch_order['quantity']) == \
+                (tick_order['side'], tick_order['quantity'])
+    assert batch_strategy.get_state()['position'] == tick_strategy.get_state()['position']
+    assert batch_strategy.get_state()['sma'] == pytest.approx(tick_strategy.get_state()['sma'])
+
+
+@pytest.mark.parametrize('level, noise', [(5e4, 1e-2), (1e5, 1e-3)])
+def test_mean_reversion_batch_matches_ticks_at_high_prices(level, noise):
+    """Test batch bands keep their precision when prices dwarf the spread."""
+    prices = level + np.random.default_rng(2).normal(0, noise, 3000)
+    tick_strategy = MeanReversionStrategy(window=20)
+    batch_strategy = MeanReversionStrategy(window=20)
+
+    tick_signals = [(i, o['side'], o['quantity']) for i, o in enumerate(
+        tick_strategy.on_market_data({'symbol': 'BTC', 'bid': p, 'ask': p}) for p in prices)
+        if o is not None]
+    batch_signals = [(i, o['side'], o['quantity']) for i, o in enumerate(
+        batch_strategy.on_batch(prices, np.arange(len(prices)), 'BTC')) if o is not None]
+
+    assert len(tick_signals) > 100
+    assert batch_signals == tick_signals
+
+
+def test_statistical_arbitrage_batch_matches_ticks_at_high_prices():
+    """Test batch z-scores match on_market_data for a large spread level."""
+    a_prices = 1e5 + np.random.default_rng(3).normal(0, 1e-3, 2000)
+    b_prices = np.full(len(a_prices), 10.0)
+    tick_strategy = StatisticalArbitrageStrategy(('A', 'B'), window=30, entry_threshold=1.5)
+    batch_strategy = StatisticalArbitrageStrategy(('A', 'B'), window=30, entry_threshold=1.5)
+
+    # B never moves, so each A tick adds one spread exactly like a batch bar
+    tick_strategy.on_market_data({'symbol': 'B', 'bid': 10.0, 'ask': 10.0})
+    tick_signals = [(i, o['side'], o['quantity']) for i, o in enumerate(
+        tick_strategy.on_market_data({'symbol': 'A', 'bid': a, 'ask': a}) for a in a_prices)
+        if o is not None]
+    batch_signals = [(i, leg['side'], leg['quantity']) for i, legs in enumerate(
+        batch_strategy.on_batch(a_prices, b_prices, np.arange(len(a_prices))))
+        if legs is not None for leg in legs if leg['symbol'] == 'A']
+
+    assert len(tick_signals) > 50
+    assert batch_signals == tick_signals
+
+
+def test_statistical_arbitrage_batch_legs():
+    """Test on_batch opens and closes both legs of the pair."""
+    b_prices = random_walk(400, seed=1)
+    a_prices = b_prices + 3.0 * np.sin(np.arange(400) / 10.0)
+    strategy = StatisticalArbitrageStrategy(('MSFT', 'GOOGL'), window=30,
+                                            entry_threshold=1.5, position_size=50)
+
+    orders = [o for o in strategy.on_batch(a_prices, b_prices, np.arange(400)) if o is not None]
+
+    assert len(orders) >= 2
+    entry, exit_ = orders[0], orders[1]
+    assert [leg['symbol'] for leg in entry] == ['MSFT', 'GOOGL']
+    assert entry[0]['side'] != entry[1]['side']
+    assert [leg['side'] for leg in exit_] == [entry[1]['side'], entry[0]['side']]
+    assert all(leg['quantity'] == 50 for leg in entry + exit_)
+
+
+def test_execution_strategies_accept_ns_timestamps():
+    """Test TWAP/VWAP schedule identically on int64 ns and datetime timestamps."""
+    start = datetime(2024, 1, 15, 10, 0, 0)
+    start_ns = int(np.datetime64('2024-01-15T10:00:00', 'ns').astype(np.int64))
+    minutes = range(0, 70, 5)
+
+    for make in (lambda: TWAPStrategy(target_quantity=1000, total_duration_minutes=60, num_slices=6),
+                 lambda: VWAPStrategy(target_quantity=1000, total_duration_minutes=60)):
+        dt_strategy, ns_strategy = make(), make()
+        dt_orders = [dt_strategy.on_market_data({'symbol': 'MSFT', 'bid': 1.0, 'ask': 1.0,
+                                                 'timestamp': start + timedelta(minutes=m)})
+                     for m in minutes]
+        ns_orders = [ns_strategy.on_market_data({'symbol': 'MSFT', 'bid': 1.0, 'ask': 1.0,
+                                                 'timestamp': start_ns + m * 60_000_000_000})
+                     for m in minutes]
+        assert dt_orders == ns_orders
+        assert any(dt_orders)
+    assert ns_strategy.executed_quantity > 0
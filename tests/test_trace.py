@@ -0,0 +1,26 @@
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.trace import TraceBuffer
+
+
+def test_trace_buffer_keeps_latest_records(tmp_path):
+    """Test the ring buffer overwrites the oldest records and dumps in order."""
+    trace = TraceBuffer(capacity=3)
+    for i in range(5):
+        trace.record(TraceBuffer.FILL if i % 2 else TraceBuffer.SIGNAL, float(i), 100.0, 10.0 + i)
+
+    records = trace.to_dict()
+    assert len(trace) == 3
+    assert records['timestamp'] == [2.0, 3.0, 4.0]
+    assert records['event'] == ['SIGNAL', 'FILL', 'SIGNAL']
+    assert records['dropped'] == 2
+
+    output_file = tmp_path / "trace.json"
+    trace.dump(str(output_file))
+    saved = json.loads(output_file.read_text())
+    assert saved['price'] == [12.0, 13.0, 14.0]
+    assert saved['event_code'] == [0, 2, 0]